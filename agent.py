@@ -1,4 +1,4 @@
-import asyncio, random, string
+import asyncio, random, string, time
 import nest_asyncio
 
 nest_asyncio.apply()
@@ -12,7 +12,7 @@ import uuid
 import models
 
 from python.helpers import extract_tools, files, errors, history, tokens, context as context_helper
-from python.helpers import dirty_json
+from python.helpers import dirty_json, update_notifier
 from python.helpers.print_style import PrintStyle
 
 from langchain_core.prompts import (
@@ -23,6 +23,7 @@ from langchain_core.messages import SystemMessage, BaseMessage
 import python.helpers.log as Log
 from python.helpers.dirty_json import DirtyJson
 from python.helpers.defer import DeferredTask
+from python.helpers.context_loops import ContextLoops
 from typing import Callable
 from python.helpers.localization import Localization
 from python.helpers.extension import call_extensions
@@ -82,7 +83,7 @@ class AgentContext:
         self.last_message = last_message or datetime.now(timezone.utc)
         self.data = data or {}
         self.output_data = output_data or {}
-
+        update_notifier.notify(self.id)
 
 
     @staticmethod
@@ -140,6 +141,8 @@ class AgentContext:
         context = AgentContext._contexts.pop(id, None)
         if context and context.task:
             context.task.kill()
+        ContextLoops.release(id)
+        update_notifier.notify(id)
         return context
 
     def get_data(self, key: str, recursive: bool = True):
@@ -157,6 +160,7 @@ class AgentContext:
     def set_output_data(self, key: str, value: Any, recursive: bool = True):
         # recursive is not used now, prepared for context hierarchy
         self.output_data[key] = value
+        update_notifier.notify(self.id)
 
     def output(self):
         return {
@@ -169,7 +173,7 @@ class AgentContext:
             ),
             "no": self.no,
             "log_guid": self.log.guid,
-            "log_version": len(self.log.updates),
+            "log_version": self.log.version,
             "log_length": len(self.log.logs),
             "paused": self.paused,
             "last_message": (
@@ -245,7 +249,7 @@ class AgentContext:
     ):
         if not self.task:
             self.task = DeferredTask(
-                thread_name=self.__class__.__name__,
+                thread_name=ContextLoops.get_thread_name(self.id),
             )
         self.task.start_task(func, *args, **kwargs)
         return self.task
@@ -308,6 +312,7 @@ class LoopData:
         self.params_temporary: dict = {}
         self.params_persistent: dict = {}
         self.current_tool = None
+        self.response_parser = DirtyJson()  # incremental parser of the streamed response
 
         # override values with kwargs
         for key, value in kwargs.items():
@@ -369,6 +374,7 @@ class Agent:
                     self.context.streaming_agent = self  # mark self as current streamer
                     self.loop_data.iteration += 1
                     self.loop_data.params_temporary = {}  # clear temporary params
+                    self.loop_data.response_parser = DirtyJson()  # new response stream
 
                     # call message_loop_start extensions
                     await self.call_extensions(
@@ -521,12 +527,18 @@ class Agent:
         ]
         full_text = ChatPromptTemplate.from_messages(full_prompt).format()
 
+        # sum per message counts, unchanged messages hit the token count cache
+        ctx_tokens = tokens.approximate_tokens(system_text) + sum(
+            tokens.approximate_tokens(history.output_text([msg]))
+            for msg in loop_data.history_output + extras
+        )
+
         # store as last context window content
         self.set_data(
             Agent.DATA_NAME_CTX_WINDOW,
             {
                 "text": full_text,
-                "tokens": tokens.approximate_tokens(full_text),
+                "tokens": ctx_tokens,
             },
         )
 
@@ -876,7 +888,15 @@ class Agent:
         try:
             if len(stream) < 25:
                 return  # no reason to try
-            response = DirtyJson.parse_string(stream)
+            # only the newly streamed text is parsed, the parser keeps its state between chunks
+            try:
+                parser = self.loop_data.response_parser
+                parser.feed_text(stream)
+                response = parser.snapshot()
+            except Exception:
+                # the parser can't resume after an error, start it over and parse this chunk in full
+                self.loop_data.response_parser = DirtyJson()
+                response = DirtyJson.parse_string(stream)
             if isinstance(response, dict):
                 await self.call_extensions(
                     "response_stream",
@@ -892,31 +912,16 @@ class Agent:
         self, name: str, method: str | None, args: dict, message: str, loop_data: LoopData | None, **kwargs
     ):
         from python.tools.unknown import Unknown
-        from python.helpers.tool import Tool
-
-        classes = []
+        from python.helpers import class_registry
 
-        # try agent tools first
-        if self.config.profile:
-            try:
-                classes = extract_tools.load_classes_from_file(
-                    "agents/" + self.config.profile + "/tools/" + name + ".py", Tool  # type: ignore[arg-type]
-                )
-            except Exception:
-                pass
-
-        # try default tools
-        if not classes:
-            try:
-                classes = extract_tools.load_classes_from_file(
-                    "python/tools/" + name + ".py", Tool  # type: ignore[arg-type]
-                )
-            except Exception as e:
-                pass
-        tool_class = classes[0] if classes else Unknown
-        return tool_class(
+        # agent profile tools first, then default tools
+        tool_class = class_registry.get_tool_class(self.config.profile, name) or Unknown
+        start = time.perf_counter()
+        tool = tool_class(
             agent=self, name=name, method=method, args=args, message=message, loop_data=loop_data, **kwargs
         )
+        class_registry.record_time("tool_init", time.perf_counter() - start)
+        return tool
 
     async def call_extensions(self, extension_point: str, **kwargs) -> Any:
         return await call_extensions(extension_point=extension_point, agent=self, **kwargs)
@@ -132,6 +132,10 @@ def initialize_mcp():
         return _initialize_mcp(set["mcp_servers"])
     return defer.DeferredTask().start_task(initialize_mcp_async)
 
+def initialize_loop_watchdog():
+    from python.helpers.loop_watchdog import LoopWatchdog
+    LoopWatchdog.start()
+
 def initialize_job_loop():
     from python.helpers.job_loop import run_loop
     return defer.DeferredTask("JobLoop").start_task(run_loop)
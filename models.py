@@ -1,7 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import os
+import weakref
 from typing import (
     Any,
     Awaitable,
@@ -14,17 +17,18 @@ from typing import (
     TypedDict,
 )
 
-from litellm import completion, acompletion, embedding
+from litellm import completion, acompletion, aembedding
 import litellm
 import openai
 from litellm.types.utils import ModelResponse
 
-from python.helpers import dotenv
+from python.helpers import dotenv, model_registry, http_pool
 from python.helpers import settings, dirty_json
 from python.helpers.dotenv import load_dotenv
 from python.helpers.providers import get_provider_config
 from python.helpers.rate_limiter import RateLimiter
-from python.helpers.tokens import approximate_tokens
+from python.helpers import embedding_batcher
+from python.helpers.tokens import approximate_tokens, TokenEstimator
 from python.helpers import dirty_json, browser_use_monkeypatch
 
 from langchain_core.language_models.chat_models import SimpleChatModel
@@ -60,6 +64,8 @@ turn_off_logging()
 browser_use_monkeypatch.apply()
 
 litellm.modify_params = True # helps fix anthropic tool calls by browser-use
+# OpenAI compatible providers, streaming included, send through the shared connection pool
+litellm.aclient_session = http_pool.get_litellm_client()
 
 class ModelType(Enum):
     CHAT = "Chat"
@@ -266,7 +272,9 @@ async def apply_rate_limiter(
         model_config.limit_input,
         model_config.limit_output,
     )
-    limiter.add(input=approximate_tokens(input_text))
+    # counting is only needed when an input limit is set
+    if model_config.limit_input:
+        limiter.add(input=approximate_tokens(input_text))
     limiter.add(requests=1)
     await limiter.wait(rate_limiter_callback)
     return limiter
@@ -440,6 +448,7 @@ class LiteLLMChatWrapper(SimpleChatModel):
             messages=msgs,
             stream=True,
             stop=stop,
+            shared_session=http_pool.get_session(),
             **{**self.kwargs, **kwargs},
         )
         async for chunk in response:  # type: ignore
@@ -493,16 +502,24 @@ class LiteLLMChatWrapper(SimpleChatModel):
 
         # results
         result = ChatGenerationResult()
+        # output tokens are only counted when someone needs them
+        count_output = tokens_callback is not None or (
+            limiter is not None and bool(limiter.limits.get("output"))
+        )
 
         attempt = 0
         while True:
             got_any_chunk = False
+            reasoning_tokens = TokenEstimator()
+            response_tokens = TokenEstimator()
             try:
                 # call model
+                # keep-alive connections of the loop are reused across calls
                 _completion = await acompletion(
                     model=self.model_name,
                     messages=msgs_conv,
                     stream=stream,
+                    shared_session=http_pool.get_session(),
                     **call_kwargs,
                 )
 
@@ -518,32 +535,30 @@ class LiteLLMChatWrapper(SimpleChatModel):
                         if output["reasoning_delta"]:
                             if reasoning_callback:
                                 await reasoning_callback(output["reasoning_delta"], result.reasoning)
-                            if tokens_callback:
-                                await tokens_callback(
-                                    output["reasoning_delta"],
-                                    approximate_tokens(output["reasoning_delta"]),
-                                )
-                            # Add output tokens to rate limiter if configured
-                            if limiter:
-                                limiter.add(output=approximate_tokens(output["reasoning_delta"]))
+                            if count_output:
+                                delta_tokens = reasoning_tokens.add(output["reasoning_delta"])
+                                if tokens_callback:
+                                    await tokens_callback(output["reasoning_delta"], delta_tokens)
+                                # Add output tokens to rate limiter if configured
+                                if limiter:
+                                    limiter.add(output=delta_tokens)
                         # collect response delta and call callbacks
                         if output["response_delta"]:
                             if response_callback:
                                 await response_callback(output["response_delta"], result.response)
-                            if tokens_callback:
-                                await tokens_callback(
-                                    output["response_delta"],
-                                    approximate_tokens(output["response_delta"]),
-                                )
-                            # Add output tokens to rate limiter if configured
-                            if limiter:
-                                limiter.add(output=approximate_tokens(output["response_delta"]))
+                            if count_output:
+                                delta_tokens = response_tokens.add(output["response_delta"])
+                                if tokens_callback:
+                                    await tokens_callback(output["response_delta"], delta_tokens)
+                                # Add output tokens to rate limiter if configured
+                                if limiter:
+                                    limiter.add(output=delta_tokens)
 
                 # non-stream response
                 else:
                     parsed = _parse_chunk(_completion)
                     output = result.add_chunk(parsed)
-                    if limiter:
+                    if limiter and count_output:
                         if output["response_delta"]:
                             limiter.add(output=approximate_tokens(output["response_delta"]))
                         if output["reasoning_delta"]:
@@ -630,6 +645,7 @@ class BrowserCompatibleChatWrapper(ChatOpenRouter):
                 model=self._wrapper.model_name,
                 messages=messages,
                 stop=stop,
+                shared_session=http_pool.get_session(),
                 **kwrgs,
             )
 
@@ -672,24 +688,47 @@ class LiteLLMEmbeddingWrapper(Embeddings):
         self.model_name = f"{provider}/{model}" if provider != "openai" else model
         self.kwargs = kwargs
         self.a0_model_conf = model_config
+        # requests of all wrappers of the model are coalesced into batched API calls
+        model_name = self.model_name
+        self.batcher = embedding_batcher.get_batcher(
+            model_registry.get_key(provider, model_name, kwargs),
+            lambda: embedding_batcher.EmbeddingBatcher(
+                lambda texts: _litellm_embed_batch(model_name, kwargs, texts),
+                batch_size=_get_embedding_batch_size,
+                concurrency=4,
+            ),
+        )
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, " ".join(texts))
+    def _rate_limit(self, texts: List[str]):
+        # applied per request on the batcher loop, batches mix requests of several wrappers
+        return lambda: apply_rate_limiter(self.a0_model_conf, " ".join(texts))
 
-        resp = embedding(model=self.model_name, input=texts, **self.kwargs)
-        return [
-            item.get("embedding") if isinstance(item, dict) else item.embedding  # type: ignore
-            for item in resp.data  # type: ignore
-        ]
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.embed_sync(texts, self._rate_limit(texts))
 
     def embed_query(self, text: str) -> List[float]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, text)
+        return self.batcher.embed_sync([text], self._rate_limit([text]))[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.batcher.embed(texts, self._rate_limit(texts))
 
-        resp = embedding(model=self.model_name, input=[text], **self.kwargs)
-        item = resp.data[0]  # type: ignore
-        return item.get("embedding") if isinstance(item, dict) else item.embedding  # type: ignore
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.batcher.embed([text], self._rate_limit([text])))[0]
+
+
+async def _litellm_embed_batch(
+    model_name: str, kwargs: dict, texts: List[str]
+) -> List[List[float]]:
+    resp = await aembedding(model=model_name, input=texts, **kwargs)
+    return [
+        item.get("embedding") if isinstance(item, dict) else item.embedding  # type: ignore
+        for item in resp.data  # type: ignore
+    ]
+
+
+_local_embedding_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="SentenceTransformer"
+)
 
 
 class LocalSentenceTransformerWrapper(Embeddings):
@@ -720,26 +759,63 @@ class LocalSentenceTransformerWrapper(Embeddings):
         }
         st_kwargs = {k: v for k, v in (kwargs or {}).items() if k in st_allowed_keys}
 
-        self.model = SentenceTransformer(model, **st_kwargs)
+        # loaded weights are shared by all wrappers of the same model in the process
+        self.model_key = model_registry.get_key(provider, model, st_kwargs)
+        self.model: SentenceTransformer = model_registry.acquire(
+            self.model_key, lambda: SentenceTransformer(model, **st_kwargs), owner=self
+        )
         self.model_name = model
         self.a0_model_conf = model_config
+        # encoding is CPU bound, it runs in a worker thread shared by all local
+        # models one batch at a time
+        self.executor = _local_embedding_executor
+        # one batcher per loaded model, it only holds a weak reference so the
+        # registry can still unload the model
+        model_ref = weakref.ref(self.model)
+        self.batcher = embedding_batcher.get_batcher(
+            (*self.model_key, id(self.model)),
+            lambda: embedding_batcher.EmbeddingBatcher(
+                lambda texts: _local_embed_batch(model_ref, texts),
+                batch_size=_get_embedding_batch_size,
+                concurrency=1,
+            ),
+            owner=self.model,
+        )
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, " ".join(texts))
+    def _rate_limit(self, texts: List[str]):
+        # applied per request on the batcher loop, batches mix requests of several wrappers
+        return lambda: apply_rate_limiter(self.a0_model_conf, " ".join(texts))
 
-        embeddings = self.model.encode(texts, convert_to_tensor=False)  # type: ignore
-        return embeddings.tolist() if hasattr(embeddings, "tolist") else embeddings  # type: ignore
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.embed_sync(texts, self._rate_limit(texts))
 
     def embed_query(self, text: str) -> List[float]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, text)
+        return self.batcher.embed_sync([text], self._rate_limit([text]))[0]
 
-        embedding = self.model.encode([text], convert_to_tensor=False)  # type: ignore
-        result = (
-            embedding[0].tolist() if hasattr(embedding[0], "tolist") else embedding[0]
-        )
-        return result  # type: ignore
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.batcher.embed(texts, self._rate_limit(texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.batcher.embed([text], self._rate_limit([text])))[0]
+
+
+async def _local_embed_batch(
+    model_ref: "weakref.ref[SentenceTransformer]", texts: List[str]
+) -> List[List[float]]:
+    model = model_ref()
+    if model is None:
+        raise RuntimeError("Embedding model was unloaded")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_local_embedding_executor, _encode, model, texts)
+
+
+def _encode(model: SentenceTransformer, texts: List[str]) -> List[List[float]]:
+    embeddings = model.encode(texts, batch_size=len(texts), convert_to_tensor=False)  # type: ignore
+    return embeddings.tolist() if hasattr(embeddings, "tolist") else embeddings  # type: ignore
+
+
+def _get_embedding_batch_size() -> int:
+    return settings.get_settings()["embed_model_batch_size"]
 
 
 def _get_litellm_chat(
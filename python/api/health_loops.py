@@ -0,0 +1,29 @@
+from python.helpers.api import ApiHandler, Request, Response
+from python.helpers import class_registry, model_registry, http_pool
+from python.helpers.defer import EventLoopThread
+from python.helpers.context_loops import ContextLoops
+from python.helpers.loop_watchdog import LoopWatchdog, STALL_THRESHOLD
+from python.helpers.consolidation_queue import ConsolidationQueue
+
+
+class HealthLoops(ApiHandler):
+
+    @classmethod
+    def get_methods(cls) -> list[str]:
+        return ["GET", "POST"]
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        samples = LoopWatchdog.get_samples()
+        if input.get("clear", False):
+            LoopWatchdog.clear()
+
+        return {
+            "threshold_ms": STALL_THRESHOLD * 1000,
+            "loops": EventLoopThread.get_stats(),
+            "contexts": ContextLoops.get_stats(),
+            "samples": samples,
+            "classes": class_registry.get_stats(),
+            "models": model_registry.get_stats(),
+            "consolidation": ConsolidationQueue.get_stats(),
+            "http": http_pool.get_stats(),
+        }
@@ -54,54 +54,16 @@ class Poll(ApiHandler):
             # Skip if already processed
             if ctx.id in processed_contexts:
                 continue
+            processed_contexts.add(ctx.id)
 
-            # Skip BACKGROUND contexts as they should be invisible to users
-            if ctx.type == AgentContextType.BACKGROUND:
-                processed_contexts.add(ctx.id)
+            serialized = serialize_context(ctx, scheduler)
+            if serialized is None:
                 continue
-
-            # Create the base context data that will be returned
-            context_data = ctx.output()
-
-            context_task = scheduler.get_task_by_uuid(ctx.id)
-            # Determine if this is a task-dedicated context by checking if a task with this UUID exists
-            is_task_context = (
-                context_task is not None and context_task.context_id == ctx.id
-            )
-
-            if not is_task_context:
-                ctxs.append(context_data)
-            else:
-                # If this is a task, get task details from the scheduler
-                task_details = scheduler.serialize_task(ctx.id)
-                if task_details:
-                    # Add task details to context_data with the same field names
-                    # as used in scheduler endpoints to maintain UI compatibility
-                    context_data.update({
-                        "task_name": task_details.get("name"),  # name is for context, task_name for the task name
-                        "uuid": task_details.get("uuid"),
-                        "state": task_details.get("state"),
-                        "type": task_details.get("type"),
-                        "system_prompt": task_details.get("system_prompt"),
-                        "prompt": task_details.get("prompt"),
-                        "last_run": task_details.get("last_run"),
-                        "last_result": task_details.get("last_result"),
-                        "attachments": task_details.get("attachments", []),
-                        "context_id": task_details.get("context_id"),
-                    })
-
-                    # Add type-specific fields
-                    if task_details.get("type") == "scheduled":
-                        context_data["schedule"] = task_details.get("schedule")
-                    elif task_details.get("type") == "planned":
-                        context_data["plan"] = task_details.get("plan")
-                    else:
-                        context_data["token"] = task_details.get("token")
-
+            context_data, is_task_context = serialized
+            if is_task_context:
                 tasks.append(context_data)
-
-            # Mark as processed
-            processed_contexts.add(ctx.id)
+            else:
+                ctxs.append(context_data)
 
         # Sort tasks and chats by their creation date, descending
         ctxs.sort(key=lambda x: x["created_at"], reverse=True)
@@ -115,7 +77,8 @@ class Poll(ApiHandler):
             "tasks": tasks,
             "logs": logs,
             "log_guid": context.log.guid if context else "",
-            "log_version": len(context.log.updates) if context else 0,
+            "log_from": from_no,
+            "log_version": context.log.version if context else 0,
             "log_progress": context.log.progress if context else 0,
             "log_progress_active": context.log.progress_active if context else False,
             "paused": context.paused if context else False,
@@ -123,3 +86,52 @@ class Poll(ApiHandler):
             "notifications_guid": notification_manager.guid,
             "notifications_version": len(notification_manager.updates),
         }
+
+
+def serialize_context(
+    ctx: AgentContext, scheduler: TaskScheduler
+) -> tuple[dict, bool] | None:
+    """Context data for the chats and tasks lists and whether it is a task,
+    None for contexts hidden from the user."""
+
+    # Skip BACKGROUND contexts as they should be invisible to users
+    if ctx.type == AgentContextType.BACKGROUND:
+        return None
+
+    # Create the base context data that will be returned
+    context_data = ctx.output()
+
+    context_task = scheduler.get_task_by_uuid(ctx.id)
+    # Determine if this is a task-dedicated context by checking if a task with this UUID exists
+    is_task_context = (
+        context_task is not None and context_task.context_id == ctx.id
+    )
+
+    if is_task_context:
+        # If this is a task, get task details from the scheduler
+        task_details = scheduler.serialize_task(ctx.id)
+        if task_details:
+            # Add task details to context_data with the same field names
+            # as used in scheduler endpoints to maintain UI compatibility
+            context_data.update({
+                "task_name": task_details.get("name"),  # name is for context, task_name for the task name
+                "uuid": task_details.get("uuid"),
+                "state": task_details.get("state"),
+                "type": task_details.get("type"),
+                "system_prompt": task_details.get("system_prompt"),
+                "prompt": task_details.get("prompt"),
+                "last_run": task_details.get("last_run"),
+                "last_result": task_details.get("last_result"),
+                "attachments": task_details.get("attachments", []),
+                "context_id": task_details.get("context_id"),
+            })
+
+            # Add type-specific fields
+            if task_details.get("type") == "scheduled":
+                context_data["schedule"] = task_details.get("schedule")
+            elif task_details.get("type") == "planned":
+                context_data["plan"] = task_details.get("plan")
+            else:
+                context_data["token"] = task_details.get("token")
+
+    return context_data, is_task_context
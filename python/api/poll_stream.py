@@ -0,0 +1,198 @@
+import json
+import time
+
+from python.helpers.api import ApiHandler, Request, Response
+
+from agent import AgentContext
+
+from python.helpers import update_notifier
+from python.helpers.task_scheduler import TaskScheduler
+from python.helpers.localization import Localization
+from python.helpers.dotenv import get_dotenv_value
+from python.api.poll import serialize_context
+
+CHECK_INTERVAL = 1.0  # seconds between checks for changes that are not notified
+REFRESH_INTERVAL = 5.0  # seconds between full comparisons of the contexts lists
+KEEPALIVE_INTERVAL = 15.0  # seconds between comments keeping idle connections open
+MIN_INTERVAL = 0.05  # seconds between events, coalesces streamed chunks
+
+
+class PollStream(ApiHandler):
+    """Server-sent events carrying the /poll data as it changes.
+
+    Only new log items, progress, notifications and changed contexts are sent.
+    Every event id holds the log and notification versions it brings the client
+    to, a reconnecting EventSource sends it back as Last-Event-ID and resumes
+    from there. /poll stays available for clients without EventSource.
+    """
+
+    @classmethod
+    def get_methods(cls) -> list[str]:
+        return ["GET"]
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        args = request.args
+
+        # Get timezone from input (default to dotenv default or UTC if not provided)
+        timezone = args.get("timezone", get_dotenv_value("DEFAULT_USER_TIMEZONE", "UTC"))
+        Localization.get().set_timezone(timezone)
+
+        stream = _Stream(
+            ctxid=args.get("context", ""),
+            log_guid=args.get("log_guid", ""),
+            log_version=args.get("log_from", 0, type=int),
+            notifications_guid=args.get("notifications_guid", ""),
+            notifications_version=args.get("notifications_from", 0, type=int),
+        )
+        last_event_id = request.headers.get("Last-Event-ID")
+        if last_event_id:
+            stream.resume(last_event_id)
+
+        return Response(
+            stream.events(),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+class _Stream:
+    def __init__(
+        self,
+        ctxid: str,
+        log_guid: str,
+        log_version: int,
+        notifications_guid: str,
+        notifications_version: int,
+    ):
+        self.ctxid = ctxid
+        self.log_guid = log_guid
+        self.log_version = log_version
+        self.notifications_guid = notifications_guid
+        self.notifications_version = notifications_version
+        self.progress: tuple | None = None
+        self.deselected = False
+        self.sent: dict[str, tuple[dict, bool]] = {}  # last sent data of each context
+        self.contexts_version = 0
+        self.next_refresh = 0.0
+        self.contexts_full = True  # first event carries complete lists
+
+    def resume(self, event_id: str):
+        try:
+            log_guid, log_version, notifications_guid, notifications_version = event_id.split("/")
+            self.log_guid, self.log_version = log_guid, int(log_version)
+            self.notifications_guid = notifications_guid
+            self.notifications_version = int(notifications_version)
+        except ValueError:
+            pass  # malformed id, start from the query arguments
+
+    def events(self):
+        yield "retry: 1000\n\n"
+        last_sent = time.monotonic()
+        while True:
+            version = update_notifier.get_version()
+            data = self.collect(version)
+            now = time.monotonic()
+            if data:
+                event_id = f"{self.log_guid}/{self.log_version}/{self.notifications_guid}/{self.notifications_version}"
+                yield f"id: {event_id}\ndata: {json.dumps(data)}\n\n"
+                last_sent = now
+            elif now - last_sent >= KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = now
+            update_notifier.wait(version, CHECK_INTERVAL)
+            time.sleep(MIN_INTERVAL)
+
+    def collect(self, version: int) -> dict | None:
+        changed = False
+        context = AgentContext.get(self.ctxid) if self.ctxid else None
+        data: dict = {
+            "deselect_chat": False,
+            "context": context.id if context else "",
+        }
+
+        # deselect chat if it does not exist anymore
+        if self.ctxid and not context and not self.deselected:
+            self.deselected = True
+            data["deselect_chat"] = True
+            changed = True
+
+        # new and updated log items, all of them if the log has been reset
+        logs = []
+        log_from = self.log_version
+        if context:
+            log = context.log
+            log_version = log.version
+            if log.guid != self.log_guid:
+                log_from = 0
+            if log.guid != self.log_guid or log_version != self.log_version:
+                logs = log.output(start=log_from)
+                self.log_guid, self.log_version = log.guid, log_version
+                changed = True
+            progress = (log.progress, log.progress_active, context.paused)
+            if progress != self.progress:
+                self.progress = progress
+                changed = True
+        data.update({
+            "logs": logs,
+            "log_guid": self.log_guid if context else "",
+            "log_from": log_from,
+            "log_version": self.log_version if context else 0,
+            "log_progress": context.log.progress if context else 0,
+            "log_progress_active": context.log.progress_active if context else False,
+            "paused": context.paused if context else False,
+        })
+
+        # new notifications
+        manager = AgentContext.get_notification_manager()
+        notifications_version = len(manager.updates)
+        notifications = []
+        if manager.guid != self.notifications_guid:
+            self.notifications_version = 0
+        if (
+            manager.guid != self.notifications_guid
+            or notifications_version != self.notifications_version
+        ):
+            notifications = manager.output(start=self.notifications_version)
+            self.notifications_guid = manager.guid
+            self.notifications_version = notifications_version
+            changed = True
+        data.update({
+            "notifications": notifications,
+            "notifications_guid": self.notifications_guid,
+            "notifications_version": self.notifications_version,
+        })
+
+        # changed contexts, everything is compared now and then to catch
+        # changes that are not notified, like scheduler task states
+        now = time.monotonic()
+        if now >= self.next_refresh:
+            ids = set(AgentContext._contexts.keys()) | set(self.sent.keys())
+            self.next_refresh = now + REFRESH_INTERVAL
+        else:
+            ids = update_notifier.changed_since(self.contexts_version)
+        self.contexts_version = version
+
+        scheduler = TaskScheduler.get()
+        contexts, tasks, removed = [], [], []
+        for id in ids:
+            ctx = AgentContext.get(id)
+            serialized = serialize_context(ctx, scheduler) if ctx else None
+            if serialized is None:
+                if self.sent.pop(id, None):
+                    removed.append(id)
+                continue
+            if self.sent.get(id) != serialized:
+                self.sent[id] = serialized
+                context_data, is_task_context = serialized
+                (tasks if is_task_context else contexts).append(context_data)
+        if contexts or tasks or removed or self.contexts_full:
+            changed = True
+        data.update({
+            "contexts_full": self.contexts_full,
+            "contexts_updated": contexts,
+            "tasks_updated": tasks,
+            "contexts_removed": removed,
+        })
+        self.contexts_full = False
+
+        return data if changed else None
@@ -114,20 +114,21 @@ class RecallMemories(Extension):
         # get memory database
         db = await Memory.get(self.agent)
 
-        # search for general memories and fragments
-        memories = await db.search_similarity_threshold(
-            query=query,
-            limit=set["memory_recall_memories_max_search"],
+        # search for general memories and fragments, and for solutions, embedding the query once
+        memories, solutions = await db.search_similarity_threshold_batch(
+            [
+                (
+                    query,
+                    set["memory_recall_memories_max_search"],
+                    f"area == '{Memory.Area.MAIN.value}' or area == '{Memory.Area.FRAGMENTS.value}'",  # exclude solutions
+                ),
+                (
+                    query,
+                    set["memory_recall_solutions_max_search"],
+                    f"area == '{Memory.Area.SOLUTIONS.value}'",
+                ),
+            ],
             threshold=set["memory_recall_similarity_threshold"],
-            filter=f"area == '{Memory.Area.MAIN.value}' or area == '{Memory.Area.FRAGMENTS.value}'",  # exclude solutions
-        )
-
-        # search for solutions
-        solutions = await db.search_similarity_threshold(
-            query=query,
-            limit=set["memory_recall_solutions_max_search"],
-            threshold=set["memory_recall_similarity_threshold"],
-            filter=f"area == '{Memory.Area.SOLUTIONS.value}'",  # exclude solutions
         )
 
         if not memories and not solutions:
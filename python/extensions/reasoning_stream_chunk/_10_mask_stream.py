@@ -26,8 +26,8 @@ class MaskReasoningStreamChunk(Extension):
             # Update the stream data with processed chunk
             stream_data["chunk"] = processed_chunk
 
-            # Also mask the full text for consistency
-            stream_data["full"] = secrets_mgr.mask_values(stream_data["full"])
+            # Also mask the full text for consistency, only the new part is scanned
+            stream_data["full"] = filter_instance.mask_full(stream_data["full"])
 
             # Print the processed chunk (this is where printing should happen)
             if processed_chunk:
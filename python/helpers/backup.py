@@ -360,6 +360,13 @@ class BackupService:
             "include_hidden": include_hidden
         }
 
+        # persist pending memory changes so the backup contains them
+        try:
+            from python.helpers.memory import MemorySaver
+            MemorySaver.flush()
+        except Exception:
+            pass
+
         # Get matched files
         matched_files = await self.test_patterns(metadata, max_files=50000)
 
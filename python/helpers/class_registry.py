@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from typing import Any, TYPE_CHECKING
+
+from python.helpers import extract_tools, files, runtime
+
+if TYPE_CHECKING:
+    from python.helpers.extension import Extension
+    from python.helpers.tool import Tool
+
+RECHECK_INTERVAL = 1.0  # seconds between change checks of extension lists in development
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+
+    def output(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "avg_us": round(self.total / self.count * 1e6, 1) if self.count else 0.0,
+        }
+
+
+_timings = {
+    "tool_lookup": _Timing(),
+    "tool_init": _Timing(),
+    "extension_lookup": _Timing(),
+    "extension_init": _Timing(),
+}
+
+
+def record_time(kind: str, seconds: float):
+    _timings[kind].add(seconds)
+
+
+def get_stats() -> dict[str, Any]:
+    return {kind: timing.output() for kind, timing in _timings.items()}
+
+
+def get_tool_class(profile: str, name: str) -> "type[Tool] | None":
+    """Tool class by name, agent profile tools override default tools.
+    Modules are imported once and reloaded when their file changes."""
+    from python.helpers.tool import Tool
+
+    start = time.perf_counter()
+    try:
+        paths = []
+        if profile:
+            paths.append("agents/" + profile + "/tools/" + name + ".py")
+        paths.append("python/tools/" + name + ".py")
+        for path in paths:
+            try:
+                classes = extract_tools.load_classes_from_file(path, Tool)  # type: ignore[arg-type]
+            except Exception:
+                continue
+            if classes:
+                return classes[0]
+        return None
+    finally:
+        record_time("tool_lookup", time.perf_counter() - start)
+
+
+class _ExtensionList:
+    def __init__(self, profile: str, extension_point: str):
+        self.folders = [files.get_abs_path("python/extensions", extension_point)]
+        if profile:
+            self.folders.append(
+                files.get_abs_path("agents", profile, "extensions", extension_point)
+            )
+        self.stamps = self._get_stamps()
+
+        defaults = self._load(self.folders[0])
+        self.classes = defaults
+        if len(self.folders) > 1:
+            agentics = self._load(self.folders[1])
+            if agentics:
+                # merge them, agentics overwrite defaults
+                unique = {}
+                for cls in defaults + agentics:
+                    unique[_get_file_from_module(cls.__module__)] = cls
+
+                # sort by name
+                self.classes = sorted(
+                    unique.values(), key=lambda cls: _get_file_from_module(cls.__module__)
+                )
+        self.checked_at = time.monotonic()
+
+    def _load(self, folder: str) -> "list[type[Extension]]":
+        from python.helpers.extension import Extension
+
+        if not os.path.exists(folder):
+            return []
+        return extract_tools.load_classes_from_folder(folder, "*", Extension)
+
+    def _get_stamps(self) -> list[tuple[str, int]]:
+        # folder mtimes catch added and removed files, file mtimes catch edits
+        stamps = []
+        for folder in self.folders:
+            stamps.append((folder, _mtime(folder)))
+            if os.path.isdir(folder):
+                for name in sorted(os.listdir(folder)):
+                    if name.endswith(".py"):
+                        path = os.path.join(folder, name)
+                        stamps.append((path, _mtime(path)))
+        return stamps
+
+    def is_fresh(self) -> bool:
+        # files only change during development
+        if not runtime.is_development():
+            return True
+        now = time.monotonic()
+        if now - self.checked_at < RECHECK_INTERVAL:
+            return True
+        if self._get_stamps() == self.stamps:
+            self.checked_at = now
+            return True
+        return False
+
+
+_extension_lists: dict[tuple[str, str], _ExtensionList] = {}
+_lock = threading.Lock()
+
+
+def get_extension_classes(profile: str, extension_point: str) -> "list[type[Extension]]":
+    """Ordered extension classes for an extension point, with agent profile
+    extensions merged over the defaults by file name."""
+    start = time.perf_counter()
+    key = (profile, extension_point)
+    entry = _extension_lists.get(key)
+    if entry is None or not entry.is_fresh():
+        with _lock:
+            entry = _ExtensionList(profile, extension_point)
+            _extension_lists[key] = entry
+    record_time("extension_lookup", time.perf_counter() - start)
+    return entry.classes
+
+
+def _get_file_from_module(module_name: str) -> str:
+    return module_name.split(".")[-1]
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
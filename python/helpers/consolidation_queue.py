@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from agent import Agent
+from python.helpers.defer import EventLoopThread
+from python.helpers.memory import get_agent_memory_subdir
+from python.helpers.memory_consolidation import ConsolidationConfig, MemoryConsolidator
+from python.helpers.print_style import PrintStyle
+
+THREAD_NAME = "MemoryConsolidation"
+QUEUE_SIZE = 50  # queued memories per memory subdir before producers wait
+BATCH_SIZE = 5  # new memories analyzed in one prompt
+BATCH_WINDOW = 1.0  # seconds a batch waits to be filled
+
+
+@dataclass
+class _Item:
+    agent: Agent
+    memory: str
+    area: str
+    metadata: dict[str, Any]
+    config: ConsolidationConfig
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class ConsolidationQueue:
+    """Consolidates new memories of one memory subdir with a single writer.
+
+    Memories of all chats using the subdir are queued and processed in batches
+    of up to BATCH_SIZE, each batch needs one keyword extraction and one analysis
+    prompt instead of two calls per memory. Consolidation never runs concurrently
+    on the same memory, so decisions are not based on memories another chat has
+    just removed. When QUEUE_SIZE memories are waiting, submitters wait too.
+    """
+
+    _queues: dict[str, "ConsolidationQueue"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, memory_subdir: str):
+        self.memory_subdir = memory_subdir
+        self.loop_thread = EventLoopThread(THREAD_NAME)
+        # owned by the consolidation loop
+        self._queue: asyncio.Queue[_Item] | None = None
+        self._worker: asyncio.Task | None = None
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.llm_calls = 0
+        self.llm_calls_saved = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @classmethod
+    def get(cls, memory_subdir: str) -> "ConsolidationQueue":
+        with cls._lock:
+            queue = cls._queues.get(memory_subdir)
+            if queue is None:
+                queue = cls._queues[memory_subdir] = ConsolidationQueue(memory_subdir)
+            return queue
+
+    @classmethod
+    async def submit(
+        cls,
+        agent: Agent,
+        memories: list[str],
+        area: str,
+        metadata: dict[str, Any],
+        **config_overrides,
+    ) -> list[dict]:
+        """Queue memories for consolidation into the agent's memory and wait
+        for their results, {"success": bool, "memory_ids": [str, ...]} each."""
+        if not memories:
+            return []
+        queue = cls.get(get_agent_memory_subdir(agent))
+        config = ConsolidationConfig(**config_overrides)
+        future = queue.loop_thread.run_coroutine(
+            queue._submit(agent, memories, area, metadata, config)
+        )
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, Any]]:
+        with cls._lock:
+            queues = list(cls._queues.values())
+        return {queue.memory_subdir: queue.output() for queue in queues}
+
+    def output(self) -> dict[str, Any]:
+        done = self.processed + self.failed
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "processed": self.processed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "llm_calls": self.llm_calls,
+            "llm_calls_saved": self.llm_calls_saved,
+            "latency_avg_ms": round(self.latency_total / done * 1000, 1) if done else 0.0,
+            "latency_max_ms": round(self.latency_max * 1000, 1),
+        }
+
+    async def _submit(
+        self,
+        agent: Agent,
+        memories: list[str],
+        area: str,
+        metadata: dict[str, Any],
+        config: ConsolidationConfig,
+    ) -> list[dict]:
+        if not self._queue:
+            self._queue = asyncio.Queue(QUEUE_SIZE)
+        if not self._worker or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        loop = asyncio.get_running_loop()
+        items = [
+            _Item(agent, memory, area, dict(metadata), config, loop.create_future())
+            for memory in memories
+        ]
+        for item in items:
+            await self._queue.put(item)  # waits while the queue is full
+        return list(await asyncio.gather(*[item.future for item in items]))
+
+    async def _run(self):
+        assert self._queue
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + BATCH_WINDOW
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            for group in self._group(batch):
+                await self._process(group)
+
+    def _group(self, batch: list[_Item]) -> list[list[_Item]]:
+        # memories of the same chat and configuration share prompts
+        groups: list[list[_Item]] = []
+        for item in batch:
+            for group in groups:
+                if group[0].agent.context is item.agent.context and group[0].config == item.config:
+                    group.append(item)
+                    break
+            else:
+                groups.append([item])
+        return groups
+
+    async def _process(self, group: list[_Item]):
+        consolidator = MemoryConsolidator(group[0].agent, group[0].config)
+        try:
+            results = await consolidator.process_new_memories(
+                [(item.memory, item.area, item.metadata) for item in group]
+            )
+        except Exception as e:
+            PrintStyle().error(f"Memory consolidation queue error: {str(e)}")
+            results = [{"success": False, "memory_ids": []} for _ in group]
+
+        now = time.monotonic()
+        self.batches += 1
+        self.llm_calls += consolidator.llm_calls
+        self.llm_calls_saved += consolidator.llm_calls_saved
+        for item, result in zip(group, results):
+            latency = now - item.enqueued
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if result.get("success"):
+                self.processed += 1
+            else:
+                self.failed += 1
+            if not item.future.done():
+                item.future.set_result(result)
@@ -0,0 +1,59 @@
+import threading
+from typing import Any
+
+from python.helpers import settings
+from python.helpers.defer import EventLoopThread
+
+THREAD_NAME_PREFIX = "AgentContext"
+
+
+class ContextLoops:
+    """Assigns agent contexts to a pool of event loop threads.
+
+    A context keeps its thread for its whole life, new contexts go to the
+    thread with the fewest contexts. With at least as many threads as contexts,
+    every context runs on its own loop, so a blocking call in one chat does not
+    stall the others.
+    """
+
+    _assignments: dict[str, str] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_thread_name(cls, context_id: str) -> str:
+        with cls._lock:
+            name = cls._assignments.get(context_id)
+            if name:
+                return name
+            count = max(1, int(settings.get_settings()["agent_loop_threads"] or 1))
+            names = [cls._name(i) for i in range(count)]
+            load = {name: 0 for name in names}
+            for assigned in cls._assignments.values():
+                if assigned in load:
+                    load[assigned] += 1
+            name = min(names, key=lambda n: load[n])  # first one wins ties
+            cls._assignments[context_id] = name
+            return name
+
+    @classmethod
+    def release(cls, context_id: str):
+        with cls._lock:
+            cls._assignments.pop(context_id, None)
+
+    @classmethod
+    def get_stats(cls) -> list[dict[str, Any]]:
+        """Contexts and loop lag per agent loop thread."""
+        with cls._lock:
+            contexts: dict[str, list[str]] = {}
+            for context_id, name in cls._assignments.items():
+                contexts.setdefault(name, []).append(context_id)
+        result = []
+        for loop in EventLoopThread.get_stats():
+            if loop["thread"].startswith(THREAD_NAME_PREFIX):
+                result.append({**loop, "contexts": contexts.get(loop["thread"], [])})
+        return result
+
+    @staticmethod
+    def _name(index: int) -> str:
+        # the first thread keeps the historical name
+        return THREAD_NAME_PREFIX if index == 0 else f"{THREAD_NAME_PREFIX}-{index}"
@@ -1,11 +1,41 @@
 import asyncio
 from dataclasses import dataclass
 import threading
+import time
 from concurrent.futures import Future
 from typing import Any, Callable, Optional, Coroutine, TypeVar, Awaitable
 
 T = TypeVar("T")
 
+LAG_PROBE_INTERVAL = 0.1  # seconds between loop lag probes
+
+
+class LoopLag:
+    """Scheduling lag of an event loop, measured by a periodic timer callback."""
+
+    def __init__(self):
+        self.last = 0.0
+        self.max = 0.0
+        self.avg = 0.0
+        self.samples = 0
+        self.next_probe = time.monotonic()  # when the loop is expected to run the next probe
+
+    def add(self, lag: float):
+        self.last = lag
+        self.max = max(self.max, lag)
+        # exponential moving average, recent samples weigh more
+        self.avg = lag if not self.samples else self.avg * 0.9 + lag * 0.1
+        self.samples += 1
+
+    def output(self):
+        return {
+            "last_ms": round(self.last * 1000, 1),
+            "avg_ms": round(self.avg * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "samples": self.samples,
+        }
+
+
 class EventLoopThread:
     _instances = {}
     _lock = threading.Lock()
@@ -25,6 +55,10 @@ class EventLoopThread:
     def _start(self):
         if not hasattr(self, "loop") or not self.loop:
             self.loop = asyncio.new_event_loop()
+            self.lag = LoopLag()
+            self.loop.call_soon_threadsafe(
+                self._probe_lag, self.loop, time.monotonic()
+            )
         if not hasattr(self, "thread") or not self.thread:
             self.thread = threading.Thread(
                 target=self._run_event_loop, daemon=True, name=self.thread_name
@@ -37,6 +71,35 @@ class EventLoopThread:
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
+    def _probe_lag(self, loop: asyncio.AbstractEventLoop, expected: float):
+        # the callback runs late by as much as the loop was blocked
+        now = time.monotonic()
+        self.lag.add(max(0.0, now - expected))
+        if loop is self.loop:
+            self.lag.next_probe = now + LAG_PROBE_INTERVAL
+            loop.call_later(LAG_PROBE_INTERVAL, self._probe_lag, loop, self.lag.next_probe)
+
+    def get_stall(self) -> float:
+        """How long the loop is overdue to run its lag probe, i.e. blocked right now."""
+        if not getattr(self, "loop", None) or not self.loop.is_running():  # type: ignore
+            return 0.0
+        return max(0.0, time.monotonic() - self.lag.next_probe)
+
+    @classmethod
+    def get_stats(cls) -> list[dict[str, Any]]:
+        """Loop lag of all event loop threads."""
+        with cls._lock:
+            instances = list(cls._instances.values())
+        return [
+            {
+                "thread": instance.thread_name,
+                "running": bool(instance.loop and instance.loop.is_running()),
+                "lag": instance.lag.output(),
+            }
+            for instance in instances
+            if getattr(instance, "loop", None)
+        ]
+
     def terminate(self):
         if self.loop and self.loop.is_running():
             self.loop.stop()
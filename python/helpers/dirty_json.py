@@ -1,4 +1,5 @@
 import json
+import re
 
 def try_parse(json_string: str):
     try:
@@ -15,7 +16,21 @@ def stringify(obj, **kwargs):
     return json.dumps(obj, ensure_ascii=False, **kwargs)
 
 
+_START_CHARS = ["{", "[", '"']
+_STRING_RUN = {q: re.compile(r"[^" + re.escape(q) + r"\\]+") for q in ['"', "'", "`"]}
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
 class DirtyJson:
+    """Forgiving JSON parser.
+
+    Can be used in one shot with parse()/parse_string() or incrementally
+    with feed() and finish(). In incremental mode, each fed chunk only
+    advances the parse state; the parser suspends when it runs out of input
+    and resumes from the same position on the next chunk, keeping the
+    partially built result up to date in the meantime.
+    """
+
     def __init__(self):
         self._reset()
 
@@ -25,6 +40,11 @@ class DirtyJson:
         self.current_char = None
         self.result = None
         self.stack = []
+        self.done = False  # no more input will come
+        self.completed = False  # top level value fully parsed
+        self._gen = None
+        self._scan_pos = 0
+        self._slot = None
 
     @staticmethod
     def parse_string(json_string):
@@ -33,31 +53,92 @@ class DirtyJson:
 
     def parse(self, json_string):
         self._reset()
-        self.json_string = json_string
 
         # Add bounds checking to prevent IndexError
         if not json_string:
             # Return None for empty strings
             return None
 
-        self.index = self.get_start_pos(self.json_string)
-
-        # Ensure index is within bounds
-        if self.index >= len(self.json_string):
-            # If start position is beyond string length, return None
-            return None
-
-        self.current_char = self.json_string[self.index]
-        self._parse()
-        return self.result
+        self.feed(json_string)
+        return self.finish()
 
     def feed(self, chunk):
+        """Append a chunk of input and advance the parser as far as possible.
+        Returns the partially built result."""
         self.json_string += chunk
-        if not self.current_char and self.json_string:
-            self.current_char = self.json_string[0]
-        self._parse()
+        if self.completed:
+            return self.result
+        if self._gen is None:
+            start = self._find_start()
+            if start is None:
+                return self.result
+            self._start(start)
+        self._resume()
         return self.result
 
+    def feed_text(self, text):
+        """Feed the full text accumulated so far; only the new suffix is parsed.
+        If the text does not continue the previously fed input, parsing restarts."""
+        if not text.startswith(self.json_string):
+            self._reset()
+            return self.feed(text)
+        return self.feed(text[len(self.json_string) :])
+
+    def finish(self):
+        """Signal end of input and return the final result."""
+        self.done = True
+        if self.completed:
+            return self.result
+        if self._gen is None:
+            if not self.json_string:
+                return None
+            self._start(self._find_start() or 0)
+        self._resume()
+        return self.result
+
+    def snapshot(self):
+        """Copy of the current result with containers duplicated so callers can
+        modify it without affecting the parser state. Strings are shared."""
+        return _copy_containers(self.result)
+
+    def _find_start(self):
+        # the earliest start char can only move forward, so scan new text only
+        found = self.get_start_pos(self.json_string[self._scan_pos :], -1)
+        if found == -1:
+            self._scan_pos = len(self.json_string)
+            return None
+        return self._scan_pos + found
+
+    def _start(self, start):
+        self.index = start
+        self.current_char = (
+            self.json_string[start] if start < len(self.json_string) else None
+        )
+        self._gen = self._parse()
+
+    def _resume(self):
+        try:
+            next(self._gen)  # type: ignore
+        except StopIteration:
+            self.completed = True
+
+    def _wait(self, lookahead=0):
+        # suspend until lookahead chars after current position are available or input ends
+        while self.index + lookahead >= len(self.json_string) and not self.done:
+            yield
+        if self.index < len(self.json_string):
+            self.current_char = self.json_string[self.index]
+        else:
+            self.current_char = None
+
+    def _set_partial(self, value):
+        # expose value being parsed in its parent container while suspended
+        if self._slot is None:
+            self.result = value
+        else:
+            container, key = self._slot
+            container[key] = value
+
     def _advance(self, count=1):
         self.index += count
         if self.index < len(self.json_string):
@@ -66,84 +147,84 @@ class DirtyJson:
             self.current_char = None
 
     def _skip_whitespace(self):
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self._advance()
-            elif (
-                self.current_char == "/" and self._peek(1) == "/"
-            ):  # Single-line comment
-                self._skip_single_line_comment()
-            elif (
-                self.current_char == "/" and self._peek(1) == "*"
-            ):  # Multi-line comment
-                self._skip_multi_line_comment()
-            else:
+        while True:
+            yield from self._wait()
+            if self.current_char is None:
                 break
+            if self.current_char.isspace():
+                match = _WHITESPACE_RUN.match(self.json_string, self.index)
+                self._advance(match.end() - self.index)  # type: ignore
+                continue
+            if self.current_char == "/":
+                yield from self._wait(1)
+                if self._peek(1) == "/":  # Single-line comment
+                    yield from self._skip_single_line_comment()
+                    continue
+                if self._peek(1) == "*":  # Multi-line comment
+                    yield from self._skip_multi_line_comment()
+                    continue
+            break
 
     def _skip_single_line_comment(self):
-        while self.current_char is not None and self.current_char != "\n":
-            self._advance()
-        if self.current_char == "\n":
+        while True:
+            yield from self._wait()
+            if self.current_char is None:
+                return
+            if self.current_char == "\n":
+                self._advance()
+                return
             self._advance()
 
     def _skip_multi_line_comment(self):
         self._advance(2)  # Skip /*
-        while self.current_char is not None:
+        while True:
+            yield from self._wait(1)
+            if self.current_char is None:
+                break
             if self.current_char == "*" and self._peek(1) == "/":
                 self._advance(2)  # Skip */
                 break
             self._advance()
 
     def _parse(self):
-        if self.result is None:
-            self.result = self._parse_value()
-        else:
-            self._continue_parsing()
-
-    def _continue_parsing(self):
-        while self.current_char is not None:
-            if isinstance(self.result, dict):
-                self._parse_object_content()
-            elif isinstance(self.result, list):
-                self._parse_array_content()
-            elif isinstance(self.result, str):
-                self.result = self._parse_string()
-            else:
-                break
+        self.result = yield from self._parse_value()
 
     def _parse_value(self):
-        self._skip_whitespace()
+        yield from self._skip_whitespace()
         if self.current_char == "{":
+            yield from self._wait(1)
             if self._peek(1) == "{":  # Handle {{
                 self._advance(2)
-            return self._parse_object()
+            return (yield from self._parse_object())
         elif self.current_char == "[":
-            return self._parse_array()
+            return (yield from self._parse_array())
         elif self.current_char in ['"', "'", "`"]:
+            yield from self._wait(2)
             if self._peek(2) == self.current_char * 2:  # type: ignore
-                return self._parse_multiline_string()
-            return self._parse_string()
+                return (yield from self._parse_multiline_string())
+            return (yield from self._parse_string())
         elif self.current_char and (
             self.current_char.isdigit() or self.current_char in ["-", "+"]
         ):
-            return self._parse_number()
-        elif self._match("true"):
+            return (yield from self._parse_number())
+        elif (yield from self._match("true")):
             return True
-        elif self._match("false"):
+        elif (yield from self._match("false")):
             return False
-        elif self._match("null") or self._match("undefined"):
+        elif (yield from self._match("null")) or (yield from self._match("undefined")):
             return None
         elif self.current_char:
-            return self._parse_unquoted_string()
+            return (yield from self._parse_unquoted_string())
         return None
 
-    def _match(self, text: str) -> bool:
+    def _match(self, text: str):
         # first char should match current char
         if not self.current_char or self.current_char.lower() != text[0].lower():
             return False
 
         # peek remaining chars
         remaining = len(text) - 1
+        yield from self._wait(remaining)
         if self._peek(remaining).lower() == text[1:].lower():
             self._advance(len(text))
             return True
@@ -151,15 +232,20 @@ class DirtyJson:
 
     def _parse_object(self):
         obj = {}
+        self._set_partial(obj)
         self._advance()  # Skip opening brace
         self.stack.append(obj)
-        self._parse_object_content()
+        yield from self._parse_object_content()
         return obj
 
     def _parse_object_content(self):
-        while self.current_char is not None:
-            self._skip_whitespace()
+        while True:
+            yield from self._wait()
+            if self.current_char is None:
+                break
+            yield from self._skip_whitespace()
             if self.current_char == "}":
+                yield from self._wait(1)
                 if self._peek(1) == "}":  # Handle }}
                     self._advance(2)
                 else:
@@ -170,21 +256,23 @@ class DirtyJson:
                 self.stack.pop()
                 return  # End of input reached while parsing object
 
-            key = self._parse_key()
+            key = yield from self._parse_key()
             value = None
-            self._skip_whitespace()
+            container = self.stack[-1]
+            yield from self._skip_whitespace()
 
+            self._slot = (container, key)
             if self.current_char == ":":
                 self._advance()
-                value = self._parse_value()
+                value = yield from self._parse_value()
             elif self.current_char is None:
                 value = None  # End of input reached after key
             else:
-                value = self._parse_value()
+                value = yield from self._parse_value()
 
-            self.stack[-1][key] = value
+            container[key] = value
 
-            self._skip_whitespace()
+            yield from self._skip_whitespace()
             if self.current_char == ",":
                 self._advance()
                 continue
@@ -195,44 +283,59 @@ class DirtyJson:
                 continue
 
     def _parse_key(self):
-        self._skip_whitespace()
-        if self.current_char in ['"', "'"]:
-            return self._parse_string()
-        else:
-            return self._parse_unquoted_key()
+        yield from self._skip_whitespace()
+        slot = self._slot
+        self._slot = None  # partial keys are not exposed
+        try:
+            if self.current_char in ['"', "'"]:
+                return (yield from self._parse_string(expose=False))
+            else:
+                return (yield from self._parse_unquoted_key())
+        finally:
+            self._slot = slot
 
     def _parse_unquoted_key(self):
         result = ""
-        while (
-            self.current_char is not None
-            and not self.current_char.isspace()
-            and self.current_char not in [":", ",", "}", "]"]
-        ):
+        while True:
+            yield from self._wait()
+            if (
+                self.current_char is None
+                or self.current_char.isspace()
+                or self.current_char in [":", ",", "}", "]"]
+            ):
+                break
             result += self.current_char
             self._advance()
         return result
 
     def _parse_array(self):
         arr = []
+        self._set_partial(arr)
         self._advance()  # Skip opening bracket
         self.stack.append(arr)
-        self._parse_array_content()
+        yield from self._parse_array_content()
         return arr
 
     def _parse_array_content(self):
-        while self.current_char is not None:
-            self._skip_whitespace()
+        while True:
+            yield from self._wait()
+            if self.current_char is None:
+                break
+            yield from self._skip_whitespace()
             if self.current_char == "]":
                 self._advance()
                 self.stack.pop()
                 return
-            value = self._parse_value()
-            self.stack[-1].append(value)
-            self._skip_whitespace()
+            arr = self.stack[-1]
+            arr.append(None)
+            self._slot = (arr, len(arr) - 1)
+            value = yield from self._parse_value()
+            arr[-1] = value
+            yield from self._skip_whitespace()
             if self.current_char == ",":
                 self._advance()
                 # handle trailing commas, end of array
-                self._skip_whitespace()
+                yield from self._skip_whitespace()
                 if self.current_char is None or self.current_char == "]":
                     if self.current_char == "]":
                         self._advance()
@@ -242,49 +345,68 @@ class DirtyJson:
                 self.stack.pop()
                 return
 
-    def _parse_string(self):
-        result = ""
+    def _parse_string(self, expose=True):
+        parts = []
         quote_char = self.current_char
+        run = _STRING_RUN[quote_char]  # type: ignore
         self._advance()  # Skip opening quote
-        while self.current_char is not None and self.current_char != quote_char:
+        while True:
+            if self.index >= len(self.json_string) and not self.done:
+                if expose:
+                    self._set_partial("".join(parts))
+                yield from self._wait()
+            if self.current_char is None or self.current_char == quote_char:
+                break
             if self.current_char == "\\":
                 self._advance()
+                yield from self._wait()
                 if self.current_char in ['"', "'", "\\", "/", "b", "f", "n", "r", "t"]:
-                    result += {
-                        "b": "\b",
-                        "f": "\f",
-                        "n": "\n",
-                        "r": "\r",
-                        "t": "\t",
-                    }.get(self.current_char, self.current_char)
+                    parts.append(
+                        {
+                            "b": "\b",
+                            "f": "\f",
+                            "n": "\n",
+                            "r": "\r",
+                            "t": "\t",
+                        }.get(self.current_char, self.current_char)  # type: ignore
+                    )
                 elif self.current_char == "u":
                     self._advance()  # Skip 'u'
                     unicode_char = ""
                     # Try to collect exactly 4 hex digits
                     for _ in range(4):
+                        yield from self._wait()
                         if self.current_char is None or not self.current_char.isalnum():
                             # If we can't get 4 hex digits, treat it as a literal '\u' followed by whatever we got
-                            return result + "\\u" + unicode_char
+                            return "".join(parts) + "\\u" + unicode_char
                         unicode_char += self.current_char
                         self._advance()
                     try:
-                        result += chr(int(unicode_char, 16))
+                        parts.append(chr(int(unicode_char, 16)))
                     except ValueError:
                         # If invalid hex value, treat as literal
-                        result += "\\u" + unicode_char
+                        parts.append("\\u" + unicode_char)
                     continue
+                self._advance()
             else:
-                result += self.current_char
-            self._advance()
+                # consume the whole run of plain characters at once
+                match = run.match(self.json_string, self.index)
+                parts.append(match.group())  # type: ignore
+                self._advance(match.end() - self.index)  # type: ignore
         if self.current_char == quote_char:
             self._advance()  # Skip closing quote
-        return result
+        return "".join(parts)
 
     def _parse_multiline_string(self):
         result = ""
         quote_char = self.current_char
         self._advance(3)  # Skip first quote
-        while self.current_char is not None:
+        while True:
+            if self.index + 2 >= len(self.json_string) and not self.done:
+                self._set_partial(result.strip())
+            yield from self._wait(2)
+            if self.current_char is None:
+                break
             if self.current_char == quote_char and self._peek(2) == quote_char * 2:  # type: ignore
                 self._advance(3)  # Skip first quote
                 break
@@ -294,10 +416,13 @@ class DirtyJson:
 
     def _parse_number(self):
         number_str = ""
-        while self.current_char is not None and (
-            self.current_char.isdigit()
-            or self.current_char in ["-", "+", ".", "e", "E"]
-        ):
+        while True:
+            yield from self._wait()
+            if self.current_char is None or not (
+                self.current_char.isdigit()
+                or self.current_char in ["-", "+", ".", "e", "E"]
+            ):
+                break
             number_str += self.current_char
             self._advance()
         try:
@@ -307,29 +432,33 @@ class DirtyJson:
 
     def _parse_unquoted_string(self):
         result = ""
-        while self.current_char is not None and self.current_char not in [
-            ":",
-            ",",
-            "}",
-            "]",
-        ]:
+        while True:
+            if self.index >= len(self.json_string) and not self.done:
+                self._set_partial(result.strip())
+            yield from self._wait()
+            if self.current_char is None or self.current_char in [
+                ":",
+                ",",
+                "}",
+                "]",
+            ]:
+                break
             result += self.current_char
             self._advance()
         self._advance()
         return result.strip()
 
     def _peek(self, n):
-        peek_index = self.index + 1
-        result = ""
-        for _ in range(n):
-            if peek_index < len(self.json_string):
-                result += self.json_string[peek_index]
-                peek_index += 1
-            else:
-                break
-        return result
+        return self.json_string[self.index + 1 : self.index + 1 + n]
+
+    def get_start_pos(self, input_str: str, default: int = 0) -> int:
+        indices = [input_str.find(char) for char in _START_CHARS if input_str.find(char) != -1]
+        return min(indices) if indices else default
+
 
-    def get_start_pos(self, input_str: str) -> int:
-        chars = ["{", "[", '"']
-        indices = [input_str.find(char) for char in chars if input_str.find(char) != -1]
-        return min(indices) if indices else 0
+def _copy_containers(value):
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
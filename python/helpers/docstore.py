@@ -0,0 +1,177 @@
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, Mapping
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+DOCSTORE_FILE = "docstore.sqlite"
+CACHE_SIZE = 1000  # documents kept in memory
+BATCH = 500  # ids per SQL statement, stays under SQLite's variable limit
+
+
+class SqliteDocstore(Docstore, AddableMixin):
+    """Documents of a vector index in a SQLite side file, loaded on demand.
+
+    Writes stay in an open transaction until commit(), which runs when the
+    index is persisted, so the committed documents match the saved index.
+    """
+
+    def __init__(self, path: str, reset: bool = False):
+        self.path = path
+        self._lock = threading.RLock()
+        self._cache: OrderedDict[str, Document] = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, content TEXT NOT NULL, metadata BLOB NOT NULL)"
+        )
+        if reset:
+            self._conn.execute("DELETE FROM docs")
+        self._conn.commit()
+        # dict-like view, code written for InMemoryDocstore reads docstore._dict
+        self._dict = DocumentMap(self)
+
+    def add(self, texts: dict[str, Document]) -> None:
+        with self._lock:
+            existing = self._existing(list(texts.keys()))
+            if existing:
+                raise ValueError(f"Tried to add ids that already exist: {existing}")
+            self._conn.executemany(
+                "INSERT INTO docs (id, content, metadata) VALUES (?, ?, ?)",
+                [
+                    (id, doc.page_content, pickle.dumps(doc.metadata))
+                    for id, doc in texts.items()
+                ],
+            )
+
+    def delete(self, ids: list) -> None:
+        with self._lock:
+            for id in ids:
+                self._cache.pop(id, None)
+            for chunk in _chunks(list(ids)):
+                self._conn.execute(f"DELETE FROM docs WHERE id IN ({_marks(chunk)})", chunk)
+
+    def search(self, search: str) -> str | Document:
+        doc = self.mget([search]).get(search)
+        return doc if doc is not None else f"ID {search} not found."
+
+    def mget(self, ids: Iterable[str]) -> dict[str, Document]:
+        with self._lock:
+            found: dict[str, Document] = {}
+            missing = []
+            for id in ids:
+                doc = self._cache.get(id)
+                if doc is None:
+                    missing.append(id)
+                else:
+                    self._cache.move_to_end(id)
+                    found[id] = doc
+            for chunk in _chunks(missing):
+                rows = self._conn.execute(
+                    f"SELECT id, content, metadata FROM docs WHERE id IN ({_marks(chunk)})", chunk
+                ).fetchall()
+                for id, content, metadata in rows:
+                    doc = Document(page_content=content, metadata=pickle.loads(metadata), id=id)
+                    found[id] = doc
+                    self._cache[id] = doc
+                    if len(self._cache) > CACHE_SIZE:
+                        self._cache.popitem(last=False)
+            return found
+
+    def iter_documents(self) -> Iterator[tuple[str, Document]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, content, metadata FROM docs").fetchall()
+        for id, content, metadata in rows:
+            yield id, Document(page_content=content, metadata=pickle.loads(metadata), id=id)
+
+    def iter_metadata(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, metadata FROM docs").fetchall()
+        for id, metadata in rows:
+            yield id, pickle.loads(metadata)
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return [id for (id,) in self._conn.execute("SELECT id FROM docs")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def contains(self, id: str) -> bool:
+        with self._lock:
+            if id in self._cache:
+                return True
+            return self._conn.execute("SELECT 1 FROM docs WHERE id = ?", (id,)).fetchone() is not None
+
+    def prune(self, keep: set[str]):
+        """Delete documents not referenced by the index, left over by a crash
+        between committing documents and writing the index."""
+        orphans = [id for id in self.ids() if id not in keep]
+        if orphans:
+            self.delete(orphans)
+            self.commit()
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _existing(self, ids: list[str]) -> list[str]:
+        existing = []
+        for chunk in _chunks(ids):
+            existing += [
+                id
+                for (id,) in self._conn.execute(
+                    f"SELECT id FROM docs WHERE id IN ({_marks(chunk)})", chunk
+                )
+            ]
+        return existing
+
+
+class DocumentMap(Mapping[str, Document]):
+    """Read-only mapping over a SqliteDocstore, full scans use a single query."""
+
+    def __init__(self, store: SqliteDocstore):
+        self.store = store
+
+    def __getitem__(self, id: str) -> Document:
+        doc = self.store.mget([id]).get(id)
+        if doc is None:
+            raise KeyError(id)
+        return doc
+
+    def __contains__(self, id: object) -> bool:
+        return isinstance(id, str) and self.store.contains(id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.ids())
+
+    def __len__(self) -> int:
+        return self.store.count()
+
+    def values(self) -> list[Document]:  # type: ignore[override]
+        return [doc for _, doc in self.store.iter_documents()]
+
+    def items(self) -> list[tuple[str, Document]]:  # type: ignore[override]
+        return list(self.store.iter_documents())
+
+
+def docstore_path(db_dir: str) -> str:
+    return os.path.join(db_dir, DOCSTORE_FILE)
+
+
+def _chunks(ids: list[str]) -> Iterator[list[str]]:
+    for i in range(0, len(ids), BATCH):
+        yield ids[i : i + BATCH]
+
+
+def _marks(ids: list[str]) -> str:
+    return ", ".join("?" * len(ids))
@@ -23,7 +23,7 @@ from langchain_core.documents import Document
 from langchain.schema import SystemMessage, HumanMessage
 
 from python.helpers.print_style import PrintStyle
-from python.helpers import files, errors
+from python.helpers import files, errors, http_pool
 from agent import Agent
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -456,15 +456,16 @@ class DocumentQueryHelper:
                 last_error = ""
                 while not response and retries < 3:
                     try:
-                        async with aiohttp.ClientSession() as session:
-                            response = await session.head(
-                                document_uri,
-                                timeout=aiohttp.ClientTimeout(total=2.0),
-                                allow_redirects=True,
-                            )
-                            if response.status > 399:
-                                raise Exception(response.status)
-                            break
+                        response = await http_pool.get_session().head(
+                            document_uri,
+                            timeout=aiohttp.ClientTimeout(total=2.0),
+                            allow_redirects=True,
+                        )
+                        # only headers are used, the connection goes back to the pool
+                        response.release()
+                        if response.status > 399:
+                            raise Exception(response.status)
+                        break
                     except Exception as e:
                         await asyncio.sleep(1)
                         last_error = str(e)
@@ -600,11 +601,10 @@ class DocumentQueryHelper:
                 temp_file_path = temp_file.name
         elif scheme in ["http", "https"]:
             # download the file from the web url to a temporary file using python libraries for downloading
-            import requests
             import tempfile
 
             with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                response = requests.get(document, timeout=10.0)
+                response = http_pool.get_sync_session().get(document, timeout=10.0)
                 if response.status_code != 200:
                     raise ValueError(
                         f"DocumentQueryHelper::handle_pdf_document: Failed to download PDF from {document}: {response.status_code}"
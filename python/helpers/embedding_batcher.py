@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Hashable
+
+from python.helpers.defer import EventLoopThread
+
+THREAD_NAME = "Embeddings"
+BATCH_WINDOW = 0.02  # seconds requests are collected before a batch is sent
+DEFAULT_BATCH_SIZE = 32
+
+
+class EmbeddingBatcher:
+    """Coalesces embedding requests of concurrent callers into batches.
+
+    Requests arriving within BATCH_WINDOW are merged, deduplicated and split
+    into batches of batch_size texts, at most concurrency batches are embedded
+    at once. Batches run on a dedicated event loop thread, so callers on any
+    agent loop only await the result and synchronous callers block their own
+    thread without nesting event loops.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[list[str]], Awaitable[list[list[float]]]],
+        batch_size: Callable[[], int] | int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 4,
+        window: float = BATCH_WINDOW,
+    ):
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.window = window
+        self.loop_thread = EventLoopThread(THREAD_NAME)
+        # owned by the embeddings loop
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+
+    async def embed(
+        self, texts: list[str], before: Callable[[], Awaitable[Any]] | None = None
+    ) -> list[list[float]]:
+        """Embed texts, before is awaited on the embeddings loop before the texts
+        are queued, callers use it to apply their rate limits."""
+        if not texts:
+            return []
+        future = self.loop_thread.run_coroutine(self._submit(list(texts), before))
+        return await asyncio.wrap_future(future)
+
+    def embed_sync(
+        self, texts: list[str], before: Callable[[], Awaitable[Any]] | None = None
+    ) -> list[list[float]]:
+        if not texts:
+            return []
+        return self.loop_thread.run_coroutine(self._submit(list(texts), before)).result()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts": self.texts,
+            "pending": self._pending_texts,
+        }
+
+    def _get_batch_size(self) -> int:
+        size = self.batch_size() if callable(self.batch_size) else self.batch_size
+        return max(1, int(size or DEFAULT_BATCH_SIZE))
+
+    async def _submit(
+        self, texts: list[str], before: Callable[[], Awaitable[Any]] | None
+    ) -> list[list[float]]:
+        if before:
+            await before()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+        self.requests += 1
+        if self._pending_texts >= self._get_batch_size():
+            self._flush()
+        elif not self._flush_handle:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        requests, self._pending, self._pending_texts = self._pending, [], 0
+        if requests:
+            asyncio.get_running_loop().create_task(self._run(requests))
+
+    async def _run(self, requests: list[tuple[list[str], asyncio.Future]]):
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        unique = list(dict.fromkeys(text for texts, _ in requests for text in texts))
+        size = self._get_batch_size()
+        try:
+            batches = [unique[i : i + size] for i in range(0, len(unique), size)]
+            results = await asyncio.gather(*[self._embed(batch) for batch in batches])
+            vectors = {
+                text: vector
+                for batch, batch_vectors in zip(batches, results)
+                for text, vector in zip(batch, batch_vectors)
+            }
+            for texts, future in requests:
+                if not future.done():
+                    future.set_result([vectors[text] for text in texts])
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _embed(self, batch: list[str]) -> list[list[float]]:
+        async with self._semaphore:  # type: ignore
+            self.batches += 1
+            self.texts += len(batch)
+            return await self.embed_batch(batch)
+
+
+_batchers: dict[Hashable, EmbeddingBatcher] = {}
+_lock = threading.Lock()
+
+
+def get_batcher(
+    key: Hashable, create: Callable[[], EmbeddingBatcher], owner: Any = None
+) -> EmbeddingBatcher:
+    """Batcher shared by all embedding wrappers of the same model, so requests of
+    different callers are coalesced. It is created by create on first use and,
+    when owner is given, dropped once owner is garbage collected."""
+    with _lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = create()
+            if owner is not None:
+                weakref.finalize(owner, _drop, key)
+        return batcher
+
+
+def _drop(key: Hashable):
+    with _lock:
+        _batchers.pop(key, None)
@@ -0,0 +1,251 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, Optional, Sequence
+
+from langchain_core.stores import ByteStore
+
+from python.helpers.print_style import PrintStyle
+
+DB_FILE = "cache.sqlite"
+MAX_BYTES = 1024 * 1024 * 1024  # on-disk size after which least recently used entries are evicted
+EVICT_TO = 0.9  # share of MAX_BYTES kept after eviction
+MEMORY_BYTES = 32 * 1024 * 1024  # in-memory LRU tier
+BATCH = 500  # keys per SQL statement, stays under SQLite's variable limit
+MIGRATE_BATCH = 1000
+
+
+class PackedByteStore(ByteStore):
+    """Embeddings cache packed into a single SQLite file.
+
+    Replaces LocalFileStore, which writes one file per cached text. Values are
+    also kept in an in-memory LRU tier, the file is kept under max_bytes by
+    evicting the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = MAX_BYTES,
+        memory_bytes: int = MEMORY_BYTES,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_size = 0
+        # access times of memory tier hits, written to the file in batches
+        self._touched: dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def mget(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        with self._lock:
+            found: dict[str, bytes] = {}
+            missing = []
+            now = time.time()
+            for key in keys:
+                value = self._memory.get(key)
+                if value is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    self._touched[key] = now
+                    found[key] = value
+            if len(self._touched) >= BATCH:
+                self._flush_touched()
+            if missing:
+                for chunk in _chunks(list(dict.fromkeys(missing))):
+                    marks = _marks(chunk)
+                    rows = self._conn.execute(
+                        f"SELECT key, value FROM cache WHERE key IN ({marks})", chunk
+                    ).fetchall()
+                    if rows:
+                        hits = [key for key, _ in rows]
+                        self._conn.execute(
+                            f"UPDATE cache SET accessed = ? WHERE key IN ({_marks(hits)})",
+                            [now, *hits],
+                        )
+                    for key, value in rows:
+                        found[key] = value
+                        self._remember(key, value)
+            return [found.get(key) for key in keys]
+
+    def mset(self, key_value_pairs: Sequence[tuple[str, bytes]]) -> None:
+        pairs = dict(key_value_pairs)
+        if not pairs:
+            return
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN")
+            try:
+                self._size -= self._stored_size(list(pairs.keys()))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    [(key, value, len(value), now) for key, value in pairs.items()],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for key, value in pairs.items():
+                self._touched.pop(key, None)
+                self._size += len(value)
+                self._remember(key, value)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._forget(key)
+            for chunk in _chunks(list(keys)):
+                self._size -= self._stored_size(chunk)
+                self._conn.execute(f"DELETE FROM cache WHERE key IN ({_marks(chunk)})", chunk)
+
+    def yield_keys(self, *, prefix: Optional[str] = None) -> Iterator[str]:
+        with self._lock:
+            if prefix:
+                rows = self._conn.execute(
+                    "SELECT key FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT key FROM cache").fetchall()
+        for (key,) in rows:
+            yield key
+
+    def get_size(self) -> int:
+        return self._size
+
+    def _stored_size(self, keys: list[str]) -> int:
+        return sum(
+            self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM cache WHERE key IN ({_marks(chunk)})", chunk
+            ).fetchone()[0]
+            for chunk in _chunks(keys)
+        )
+
+    def _remember(self, key: str, value: bytes):
+        if len(value) > self.memory_bytes:
+            return
+        self._forget(key)
+        self._memory[key] = value
+        self._memory_size += len(value)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _forget(self, key: str):
+        value = self._memory.pop(key, None)
+        if value is not None:
+            self._memory_size -= len(value)
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        # entries read from memory must not look unused
+        self._flush_touched()
+        target = int(self.max_bytes * EVICT_TO)
+        while self._size > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM cache ORDER BY accessed LIMIT ?", (BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            keys = []
+            for key, size in rows:
+                keys.append(key)
+                self._size -= size
+                self._forget(key)
+                if self._size <= target:
+                    break
+            self._conn.execute(f"DELETE FROM cache WHERE key IN ({_marks(keys)})", keys)
+
+    def migrate_files(self, folder: str) -> int:
+        """Move the files of a LocalFileStore in folder into this store, keys are
+        the relative file paths. Returns the number of migrated entries."""
+        migrated = 0
+        batch: list[tuple[str, bytes]] = []
+        paths: list[str] = []
+
+        def commit():
+            nonlocal migrated
+            self.mset(batch)
+            for path in paths:
+                os.remove(path)
+            migrated += len(batch)
+            batch.clear()
+            paths.clear()
+
+        db_name = os.path.basename(self.path)
+        for root, _dirs, names in os.walk(folder):
+            for name in names:
+                path = os.path.join(root, name)
+                if root == folder and name.startswith(db_name):
+                    continue  # the database, its journal and temp files
+                key = os.path.relpath(path, folder).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    batch.append((key, f.read()))
+                paths.append(path)
+                if len(batch) >= MIGRATE_BATCH:
+                    commit()
+        if batch:
+            commit()
+
+        # remove emptied subfolders
+        for root, dirs, _names in os.walk(folder, topdown=False):
+            for name in dirs:
+                try:
+                    os.rmdir(os.path.join(root, name))
+                except OSError:
+                    pass
+        return migrated
+
+
+_stores: dict[str, PackedByteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder: str) -> PackedByteStore:
+    """Shared packed store in folder, files of a previous LocalFileStore there
+    are migrated into it on first use."""
+    with _stores_lock:
+        store = _stores.get(folder)
+        if store is None:
+            os.makedirs(folder, exist_ok=True)
+            store = PackedByteStore(os.path.join(folder, DB_FILE))
+            if _has_loose_files(folder):
+                PrintStyle.standard("Migrating embeddings cache...")
+                count = store.migrate_files(folder)
+                PrintStyle.standard(f"Migrated {count} cached embeddings")
+            _stores[folder] = store
+        return store
+
+
+def _has_loose_files(folder: str) -> bool:
+    with os.scandir(folder) as entries:
+        return any(not entry.name.startswith(DB_FILE) for entry in entries)
+
+
+def _chunks(keys: list[str]) -> Iterator[list[str]]:
+    for i in range(0, len(keys), BATCH):
+        yield keys[i : i + BATCH]
+
+
+def _marks(keys: Sequence[str]) -> str:
+    return ", ".join("?" * len(keys))
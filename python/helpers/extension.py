@@ -1,6 +1,6 @@
 from abc import abstractmethod
+import time
 from typing import Any
-from python.helpers import extract_tools, files 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from agent import Agent
@@ -17,44 +17,15 @@ class Extension:
 
 
 async def call_extensions(extension_point: str, agent: "Agent|None" = None, **kwargs) -> Any:
+    from python.helpers import class_registry
 
-    # get default extensions
-    defaults = await _get_extensions("python/extensions/" + extension_point)
-    classes = defaults
-
-    # get agent extensions
-    if agent and agent.config.profile:
-        agentics = await _get_extensions("agents/" + agent.config.profile + "/extensions/" + extension_point)
-        if agentics:
-            # merge them, agentics overwrite defaults
-            unique = {}
-            for cls in defaults + agentics:
-                unique[_get_file_from_module(cls.__module__)] = cls
-
-            # sort by name
-            classes = sorted(unique.values(), key=lambda cls: _get_file_from_module(cls.__module__))
+    # get default extensions merged with agent extensions, precomputed per profile and point
+    profile = agent.config.profile if agent else ""
+    classes = class_registry.get_extension_classes(profile, extension_point)
 
     # call extensions
     for cls in classes:
-        await cls(agent=agent).execute(**kwargs)
-
-
-def _get_file_from_module(module_name: str) -> str:
-    return module_name.split(".")[-1]
-
-_cache: dict[str, list[type[Extension]]] = {}
-async def _get_extensions(folder:str):
-    global _cache
-    folder = files.get_abs_path(folder)
-    if folder in _cache:
-        classes = _cache[folder]
-    else:
-        if not files.exists(folder):
-            return []
-        classes = extract_tools.load_classes_from_folder(
-            folder, "*", Extension
-        )
-        _cache[folder] = classes
-
-    return classes
-
+        start = time.perf_counter()
+        extension = cls(agent=agent)
+        class_registry.record_time("extension_init", time.perf_counter() - start)
+        await extension.execute(**kwargs)
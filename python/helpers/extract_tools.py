@@ -59,9 +59,18 @@ def fix_json_string(json_string):
 
 T = TypeVar('T')  # Define a generic type variable
 
+_modules: dict[str, tuple[int, ModuleType]] = {}
+
 def import_module(file_path: str) -> ModuleType:
     # Handle file paths with periods in the name using importlib.util
     abs_path = get_abs_path(file_path)
+
+    # modules are executed once and reloaded only when the file changes
+    mtime = os.stat(abs_path).st_mtime_ns
+    cached = _modules.get(abs_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
     module_name = os.path.basename(abs_path).replace('.py', '')
     
     # Create the module spec and load the module
@@ -71,6 +80,7 @@ def import_module(file_path: str) -> ModuleType:
         
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
+    _modules[abs_path] = (mtime, module)
     return module
 
 def load_classes_from_folder(folder: str, name_pattern: str, base_class: Type[T], one_per_file: bool = True) -> list[Type[T]]:
@@ -101,10 +111,18 @@ def load_classes_from_folder(folder: str, name_pattern: str, base_class: Type[T]
 
     return classes
 
+_file_classes: dict[tuple[str, type, bool], tuple[ModuleType, list]] = {}
+
 def load_classes_from_file(file: str, base_class: type[T], one_per_file: bool = True) -> list[type[T]]:
     classes = []
     # Use the new import_module function
     module = import_module(file)
+
+    # reuse the class list while the module has not been reloaded
+    key = (get_abs_path(file), base_class, one_per_file)
+    cached = _file_classes.get(key)
+    if cached and cached[0] is module:
+        return list(cached[1])
     
     # Get all classes in the module
     class_list = inspect.getmembers(module, inspect.isclass)
@@ -117,4 +135,5 @@ def load_classes_from_file(file: str, base_class: type[T], one_per_file: bool =
             if one_per_file:
                 break
                 
-    return classes
+    _file_classes[key] = (module, classes)
+    return list(classes)
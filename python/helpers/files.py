@@ -15,6 +15,7 @@ import importlib.util
 import inspect
 import glob
 import mimetypes
+import time
 
 
 class VariablesPlugin(ABC):
@@ -86,17 +87,14 @@ def parse_file(
     if _directories is None:
         _directories = []
 
-    # Find the file in the directories
-    absolute_path = find_file_in_dirs(_filename, _directories)
-
-    # Read the file content
-    with open(absolute_path, "r", encoding=_encoding) as f:
-        # content = remove_code_fences(f.read())
-        content = f.read()
+    # Find and read the file, or reuse the cached template
+    template = _get_prompt_template(_filename, _directories, _encoding)
+    absolute_path = template.path
+    content = template.content
 
     is_json = is_full_json_template(content)
     content = remove_code_fences(content)
-    variables = load_plugin_variables(absolute_path, _directories, **kwargs) or {}  # type: ignore
+    variables = template.get_plugin_variables(absolute_path, _directories, **kwargs)
     variables.update(kwargs)
     if is_json:
         content = replace_placeholders_json(content, **variables)
@@ -127,29 +125,101 @@ def read_prompt_file(
         _file = os.path.basename(_file)
         _directories = [folder_path] + _directories
 
-    # Find the file in the directories
-    absolute_path = find_file_in_dirs(_file, _directories)
-
-    # Read the file content
-    with open(absolute_path, "r", encoding=_encoding) as f:
-        # content = remove_code_fences(f.read())
-        content = f.read()
+    # Find, read and parse the file, or reuse the cached template
+    template = _get_prompt_template(_file, _directories, _encoding)
 
-    variables = load_plugin_variables(_file, _directories, **kwargs) or {}  # type: ignore
+    variables = template.get_plugin_variables(_file, _directories, **kwargs)
     variables.update(kwargs)
 
-    # Replace placeholders with values from kwargs
-    content = replace_placeholders_text(content, **variables)
-
-    # Process include statements
-    content = process_includes(
-        # here we use kwargs, the plugin variables are not inherited
-        content,
-        _directories,
-        **kwargs,
-    )
+    # Replace placeholders with values and process include statements,
+    # here we use kwargs, the plugin variables are not inherited
+    return template.render(_directories, variables, kwargs)
 
-    return content
+
+PROMPT_CACHE_CHECK_INTERVAL = 1.0  # seconds between file change checks of a cached prompt
+
+
+class _PromptTemplate:
+    """Prompt file found in a list of directories, with its content and
+    variables plugin class.
+    Remembers mtimes of the file, the plugin and the searched directories to
+    detect edits and files added to higher priority directories."""
+
+    def __init__(self, _file: str, _directories: list[str], _encoding: str):
+        self.stamps: list[tuple[str, int]] = []
+        self.path = self._find(_file, _directories)
+        with open(self.path, "r", encoding=_encoding) as f:
+            self.content = f.read()
+        self.stamps.append((self.path, _mtime(self.path)))
+
+        self.plugin: type[VariablesPlugin] | None = None
+        if _file.endswith(".md"):
+            plugin_filename = basename(_file, ".md") + ".py"
+            try:
+                plugin_file = self._find(plugin_filename, [dirname(_file)] + _directories)
+            except FileNotFoundError:
+                plugin_file = None
+            if plugin_file:
+                from python.helpers import extract_tools
+
+                self.stamps.append((plugin_file, _mtime(plugin_file)))
+                classes = extract_tools.load_classes_from_file(
+                    plugin_file, VariablesPlugin, one_per_file=False
+                )
+                self.plugin = classes[0] if classes else None
+        self.checked_at = time.monotonic()
+
+    def _find(self, _filename: str, _directories: list[str]) -> str:
+        # like find_file_in_dirs, but also stamps the directories searched
+        for directory in _directories:
+            full_path = get_abs_path(directory, _filename)
+            folder = os.path.dirname(full_path)
+            self.stamps.append((folder, _mtime(folder)))
+            if os.path.exists(full_path):
+                return full_path
+        raise FileNotFoundError(
+            f"File '{_filename}' not found in any of the provided directories."
+        )
+
+    def is_fresh(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at < PROMPT_CACHE_CHECK_INTERVAL:
+            return True
+        if all(_mtime(path) == mtime for path, mtime in self.stamps):
+            self.checked_at = now
+            return True
+        return False
+
+    def get_plugin_variables(self, _file: str, _directories: list[str], **kwargs) -> dict[str, Any]:
+        if not self.plugin:
+            return {}
+        return self.plugin().get_variables(_file, _directories, **kwargs) or {}  # type: ignore < abstract class here is ok, it is always a subclass
+
+    def render(self, _directories: list[str], variables: dict[str, Any], kwargs: dict[str, Any]) -> str:
+        if "{{" not in self.content:
+            return self.content  # nothing to replace or include
+        content = replace_placeholders_text(self.content, **variables)
+        # includes may also come with the substituted values
+        return process_includes(content, _directories, **kwargs)
+
+
+_prompt_cache: dict[tuple[str, tuple[str, ...], str], _PromptTemplate] = {}
+
+
+def _get_prompt_template(_file: str, _directories: list[str], _encoding: str) -> _PromptTemplate:
+    key = (_file, tuple(_directories), _encoding)
+    template = _prompt_cache.get(key)
+    if template is None or not template.is_fresh():
+        template = _PromptTemplate(_file, _directories, _encoding)
+        _prompt_cache[key] = template
+    return template
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
 
 
 def read_file(relative_path: str, encoding="utf-8"):
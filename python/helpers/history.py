@@ -296,6 +296,7 @@ class History(Record):
         from agent import Agent
 
         self.counter = 0
+        self.version = 0  # incremented on changes other than appending messages
         self.bulks: list[Bulk] = []
         self.topics: list[Topic] = []
         self.current = Topic(history=self)
@@ -332,6 +333,7 @@ class History(Record):
         if self.current.messages:
             self.topics.append(self.current)
             self.current = Topic(history=self)
+            self.version += 1
 
     def output(self) -> list[OutputMessage]:
         result: list[OutputMessage] = []
@@ -390,6 +392,7 @@ class History(Record):
                         break
 
             if compressed_part:
+                self.version += 1
                 compressed = True
                 continue
             else:
@@ -0,0 +1,295 @@
+import asyncio
+import atexit
+import http.cookiejar
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_CONNECTIONS = 100  # open connections per pool
+MAX_CONNECTIONS_PER_HOST = 16
+MAX_POOLED_HOSTS = 32  # hosts with kept connections in the sync session
+KEEPALIVE_TIMEOUT = 60.0  # seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # seconds a resolved host is cached
+
+
+class _HostStats:
+    def __init__(self, host: str):
+        self.host = host
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_used = 0.0
+
+    def output(self) -> dict[str, Any]:
+        done = self.requests - self.in_flight
+        return {
+            "host": self.host,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "avg_latency_ms": round(self.latency_total / done * 1000, 1) if done else 0.0,
+            "max_latency_ms": round(self.latency_max * 1000, 1),
+            "last_used": self.last_used,
+        }
+
+
+_stats: dict[str, _HostStats] = {}
+_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+_closers: dict[asyncio.AbstractEventLoop, Any] = {}
+_sync_session: requests.Session | None = None
+_litellm_client: Any = None
+_lock = threading.Lock()
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Shared aiohttp session of the running event loop.
+    Connections are kept alive per host and resolved hosts are cached.
+    The session must not be closed by callers."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+        # sessions of loops closed without finalizing them
+        for other in [l for l in _sessions if l.is_closed()]:
+            _close_detached(_sessions.pop(other))
+            _closers.pop(other, None)
+        session = _sessions[loop] = _create_session()
+        _closers[loop] = _close_with_loop(loop, session)
+    return session
+
+
+def get_litellm_client() -> Any:
+    """httpx client for LiteLLM, its requests go through the shared session of the running loop.
+    LiteLLM uses it for OpenAI compatible providers, including streamed completions."""
+    global _litellm_client
+    with _lock:
+        if _litellm_client is None:
+            import httpx
+            from litellm.llms.custom_httpx.aiohttp_transport import LiteLLMAiohttpTransport
+
+            class PooledTransport(LiteLLMAiohttpTransport):
+                def _get_valid_client_session(self) -> aiohttp.ClientSession:
+                    return get_session()
+
+                async def aclose(self) -> None:
+                    pass  # sessions are closed with their loops
+
+            _litellm_client = httpx.AsyncClient(
+                transport=PooledTransport(client=get_session), follow_redirects=True
+            )
+        return _litellm_client
+
+
+def get_sync_session() -> requests.Session:
+    """Shared requests session with pooled keep-alive connections, safe to use from any thread."""
+    global _sync_session
+    with _lock:
+        if _sync_session is None:
+            _sync_session = _create_sync_session()
+        return _sync_session
+
+
+async def close_session():
+    """Close the shared session of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _sessions.pop(loop, None)
+        _closers.pop(loop, None)
+    if session:
+        await session.close()
+
+
+def close_all():
+    """Close shared sessions of loops that are still open, runs at exit."""
+    with _lock:
+        sessions = list(_sessions.items())
+        _sessions.clear()
+        _closers.clear()
+    for loop, session in sessions:
+        try:
+            if session.closed:
+                continue
+            if loop.is_closed():
+                _close_detached(session)
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=2)
+            else:
+                loop.run_until_complete(session.close())
+        except Exception:
+            pass
+
+
+atexit.register(close_all)
+
+
+def _close_with_loop(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> Any:
+    # an async generator started in the loop is registered with it, asyncio.run()
+    # and loop.shutdown_asyncgens() finalize it before the loop is closed
+    async def closer():
+        try:
+            yield
+        finally:
+            with _lock:
+                if _sessions.get(loop) is session:
+                    del _sessions[loop]
+                    _closers.pop(loop, None)
+            await session.close()
+
+    generator = closer()
+    try:
+        generator.__anext__().send(None)  # runs to the yield, nothing is awaited
+    except StopIteration:
+        pass
+    return generator
+
+
+def _close_detached(session: aiohttp.ClientSession):
+    # connections of a closed loop can't be awaited, closing only marks the session closed
+    coro = session.close()
+    try:
+        coro.send(None)
+    except StopIteration:
+        pass
+    except Exception:
+        pass
+    finally:
+        coro.close()
+
+
+def get_stats() -> list[dict[str, Any]]:
+    with _lock:
+        stats = list(_stats.values())
+        sync_session = _sync_session
+    result = {s.host: s.output() for s in stats}
+    # urllib3 counts the connections it opened per host pool
+    for host, count in _get_sync_connections(sync_session).items():
+        if host in result:
+            result[host]["new_connections"] += count
+    return list(result.values())
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    # callers don't share cookies through the shared session
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        trace_configs=[_trace_config()],
+    )
+
+
+def _create_sync_session() -> requests.Session:
+    session = _StatsSession()
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=MAX_POOLED_HOSTS,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _StatsSession(requests.Session):
+    def request(self, method, url, *args, **kwargs):  # type: ignore
+        stats = _start_request(url)
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            _end_request(stats, time.perf_counter() - start, error=True)
+            raise
+        # elapsed is the time until response headers were parsed
+        _end_request(stats, response.elapsed.total_seconds(), error=response.status_code >= 500)
+        return response
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx: SimpleNamespace, params):
+        ctx.stats = _start_request(str(params.url))
+        ctx.start = time.perf_counter()
+
+    async def on_request_end(session, ctx: SimpleNamespace, params):
+        # fires when response headers are received
+        _end_request(ctx.stats, time.perf_counter() - ctx.start, error=params.response.status >= 500)
+
+    async def on_request_exception(session, ctx: SimpleNamespace, params):
+        _end_request(ctx.stats, time.perf_counter() - ctx.start, error=True)
+
+    async def on_connection_create_end(session, ctx: SimpleNamespace, params):
+        ctx.stats.new_connections += 1
+
+    async def on_connection_reuseconn(session, ctx: SimpleNamespace, params):
+        ctx.stats.reused_connections += 1
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace
+
+
+def _start_request(url: str) -> _HostStats:
+    host = _get_host(url)
+    with _lock:
+        stats = _stats.get(host)
+        if stats is None:
+            stats = _stats[host] = _HostStats(host)
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.last_used = time.time()
+    return stats
+
+
+def _end_request(stats: _HostStats, latency: float, error: bool = False):
+    with _lock:
+        stats.in_flight -= 1
+        stats.latency_total += latency
+        stats.latency_max = max(stats.latency_max, latency)
+        if error:
+            stats.errors += 1
+
+
+def _get_host(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return url
+    port = parts.port or (443 if parts.scheme in ("https", "wss") else 80)
+    return f"{parts.hostname}:{port}"
+
+
+def _get_sync_connections(session: requests.Session | None) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    if session is None:
+        return counts
+    try:
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools  # type: ignore
+            for key in pools.keys():
+                pool = pools[key]
+                host = f"{pool.host}:{pool.port}"
+                counts[host] = counts.get(host, 0) + pool.num_connections
+    except Exception:
+        pass  # urllib3 internals, stats only
+    return counts
@@ -1,22 +1,31 @@
 import glob
 import os
 import hashlib
-from typing import Any, Dict, Literal, TypedDict
-from langchain_community.document_loaders import (
-    CSVLoader,
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredHTMLLoader,
-)
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, Literal, NotRequired, TypedDict
+from langchain_core.documents import Document
+from python.helpers.files import get_base_dir
+from python.helpers.knowledge_loader import file_types_loaders, load_file
 from python.helpers.log import LogItem
 from python.helpers.print_style import PrintStyle
 
-text_loader_kwargs = {"autodetect_encoding": True}
+PARALLEL_TYPES = {"pdf", "html"}  # slow to parse, loaded in worker processes
+PARALLEL_TIMEOUT = 120.0  # seconds without any finished file before workers are given up
+WORKER_MODULE = "python.helpers.knowledge_loader"  # entry point of worker processes
+CHECKSUM_CHUNK = 1024 * 1024
+PROGRESS_INTERVAL = 1.0  # seconds between progress updates
 
 
 class KnowledgeImport(TypedDict):
     file: str
     checksum: str
+    size: NotRequired[int]
+    mtime: NotRequired[int]  # nanoseconds
     ids: list[str]
     state: Literal["changed", "original", "removed"]
     documents: list[Any]
@@ -25,11 +34,147 @@ class KnowledgeImport(TypedDict):
 def calculate_checksum(file_path: str) -> str:
     hasher = hashlib.md5()
     with open(file_path, "rb") as f:
-        buf = f.read()
-        hasher.update(buf)
+        while chunk := f.read(CHECKSUM_CHUNK):
+            hasher.update(chunk)
     return hasher.hexdigest()
 
 
+def load_files(
+    log_item: LogItem | None, files: list[tuple[str, str]]
+) -> Iterator[tuple[str, list[Document] | Exception]]:
+    """Load (file_path, ext) pairs, yields (file_path, documents or error) as
+    files finish. PDF and HTML files are parsed in worker processes while the
+    others are loaded in this thread. Files of stalled or failed workers are
+    loaded in this thread too."""
+    parallel = [(path, ext) for path, ext in files if ext in PARALLEL_TYPES]
+    workers = min(len(parallel), os.cpu_count() or 1)
+    if workers < 2:
+        parallel = []
+    serial = [item for item in files if item not in parallel]
+
+    done = 0
+    last_progress = time.monotonic()
+
+    def report(file_path: str):
+        nonlocal done, last_progress
+        done += 1
+        now = time.monotonic()
+        if log_item and (now - last_progress >= PROGRESS_INTERVAL or done == len(files)):
+            last_progress = now
+            log_item.stream(progress=f"\nLoaded {done}/{len(files)} files")
+
+    def load(path: str, ext: str) -> list[Document] | Exception:
+        try:
+            return load_file(path, ext)
+        except Exception as e:
+            return e
+
+    # each thread of the pool drives one worker process
+    pool = _WorkerPool(workers) if parallel else None
+    try:
+        futures: dict[Future, tuple[str, str]] = {
+            pool.submit(path, ext): (path, ext) for path, ext in parallel
+        } if pool else {}
+
+        for path, ext in serial:
+            yield path, load(path, ext)
+            report(path)
+
+        fallback: list[tuple[str, str]] = []
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=PARALLEL_TIMEOUT, return_when=FIRST_COMPLETED)
+            if not finished:
+                PrintStyle(font_color="yellow").print(
+                    f"Knowledge import workers stalled, loading {len(pending)} files serially"
+                )
+                fallback = [futures[future] for future in pending]
+                pending = set()
+                pool.close(kill=True)  # type: ignore
+            for future in finished:
+                path, ext = futures[future]
+                try:
+                    yield path, future.result()
+                except _WorkerError:
+                    yield path, load(path, ext)  # the worker died, the file may still be fine
+                report(path)
+        for path, ext in fallback:
+            yield path, load(path, ext)
+            report(path)
+    finally:
+        if pool:
+            pool.close()
+
+
+class _WorkerError(Exception):
+    pass
+
+
+class _Worker:
+    """Loader process started from the side effect free loader module, not forked
+    from this multi-threaded process and not importing the application again."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", WORKER_MODULE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=get_base_dir(),
+        )
+
+    def load(self, file_path: str, ext: str) -> list[Document] | Exception:
+        try:
+            pickle.dump((file_path, ext), self.process.stdin)  # type: ignore
+            self.process.stdin.flush()  # type: ignore
+            return pickle.load(self.process.stdout)  # type: ignore
+        except Exception as e:
+            raise _WorkerError(str(e)) from e
+
+    def close(self, kill: bool = False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.process.stdin.close()  # type: ignore  # the worker exits at end of input
+            except Exception:
+                pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class _WorkerPool:
+    def __init__(self, size: int):
+        self._executor = ThreadPoolExecutor(size, thread_name_prefix="KnowledgeLoader")
+        self._local = threading.local()
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, file_path: str, ext: str) -> Future:
+        return self._executor.submit(self._load, file_path, ext)
+
+    def _load(self, file_path: str, ext: str) -> list[Document] | Exception:
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            with self._lock:
+                if self._closed:
+                    raise _WorkerError("worker pool closed")
+                worker = self._local.worker = _Worker()
+                self._workers.append(worker)
+        return worker.load(file_path, ext)
+
+    def close(self, kill: bool = False):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        # killed workers end blocked reads of the pool threads
+        for worker in workers:
+            worker.close(kill=kill)
+
+
 def load_knowledge(
     log_item: LogItem | None,
     knowledge_dir: str,
@@ -41,21 +186,10 @@ def load_knowledge(
     """
     Load knowledge files from a directory with change detection and metadata enhancement.
 
-    This function now includes enhanced error handling and compatibility with the
-    intelligent memory consolidation system.
+    Files whose size and modification time match the index are not read at all,
+    others are hashed and only files with a different checksum are parsed.
     """
 
-    # Mapping file extensions to corresponding loader classes
-    # Note: Using TextLoader for JSON and MD to avoid parsing issues with consolidation
-    file_types_loaders = {
-        "txt": TextLoader,
-        "pdf": PyPDFLoader,
-        "csv": CSVLoader,
-        "html": UnstructuredHTMLLoader,
-        "json": TextLoader,  # Use TextLoader for better consolidation compatibility
-        "md": TextLoader,    # Use TextLoader for better consolidation compatibility
-    }
-
     cnt_files = 0
     cnt_docs = 0
 
@@ -114,6 +248,7 @@ def load_knowledge(
                 progress=f"\nFound {len(kn_files)} knowledge files in {knowledge_dir}, processing...",
             )
 
+    changed: dict[str, tuple[str, str, os.stat_result]] = {}
     for file_path in kn_files:
         try:
             # Get file extension safely
@@ -125,11 +260,8 @@ def load_knowledge(
             if ext not in file_types_loaders:
                 continue  # Skip unsupported file types
 
-            checksum = calculate_checksum(file_path)
-            if not checksum:
-                continue  # Skip files with checksum errors
-
             file_key = file_path
+            stat = os.stat(file_path)
 
             # Load existing data from the index or create a new entry
             file_data: KnowledgeImport = index.get(file_key, {
@@ -140,59 +272,72 @@ def load_knowledge(
                 "documents": []
             })
 
+            # Unchanged size and modification time, skip hashing
+            if (
+                file_data.get("checksum")
+                and file_data.get("size") == stat.st_size
+                and file_data.get("mtime") == stat.st_mtime_ns
+            ):
+                file_data["state"] = "original"
+                index[file_key] = file_data
+                continue
+
+            checksum = calculate_checksum(file_path)
+            if not checksum:
+                continue  # Skip files with checksum errors
+
             # Check if file has changed
             if file_data.get("checksum") == checksum:
                 file_data["state"] = "original"
+                file_data["size"] = stat.st_size
+                file_data["mtime"] = stat.st_mtime_ns
+                index[file_key] = file_data
             else:
-                file_data["state"] = "changed"
-
-            # Process changed files
-            if file_data["state"] == "changed":
-                file_data["checksum"] = checksum
-                loader_cls = file_types_loaders[ext]
-
-                try:
-                    loader = loader_cls(
-                        file_path,
-                        **(
-                            text_loader_kwargs
-                            if ext in ["txt", "csv", "html", "md"]
-                            else {}
-                        ),
-                    )
-                    documents = loader.load_and_split()
-
-                    # Enhanced metadata for better consolidation compatibility
-                    enhanced_metadata = {
-                        **metadata,
-                        "source_file": os.path.basename(file_path),
-                        "source_path": file_path,
-                        "file_type": ext,
-                        "knowledge_source": True,  # Flag to distinguish from conversation memories
-                        "import_timestamp": None,  # Will be set when inserted into memory
-                    }
-
-                    # Apply metadata to all documents
-                    for doc in documents:
-                        doc.metadata = {**doc.metadata, **enhanced_metadata}
-
-                    file_data["documents"] = documents
-                    cnt_files += 1
-                    cnt_docs += len(documents)
-
-                except Exception as e:
-                    PrintStyle(font_color="red").print(f"Error loading {file_path}: {e}")
-                    if log_item:
-                        log_item.stream(progress=f"\nError loading {os.path.basename(file_path)}: {e}")
-                    continue
-
-            # Update the index
-            index[file_key] = file_data
+                changed[file_key] = (ext, checksum, stat)
 
         except Exception as e:
             PrintStyle(font_color="red").print(f"Error processing {file_path}: {e}")
             continue
 
+    # Process changed files
+    to_load = [(file_path, ext) for file_path, (ext, _, _) in changed.items()]
+    for file_path, result in load_files(log_item, to_load):
+        if isinstance(result, Exception):
+            PrintStyle(font_color="red").print(f"Error loading {file_path}: {result}")
+            if log_item:
+                log_item.stream(progress=f"\nError loading {os.path.basename(file_path)}: {result}")
+            if file_path in index:
+                index[file_path]["state"] = "original"  # keep the previous version, retry next time
+            continue
+
+        ext, checksum, stat = changed[file_path]
+
+        # Enhanced metadata for better consolidation compatibility
+        enhanced_metadata = {
+            **metadata,
+            "source_file": os.path.basename(file_path),
+            "source_path": file_path,
+            "file_type": ext,
+            "knowledge_source": True,  # Flag to distinguish from conversation memories
+            "import_timestamp": None,  # Will be set when inserted into memory
+        }
+
+        # Apply metadata to all documents
+        for doc in result:
+            doc.metadata = {**doc.metadata, **enhanced_metadata}
+
+        file_data = index.get(file_path, {"file": file_path, "ids": []})  # type: ignore
+        file_data["checksum"] = checksum
+        file_data["size"] = stat.st_size
+        file_data["mtime"] = stat.st_mtime_ns
+        file_data["state"] = "changed"
+        file_data["documents"] = result
+        cnt_files += 1
+        cnt_docs += len(result)
+
+        # Update the index
+        index[file_path] = file_data
+
     # Mark removed files
     current_files = set(kn_files)
     for file_key, file_data in list(index.items()):
@@ -0,0 +1,61 @@
+# Knowledge file loaders, also the entry point of knowledge import worker processes:
+#   python -m python.helpers.knowledge_loader
+# Workers import only this module, keep it free of application imports and side effects.
+
+import pickle
+import sys
+
+from langchain_core.documents import Document
+from langchain_community.document_loaders import (
+    CSVLoader,
+    PyPDFLoader,
+    TextLoader,
+    UnstructuredHTMLLoader,
+)
+
+text_loader_kwargs = {"autodetect_encoding": True}
+
+# Mapping file extensions to corresponding loader classes
+# Note: Using TextLoader for JSON and MD to avoid parsing issues with consolidation
+file_types_loaders = {
+    "txt": TextLoader,
+    "pdf": PyPDFLoader,
+    "csv": CSVLoader,
+    "html": UnstructuredHTMLLoader,
+    "json": TextLoader,  # Use TextLoader for better consolidation compatibility
+    "md": TextLoader,    # Use TextLoader for better consolidation compatibility
+}
+
+
+def load_file(file_path: str, ext: str) -> list[Document]:
+    loader_cls = file_types_loaders[ext]
+    loader = loader_cls(
+        file_path,
+        **(
+            text_loader_kwargs
+            if ext in ["txt", "csv", "html", "md"]
+            else {}
+        ),
+    )
+    return loader.load_and_split()
+
+
+def serve():
+    # (file_path, ext) requests and documents or error results are pickled on stdin and stdout
+    requests, results = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr  # loader output must not end up between results
+    while True:
+        try:
+            file_path, ext = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            data = pickle.dumps(load_file(file_path, ext))
+        except Exception as e:
+            data = pickle.dumps(RuntimeError(f"{type(e).__name__}: {e}"))
+        results.write(data)
+        results.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -3,16 +3,18 @@ import json
 from typing import Any, Literal, Optional, Dict, TypeVar, TYPE_CHECKING
 
 T = TypeVar("T")
+import threading
 import uuid
 from collections import OrderedDict  # Import OrderedDict
 from python.helpers.strings import truncate_text_by_ratio
-import copy
 from typing import TypeVar
 from python.helpers.secrets import get_secrets_manager
+from python.helpers import update_notifier
 
 
 if TYPE_CHECKING:
     from agent import AgentContext
+    from python.helpers.secrets import SecretsMasker
 
 T = TypeVar("T")
 
@@ -56,29 +58,26 @@ def _truncate_progress(text: str | None) -> str:
 
 
 def _truncate_key(text: str) -> str:
+    if isinstance(text, str) and len(text) <= KEY_MAX_LEN:
+        return text
     return truncate_text_by_ratio(str(text), KEY_MAX_LEN, "...", ratio=1.0)
 
 
 def _truncate_value(val: T) -> T:
-    # If dict, recursively truncate each value
+    # Containers are rebuilt with truncated items, the original is left untouched
     if isinstance(val, dict):
-        for k in list(val.keys()):
-            v = val[k]
-            del val[k]
-            val[_truncate_key(k)] = _truncate_value(v)
-        return val
-    # If list or tuple, recursively truncate each item
+        return {_truncate_key(k): _truncate_value(v) for k, v in val.items()}  # type: ignore
     if isinstance(val, list):
-        for i in range(len(val)):
-            val[i] = _truncate_value(val[i])
-        return val
+        return [_truncate_value(v) for v in val]  # type: ignore
     if isinstance(val, tuple):
         return tuple(_truncate_value(x) for x in val) # type: ignore
 
-    # Convert non-str values to json for consistent length measurement
     if isinstance(val, str):
         raw = val
+    elif val is None or isinstance(val, (bool, int, float)):
+        return val  # scalars are never long enough to be truncated
     else:
+        # Convert other values to json for consistent length measurement
         try:
             raw = json.dumps(val, ensure_ascii=False)
         except Exception:
@@ -131,6 +130,11 @@ class LogItem:
     kvps: Optional[OrderedDict] = None  # Use OrderedDict for kvps
     id: Optional[str] = None  # Add id field
     guid: str = ""
+    version: int = 0  # log version of the last update
+    # kvps input values that were immutable, to skip processing them again when unchanged
+    _kvps_input: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # masker the kvps were masked with, a new one means secrets changed and all values are masked again
+    _kvps_masker: Any = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.guid = self.log.guid
@@ -189,7 +193,9 @@ class Log:
     def __init__(self):
         self.context: "AgentContext|None" = None # set from outside
         self.guid: str = str(uuid.uuid4())
-        self.updates: list[int] = []
+        self.version: int = 0  # incremented by every item update, never decreases
+        self._updated: OrderedDict[int, None] = OrderedDict()  # item numbers, least recently updated first
+        self._lock = threading.Lock()
         self.logs: list[LogItem] = []
         self.set_initial_progress()
 
@@ -255,28 +261,30 @@ class Log:
 
 
         # adjust all content before processing
+        masker = self._get_masker()
         if heading is not None:
-            heading = self._mask_recursive(heading)
+            heading = _mask_with(masker, heading)
             heading = _truncate_heading(heading)
             item.heading = heading
         if content is not None:
-            content = self._mask_recursive(content)
+            content = _mask_with(masker, content)
             content = _truncate_content(content, item.type)
             item.content = content
         if kvps is not None:
-            kvps = OrderedDict(copy.deepcopy(kvps))
-            kvps = self._mask_recursive(kvps)
-            kvps = _truncate_value(kvps)
-            item.kvps = kvps
+            item.kvps = _update_kvps(item, kvps, masker)
         elif item.kvps is None:
             item.kvps = OrderedDict()
         if kwargs:
-            kwargs = copy.deepcopy(kwargs)
-            kwargs = self._mask_recursive(kwargs)
-            item.kvps.update(kwargs)
-
-        self.updates += [item.no]
+            # kvps are replaced, never modified, output being serialized elsewhere stays consistent
+            updated = OrderedDict(item.kvps)
+            for k, v in kwargs.items():
+                updated[k] = _mask_with(masker, v)
+                item._kvps_input.pop(k, None)
+            item.kvps = updated
+
+        self.mark_updated(item.no)
         self._update_progress_from_item(item)
+        self._notify()
 
     def set_progress(self, progress: str, no: int = 0, active: bool = True):
         progress = self._mask_recursive(progress)
@@ -286,31 +294,44 @@ class Log:
             no = len(self.logs)
         self.progress_no = no
         self.progress_active = active
+        self._notify()
 
     def set_initial_progress(self):
         self.set_progress("Waiting for input", 0, False)
 
-    def output(self, start=None, end=None):
-        if start is None:
-            start = 0
-        if end is None:
-            end = len(self.updates)
-
-        out = []
-        seen = set()
-        for update in self.updates[start:end]:
-            if update not in seen:
-                out.append(self.logs[update].output())
-                seen.add(update)
-
-        return out
+    def mark_updated(self, no: int):
+        with self._lock:
+            self.version += 1
+            self.logs[no].version = self.version
+            self._updated[no] = None
+            self._updated.move_to_end(no)
+
+    def updated_since(self, version: int = 0) -> list[LogItem]:
+        """Items updated after version, each once and in log order.
+        Walks back from the most recent update, so only changed items are visited."""
+        changed = []
+        with self._lock:
+            for no in reversed(self._updated):
+                item = self.logs[no]
+                if item.version <= version:
+                    break
+                changed.append(item)
+        changed.sort(key=lambda item: item.no)
+        return changed
+
+    def output(self, start: int | None = None):
+        return [item.output() for item in self.updated_since(start or 0)]
 
     def reset(self):
-        self.guid = str(uuid.uuid4())
-        self.updates = []
-        self.logs = []
+        with self._lock:
+            self.guid = str(uuid.uuid4())
+            self._updated = OrderedDict()
+            self.logs = []
         self.set_initial_progress()
 
+    def _notify(self):
+        update_notifier.notify(self.context.id if self.context else "")
+
     def _update_progress_from_item(self, item: LogItem):
         if item.heading and item.update_progress != "none":
             if item.no >= self.progress_no:
@@ -321,6 +342,9 @@ class Log:
 
     def _mask_recursive(self, obj: T) -> T:
         """Recursively mask secrets in nested objects."""
+        return _mask_with(self._get_masker(), obj)
+
+    def _get_masker(self) -> "SecretsMasker | None":
         try:
             from agent import AgentContext
             secrets_mgr = get_secrets_manager(self.context or AgentContext.current())
@@ -332,14 +356,45 @@ class Log:
             # if self_id != current_id:
             #     print(f"Context ID mismatch: {self_id} != {current_id}")
 
-            if isinstance(obj, str):
-                return secrets_mgr.mask_values(obj)
-            elif isinstance(obj, dict):
-                return {k: self._mask_recursive(v) for k, v in obj.items()}  # type: ignore
-            elif isinstance(obj, list):
-                return [self._mask_recursive(item) for item in obj]  # type: ignore
-            else:
-                return obj
+            # compiled masker is resolved once for the whole update
+            return secrets_mgr.get_masker()
         except Exception as _e:
-            # If masking fails, return original object
-            return obj
\ No newline at end of file
+            # If masking fails, values are kept as they are
+            return None
+
+
+def _update_kvps(item: LogItem, kvps: dict, masker: "SecretsMasker | None") -> OrderedDict:
+    """New kvps of item, only values that changed since the last update are masked and truncated."""
+    previous = item.kvps or {}
+    previous_input = item._kvps_input if item._kvps_masker is masker else {}
+    result: OrderedDict = OrderedDict()
+    inputs = {}
+    for k, v in kvps.items():
+        key = _truncate_key(k)
+        if key in previous and k in previous_input and _same_value(previous_input[k], v):
+            result[key] = previous[key]
+        else:
+            result[key] = _truncate_value(_mask_with(masker, v))
+        # mutable values may change in place, they are always processed again
+        if v is None or isinstance(v, (str, bool, int, float)):
+            inputs[k] = v
+    item._kvps_input = inputs
+    item._kvps_masker = masker
+    return result
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+
+def _mask_with(masker: "SecretsMasker | None", obj: T) -> T:
+    if masker is None:
+        return obj
+    if isinstance(obj, str):
+        return masker.mask(obj)  # type: ignore
+    elif isinstance(obj, dict):
+        return {k: _mask_with(masker, v) for k, v in obj.items()}  # type: ignore
+    elif isinstance(obj, list):
+        return [_mask_with(masker, item) for item in obj]  # type: ignore
+    else:
+        return obj
@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from python.helpers.defer import EventLoopThread
+
+STALL_THRESHOLD = 0.5  # seconds a loop must be blocked before it is sampled
+CHECK_INTERVAL = 0.1
+MAX_SAMPLES = 200
+MAX_STACK_FRAMES = 40
+
+
+class BlockingSample:
+    def __init__(self, thread: str, stall: float):
+        self.thread = thread
+        self.detected_at = datetime.now(timezone.utc)
+        self.duration = stall  # grows while the loop stays blocked
+        self.stack: list[str] = []
+        self.extension_point = ""
+        self.extension = ""
+        self.tool = ""
+        self.agent = ""
+        self.context_id = ""
+
+    def output(self):
+        return {
+            "thread": self.thread,
+            "detected_at": self.detected_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1),
+            "extension_point": self.extension_point,
+            "extension": self.extension,
+            "tool": self.tool,
+            "agent": self.agent,
+            "context_id": self.context_id,
+            "stack": self.stack,
+        }
+
+
+class LoopWatchdog:
+    """Detects blocking calls on event loop threads.
+
+    Every EventLoopThread runs a periodic lag probe. A separate watchdog thread
+    checks how overdue each probe is; once a loop is blocked for longer than
+    STALL_THRESHOLD, it captures the stack of the loop thread together with the
+    extension point, extension and tool found on that stack.
+    """
+
+    _samples: deque[BlockingSample] = deque(maxlen=MAX_SAMPLES)
+    _lock = threading.Lock()
+    _thread: threading.Thread | None = None
+
+    @classmethod
+    def start(cls):
+        with cls._lock:
+            if cls._thread and cls._thread.is_alive():
+                return
+            cls._thread = threading.Thread(
+                target=cls._run, daemon=True, name="LoopWatchdog"
+            )
+            cls._thread.start()
+
+    @classmethod
+    def get_samples(cls) -> list[dict[str, Any]]:
+        with cls._lock:
+            return [sample.output() for sample in cls._samples]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._samples.clear()
+
+    @classmethod
+    def _run(cls):
+        # current stall sample per loop thread, keyed by the overdue probe
+        active: dict[str, tuple[float, BlockingSample]] = {}
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            with EventLoopThread._lock:
+                loops = list(EventLoopThread._instances.values())
+            for loop in loops:
+                try:
+                    cls._check(loop, active)
+                except Exception:
+                    pass  # never let the watchdog die
+
+    @classmethod
+    def _check(cls, loop: EventLoopThread, active: dict[str, tuple[float, BlockingSample]]):
+        stall = loop.get_stall()
+        if stall < STALL_THRESHOLD:
+            active.pop(loop.thread_name, None)
+            return
+        probe = loop.lag.next_probe
+        current = active.get(loop.thread_name)
+        if current and current[0] == probe:
+            current[1].duration = stall  # same stall, still blocked
+            return
+        thread = loop.thread
+        frame = sys._current_frames().get(thread.ident) if thread else None  # type: ignore
+        if frame is None:
+            return
+        sample = BlockingSample(loop.thread_name, stall)
+        sample.stack = traceback.format_stack(frame)[-MAX_STACK_FRAMES:]
+        _describe(sample, frame)
+        active[loop.thread_name] = (probe, sample)
+        with cls._lock:
+            cls._samples.append(sample)
+
+
+def _describe(sample: BlockingSample, frame):
+    # walk from the innermost frame outwards, the innermost match wins
+    while frame is not None:
+        code = frame.f_code
+        local = frame.f_locals
+        if code.co_name == "call_extensions" and not sample.extension_point:
+            sample.extension_point = str(local.get("extension_point", ""))
+            cls = local.get("cls")
+            if cls is not None and not sample.extension:
+                sample.extension = f"{cls.__module__}.{cls.__name__}"
+        obj = local.get("self")
+        if obj is not None:
+            kind = type(obj).__name__
+            if not sample.tool and hasattr(obj, "args") and hasattr(obj, "loop_data") and hasattr(obj, "name"):
+                sample.tool = str(obj.name)  # Tool instance
+            if not sample.agent and hasattr(obj, "loop_data") and hasattr(obj, "agent_name"):
+                sample.agent = str(obj.agent_name)
+                sample.context_id = str(getattr(obj.context, "id", ""))
+                current_tool = getattr(obj.loop_data, "current_tool", None)
+                if current_tool is not None and not sample.tool:
+                    sample.tool = str(getattr(current_tool, "name", kind))
+        frame = frame.f_back
@@ -17,12 +17,14 @@ from typing import (
 )
 import threading
 import asyncio
+import time
 from contextlib import AsyncExitStack
 from shutil import which
 from datetime import timedelta
 import json
 from python.helpers import errors
 from python.helpers import settings
+from python.helpers.defer import EventLoopThread
 
 import httpx
 
@@ -30,6 +32,7 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
 from mcp.shared.message import SessionMessage
 from mcp.types import CallToolResult, ListToolsResult
 from anyio.streams.memory import (
@@ -218,6 +221,7 @@ class MCPServerRemote(BaseModel):
     headers: dict[str, Any] | None = Field(default_factory=dict[str, Any])
     init_timeout: int = Field(default=0)
     tool_timeout: int = Field(default=0)
+    max_sessions: int = Field(default=0, description="Max concurrent pooled sessions")
     verify: bool = Field(default=True, description="Verify SSL certificates")
     disabled: bool = Field(default=False)
 
@@ -251,9 +255,14 @@ class MCPServerRemote(BaseModel):
         self, tool_name: str, input_data: Dict[str, Any]
     ) -> CallToolResult:
         """Call a tool with the given input data"""
+        # do not hold the lock while the call runs, pooled sessions serve calls concurrently
         with self.__lock:
-            # We already run in an event loop, dont believe Pylance
-            return await self.__client.call_tool(tool_name, input_data)  # type: ignore
+            client = self.__client
+        return await client.call_tool(tool_name, input_data)  # type: ignore
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        with self.__lock:
+            return self.__client.pool.get_stats()  # type: ignore
 
     def update(self, config: dict[str, Any]) -> "MCPServerRemote":
         with self.__lock:
@@ -267,6 +276,7 @@ class MCPServerRemote(BaseModel):
                     "headers",
                     "init_timeout",
                     "tool_timeout",
+                    "max_sessions",
                     "disabled",
                     "verify",
                 ]:
@@ -280,9 +290,16 @@ class MCPServerRemote(BaseModel):
             return asyncio.run(self.__on_update())
 
     async def __on_update(self) -> "MCPServerRemote":
+        # sessions opened with the previous config must not be reused
+        self.__client.pool.close()  # type: ignore
         await self.__client.update_tools()  # type: ignore
         return self
 
+    def close(self):
+        """Close pooled sessions of this server"""
+        with self.__lock:
+            self.__client.pool.close()  # type: ignore
+
 
 class MCPServerLocal(BaseModel):
     name: str = Field(default_factory=str)
@@ -297,6 +314,7 @@ class MCPServerLocal(BaseModel):
     )
     init_timeout: int = Field(default=0)
     tool_timeout: int = Field(default=0)
+    max_sessions: int = Field(default=0, description="Max concurrent pooled sessions")
     verify: bool = Field(default=True, description="Verify SSL certificates")
     disabled: bool = Field(default=False)
 
@@ -330,9 +348,14 @@ class MCPServerLocal(BaseModel):
         self, tool_name: str, input_data: Dict[str, Any]
     ) -> CallToolResult:
         """Call a tool with the given input data"""
+        # do not hold the lock while the call runs, pooled sessions serve calls concurrently
         with self.__lock:
-            # We already run in an event loop, dont believe Pylance
-            return await self.__client.call_tool(tool_name, input_data)  # type: ignore
+            client = self.__client
+        return await client.call_tool(tool_name, input_data)  # type: ignore
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        with self.__lock:
+            return self.__client.pool.get_stats()  # type: ignore
 
     def update(self, config: dict[str, Any]) -> "MCPServerLocal":
         with self.__lock:
@@ -348,6 +371,7 @@ class MCPServerLocal(BaseModel):
                     "encoding_error_handler",
                     "init_timeout",
                     "tool_timeout",
+                    "max_sessions",
                     "disabled",
                 ]:
                     if key == "name":
@@ -357,9 +381,16 @@ class MCPServerLocal(BaseModel):
             return asyncio.run(self.__on_update())
 
     async def __on_update(self) -> "MCPServerLocal":
+        # sessions opened with the previous config must not be reused
+        self.__client.pool.close()  # type: ignore
         await self.__client.update_tools()  # type: ignore
         return self
 
+    def close(self):
+        """Close pooled sessions of this server"""
+        with self.__lock:
+            self.__client.pool.close()  # type: ignore
+
 
 MCPServer = Annotated[
     Union[
@@ -465,6 +496,13 @@ class MCPConfig(BaseModel):
                 "servers": servers_data
             }  # Prepare data for re-initialization or update
 
+            # close sessions of the servers being replaced
+            for server in instance.servers:
+                try:
+                    server.close()
+                except Exception:
+                    pass
+
             # Option 1: Re-initialize the existing instance (if __init__ is idempotent for other fields)
             instance.__init__(servers_list=servers_data)
 
@@ -638,6 +676,8 @@ class MCPConfig(BaseModel):
                 error = server.get_error()
                 # get log bool
                 has_log = server.get_log() != ""
+                # get session pool stats
+                pool = server.get_pool_stats()
 
                 # add server status to result
                 result.append(
@@ -647,6 +687,7 @@ class MCPConfig(BaseModel):
                         "error": error,
                         "tool_count": tool_count,
                         "has_log": has_log,
+                        "pool": pool,
                     }
                 )
 
@@ -659,6 +700,7 @@ class MCPConfig(BaseModel):
                         "error": disconnected["error"],
                         "tool_count": 0,
                         "has_log": False,
+                        "pool": None,
                     }
                 )
 
@@ -772,20 +814,233 @@ class MCPConfig(BaseModel):
         if "." not in tool_name:
             raise ValueError(f"Tool {tool_name} not found")
         server_name_part, tool_name_part = tool_name.split(".")
+        # only the lookup is locked, calls of other chats and servers run concurrently
         with self.__lock:
-            for server in self.servers:
-                if server.name == server_name_part and server.has_tool(tool_name_part):
-                    return await server.call_tool(tool_name_part, input_data)
+            server = next(
+                (
+                    server
+                    for server in self.servers
+                    if server.name == server_name_part and server.has_tool(tool_name_part)
+                ),
+                None,
+            )
+        if server is None:
             raise ValueError(f"Tool {tool_name} not found")
+        return await server.call_tool(tool_name_part, input_data)
 
 
 T = TypeVar("T")
 
+MCP_POOL_THREAD = "MCPSessions"
+MCP_POOL_DEFAULT_MAX_SESSIONS = 4
+MCP_POOL_HEALTH_CHECK_AFTER = 30  # seconds idle before a session is pinged on reuse
+MCP_POOL_HEALTH_CHECK_TIMEOUT = 5
+MCP_POOL_IDLE_TIMEOUT = 300  # seconds idle before extra sessions are closed
+
+
+def _unwrap_exception(e: BaseException) -> BaseException:
+    excs = getattr(e, "exceptions", None)  # Python 3.11+ ExceptionGroup
+    while excs:
+        e = excs[0]
+        excs = getattr(e, "exceptions", None)
+    return e
+
+
+class _PooledSession:
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.session: Optional[ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.closing = asyncio.Event()
+        self.last_used = time.monotonic()
+
+    def is_alive(self) -> bool:
+        return (
+            self.session is not None
+            and self.task is not None
+            and not self.task.done()
+            and not self.closing.is_set()
+        )
+
+    def close(self):
+        self.closing.set()
+
+
+class MCPSessionPool:
+    """
+    Keeps initialized MCP sessions of one server open between operations.
+
+    Transports hold anyio task groups that must be closed by the task that opened
+    them, so every session is owned by a worker task on a dedicated event loop
+    thread and operations from other loops are forwarded to that loop.
+    All pool state is only touched on the pool loop.
+    """
+
+    def __init__(self, client: "MCPClientBase"):
+        self.client = client
+        self.generation = 0
+        self._idle: list[_PooledSession] = []
+        self._open: set[_PooledSession] = set()
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._limit_generation = -1
+        self.in_use = 0
+        self.created = 0
+        self.reconnects = 0
+        self.failures = 0
+        self.calls = 0
+
+    def get_max_sessions(self) -> int:
+        return self.client.server.max_sessions or MCP_POOL_DEFAULT_MAX_SESSIONS
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "max_sessions": self.get_max_sessions(),
+            "open": len(self._open),
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "created": self.created,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+            "calls": self.calls,
+        }
+
+    async def execute(self, coro_func: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """Run coro_func with a pooled session, from any event loop."""
+        future = EventLoopThread(MCP_POOL_THREAD).run_coroutine(
+            self._execute(coro_func)
+        )
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        """Close all sessions, callable from any thread. Sessions in use are closed when released."""
+        self.generation += 1
+        thread = EventLoopThread(MCP_POOL_THREAD)
+        thread.run_coroutine(self._close_idle())
+
+    async def _close_idle(self):
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            pooled.close()
+
+    async def _execute(self, coro_func: Callable[[ClientSession], Awaitable[T]]) -> T:
+        if self._limit is None or self._limit_generation != self.generation:
+            # concurrency limit follows the current server config
+            self._limit = asyncio.Semaphore(self.get_max_sessions())
+            self._limit_generation = self.generation
+        limit = self._limit
+        async with limit:
+            pooled = await self._acquire()
+            self.in_use += 1
+            self.calls += 1
+            try:
+                result = await coro_func(pooled.session)  # type: ignore
+            except McpError:
+                # error response from the server, the session itself is fine
+                self._release(pooled)
+                raise
+            except BaseException as e:
+                # transport may be broken, do not reuse the session
+                self.failures += 1
+                pooled.close()
+                if isinstance(e, Exception):
+                    raise _unwrap_exception(e)
+                raise
+            finally:
+                self.in_use -= 1
+            self._release(pooled)
+            return result
+
+    async def _acquire(self) -> _PooledSession:
+        self._reap_idle()
+        while self._idle:
+            pooled = self._idle.pop()
+            if await self._check(pooled):
+                return pooled
+            pooled.close()
+            self.reconnects += 1
+        return await self._open_session()
+
+    def _release(self, pooled: _PooledSession):
+        pooled.last_used = time.monotonic()
+        if pooled.generation != self.generation or not pooled.is_alive():
+            pooled.close()
+            return
+        self._idle.append(pooled)
+
+    def _reap_idle(self):
+        # keep one warm session, close the others after a while
+        now = time.monotonic()
+        keep = []
+        for pooled in self._idle:
+            if not pooled.is_alive() or pooled.generation != self.generation:
+                pooled.close()
+            elif keep and now - pooled.last_used > MCP_POOL_IDLE_TIMEOUT:
+                pooled.close()
+            else:
+                keep.append(pooled)
+        self._idle = keep
+
+    async def _check(self, pooled: _PooledSession) -> bool:
+        if not pooled.is_alive() or pooled.generation != self.generation:
+            return False
+        if time.monotonic() - pooled.last_used < MCP_POOL_HEALTH_CHECK_AFTER:
+            return True
+        try:
+            await asyncio.wait_for(
+                pooled.session.send_ping(), MCP_POOL_HEALTH_CHECK_TIMEOUT  # type: ignore
+            )
+            return True
+        except Exception:
+            return False
+
+    async def _open_session(self) -> _PooledSession:
+        pooled = _PooledSession(self.generation)
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        pooled.task = asyncio.create_task(self._run_session(pooled, ready))
+        try:
+            return await ready
+        except asyncio.CancelledError:
+            # caller gave up, do not leave an orphaned session behind
+            pooled.close()
+            raise
+
+    async def _run_session(self, pooled: _PooledSession, ready: asyncio.Future):
+        self._open.add(pooled)
+        try:
+            async with AsyncExitStack() as stack:
+                stdio, write = await self.client._create_stdio_transport(stack)
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        stdio,  # type: ignore
+                        write,  # type: ignore
+                        read_timeout_seconds=timedelta(
+                            seconds=self.client.get_init_timeout()
+                        ),
+                    )
+                )
+                await session.initialize()
+                pooled.session = session
+                self.created += 1
+                if not ready.done():
+                    ready.set_result(pooled)
+                # keep the transport open until the session is closed or breaks
+                await pooled.closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(_unwrap_exception(e))
+        finally:
+            pooled.session = None
+            self._open.discard(pooled)
+
 
 class MCPClientBase(ABC):
     # server: Union[MCPServerLocal, MCPServerRemote] # Defined in __init__
     # tools: List[dict[str, Any]] # Defined in __init__
-    # No self.session, self.exit_stack, self.stdio, self.write as persistent instance fields
+    # Sessions are kept by self.pool, not as instance fields
 
     __lock: ClassVar[threading.Lock] = threading.Lock()
 
@@ -795,6 +1050,11 @@ class MCPClientBase(ABC):
         self.error: str = ""
         self.log: List[str] = []
         self.log_file: Optional[TextIO] = None
+        self.pool = MCPSessionPool(self)
+
+    def get_init_timeout(self) -> int:
+        set = settings.get_settings()
+        return self.server.init_timeout or set["mcp_client_init_timeout"]
 
     # Protected method
     @abstractmethod
@@ -810,65 +1070,21 @@ class MCPClientBase(ABC):
     async def _execute_with_session(
         self,
         coro_func: Callable[[ClientSession], Awaitable[T]],
-        read_timeout_seconds=60,
     ) -> T:
         """
-        Manages the lifecycle of an MCP session for a single operation.
-        Creates a temporary session, executes coro_func with it, and ensures cleanup.
+        Executes coro_func with an initialized session from the server's session pool.
+        The session stays open for subsequent operations.
         """
         operation_name = coro_func.__name__  # For logging
-        # PrintStyle(font_color="cyan").print(f"MCPClientBase ({self.server.name}): Creating new session for operation '{operation_name}'...")
-        # Store the original exception outside the async block
-        original_exception = None
         try:
-            async with AsyncExitStack() as temp_stack:
-                try:
-
-                    stdio, write = await self._create_stdio_transport(temp_stack)
-                    # PrintStyle(font_color="cyan").print(f"MCPClientBase ({self.server.name} - {operation_name}): Transport created. Initializing session...")
-                    session = await temp_stack.enter_async_context(
-                        ClientSession(
-                            stdio,  # type: ignore
-                            write,  # type: ignore
-                            read_timeout_seconds=timedelta(
-                                seconds=read_timeout_seconds
-                            ),
-                        )
-                    )
-                    await session.initialize()
-
-                    result = await coro_func(session)
-
-                    return result
-                except Exception as e:
-                    # Store the original exception and raise a dummy exception
-                    excs = getattr(e, "exceptions", None)  # Python 3.11+ ExceptionGroup
-                    if excs:
-                        original_exception = excs[0]
-                    else:
-                        original_exception = e
-                    # Create a dummy exception to break out of the async block
-                    raise RuntimeError("Dummy exception to break out of async block")
+            return await self.pool.execute(coro_func)
         except Exception as e:
-            # Check if this is our dummy exception
-            if original_exception is not None:
-                e = original_exception
-            # We have the original exception stored
             PrintStyle(
                 background_color="#AA4455", font_color="white", padding=False
             ).print(
                 f"MCPClientBase ({self.server.name} - {operation_name}): Error during operation: {type(e).__name__}: {e}"
             )
-            raise e  # Re-raise the original exception
-        # finally:
-        #     PrintStyle(font_color="cyan").print(
-        #         f"MCPClientBase ({self.server.name} - {operation_name}): Session and transport will be closed by AsyncExitStack."
-        #     )
-        # This line should ideally be unreachable if the try/except/finally logic within the 'async with' is exhaustive.
-        # Adding it to satisfy linters that might not fully trace the raise/return paths through async context managers.
-        raise RuntimeError(
-            f"MCPClientBase ({self.server.name} - {operation_name}): _execute_with_session exited 'async with' block unexpectedly."
-        )
+            raise e
 
     async def update_tools(self) -> "MCPClientBase":
         # PrintStyle(font_color="cyan").print(f"MCPClientBase ({self.server.name}): Starting 'update_tools' operation...")
@@ -889,12 +1105,7 @@ class MCPClientBase(ABC):
             )
 
         try:
-            set = settings.get_settings()
-            await self._execute_with_session(
-                list_tools_op,
-                read_timeout_seconds=self.server.init_timeout
-                or set["mcp_client_init_timeout"],
-            )
+            await self._execute_with_session(list_tools_op)
         except Exception as e:
             # e = eg.exceptions[0]
             error_text = errors.format_error(e, 0, 0)
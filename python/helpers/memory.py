@@ -1,24 +1,22 @@
 from datetime import datetime
-from typing import Any, List, Sequence
-from langchain.storage import InMemoryByteStore, LocalFileStore
+from typing import Any, Callable, List, Sequence, TypeVar
+from langchain.storage import InMemoryByteStore
 from langchain.embeddings import CacheBackedEmbeddings
 from python.helpers import guids
 
 # from langchain_chroma import Chroma
-from langchain_community.vectorstores import FAISS
 
 # faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
 from python.helpers import faiss_monkey_patch
 import faiss
 
 
-from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores.utils import (
     DistanceStrategy,
 )
 from langchain_core.embeddings import Embeddings
 
-import os, json
+import asyncio, os, json, pickle, threading, time, atexit, weakref
 
 import numpy as np
 
@@ -27,6 +25,9 @@ from . import files
 from langchain_core.documents import Document
 from python.helpers import knowledge_import
 from python.helpers.log import Log, LogItem
+from python.helpers.metadata_index import MetadataFilter, MetadataIndexedFAISS
+from python.helpers.docstore import DOCSTORE_FILE, SqliteDocstore, docstore_path
+from python.helpers import embedding_store, settings, vector_index
 from enum import Enum
 from agent import Agent, AgentContext
 import models
@@ -38,7 +39,7 @@ from simpleeval import simple_eval
 logging.getLogger("langchain_core.vectorstores.base").setLevel(logging.ERROR)
 
 
-class MyFaiss(FAISS):
+class MyFaiss(MetadataIndexedFAISS):
     # override aget_by_ids
     def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
         # return all self.docstore._dict[id] in ids
@@ -51,6 +52,9 @@ class MyFaiss(FAISS):
         return self.docstore._dict  # type: ignore
 
 
+T = TypeVar("T")
+
+
 class Memory:
 
     class Area(Enum):
@@ -60,6 +64,7 @@ class Memory:
         INSTRUMENTS = "instruments"
 
     index: dict[str, "MyFaiss"] = {}
+    _last_used: dict[str, float] = {}
 
     @staticmethod
     async def get(agent: Agent):
@@ -76,6 +81,7 @@ class Memory:
                 False,
             )
             Memory.index[memory_subdir] = db
+            Memory._evict_idle(keep=memory_subdir)
             wrap = Memory(db, memory_subdir=memory_subdir)
             knowledge_subdirs = get_knowledge_subdirs_by_memory_subdir(
                 memory_subdir, agent.config.knowledge_subdirs or []
@@ -106,6 +112,8 @@ class Memory:
                 memory_subdir=memory_subdir,
                 in_memory=False,
             )
+            Memory.index[memory_subdir] = db
+            Memory._evict_idle(keep=memory_subdir)
             wrap = Memory(db, memory_subdir=memory_subdir)
             if preload_knowledge:
                 knowledge_subdirs = get_knowledge_subdirs_by_memory_subdir(
@@ -115,16 +123,50 @@ class Memory:
                     await wrap.preload_knowledge(
                         log_item, knowledge_subdirs, memory_subdir
                     )
-            Memory.index[memory_subdir] = db
         return Memory(db=Memory.index[memory_subdir], memory_subdir=memory_subdir)
 
     @staticmethod
     async def reload(agent: Agent):
         memory_subdir = get_agent_memory_subdir(agent)
         if Memory.index.get(memory_subdir):
-            del Memory.index[memory_subdir]
+            Memory._unload(memory_subdir)
         return await Memory.get(agent)
 
+    @staticmethod
+    def _unload(memory_subdir: str):
+        # drop the index and persist its pending changes, writes check under the lock
+        # that their index is still loaded, so none can come after the flush
+        db = Memory.index.get(memory_subdir)
+        if db is None:
+            return
+        with db.lock:
+            if Memory.index.get(memory_subdir) is db:
+                del Memory.index[memory_subdir]
+            Memory._last_used.pop(memory_subdir, None)
+        MemorySaver.flush(memory_subdir)
+        # wrappers still holding the index can read from it, the docstore file
+        # is released once the last of them is gone
+        if isinstance(db.docstore, SqliteDocstore):
+            weakref.finalize(db, db.docstore.close)
+
+    @staticmethod
+    def _evict_idle(keep: str):
+        # drop least recently used indexes while loaded ones exceed the memory budget
+        budget = int(settings.get_settings()["memory_index_budget_mb"] or 0) * 1024 * 1024
+        if budget <= 0:
+            return
+        sizes = {subdir: db.get_resident_size() for subdir, db in Memory.index.items()}
+        total = sum(sizes.values())
+        now = time.monotonic()
+        for subdir in sorted(sizes, key=lambda s: Memory._last_used.get(s, 0)):
+            if total <= budget:
+                break
+            if subdir == keep or now - Memory._last_used.get(subdir, 0) < EVICT_IDLE_TIME:
+                continue
+            Memory._unload(subdir)
+            total -= sizes[subdir]
+            PrintStyle.standard(f"Unloaded idle memory '{subdir}'")
+
     @staticmethod
     def initialize(
         log_item: LogItem | None,
@@ -149,8 +191,7 @@ class Memory:
         if in_memory:
             store = InMemoryByteStore()
         else:
-            os.makedirs(em_dir, exist_ok=True)
-            store = LocalFileStore(em_dir)
+            store = embedding_store.get_store(em_dir)
 
         embeddings_model = models.get_embedding_model(
             model_config.provider,
@@ -174,14 +215,7 @@ class Memory:
 
         # if db folder exists and is not empty:
         if os.path.exists(db_dir) and files.exists(db_dir, "index.faiss"):
-            db = MyFaiss.load_local(
-                folder_path=db_dir,
-                embeddings=embedder,
-                allow_dangerous_deserialization=True,
-                distance_strategy=DistanceStrategy.COSINE,
-                # normalize_L2=True,
-                relevance_score_fn=Memory._cosine_normalizer,
-            )  # type: ignore
+            db = Memory._load_db(db_dir, memory_subdir, embedder)
 
             # if there is a mismatch in embeddings used, re-index the whole DB
             emb_ok = False
@@ -197,7 +231,9 @@ class Memory:
 
             # re-index -  create new DB and insert existing docs
             if db and not emb_ok:
-                docs = db.get_all_docs()
+                docs = dict(db.get_all_docs().items())
+                if isinstance(db.docstore, SqliteDocstore):
+                    db.docstore.close()
                 db = None
 
         # DB not loaded, create one
@@ -207,7 +243,7 @@ class Memory:
             db = MyFaiss(
                 embedding_function=embedder,
                 index=index,
-                docstore=InMemoryDocstore(),
+                docstore=SqliteDocstore(docstore_path(db_dir), reset=True),
                 index_to_docstore_id={},
                 distance_strategy=DistanceStrategy.COSINE,
                 # normalize_L2=True,
@@ -237,8 +273,44 @@ class Memory:
 
             created = True
 
+        # large flat indexes are migrated to the configured ANN index by the saver thread
+        if not in_memory and Memory._needs_index_migration(db, memory_subdir):
+            MemorySaver.mark_dirty(db, memory_subdir, 0)
+
         return db, created
 
+    @staticmethod
+    def _load_db(db_dir: str, memory_subdir: str, embedder: Embeddings) -> MyFaiss:
+        # like FAISS.load_local, but with a memory-mapped index and documents in a side file
+        index_path = files.get_abs_path(db_dir, "index.faiss")
+        index = vector_index.read_index_mmap(index_path)
+        with open(files.get_abs_path(db_dir, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        migrate_docstore = not isinstance(docstore, str)
+        if migrate_docstore:
+            # older format with all documents pickled, move them to the side file
+            store = SqliteDocstore(docstore_path(db_dir), reset=True)
+            store.add(docstore._dict)
+            store.commit()
+        else:
+            store = SqliteDocstore(docstore_path(db_dir))
+            store.prune(set(index_to_docstore_id.values()))
+
+        db = MyFaiss(
+            embedding_function=embedder,
+            index=index,
+            docstore=store,
+            index_to_docstore_id=index_to_docstore_id,
+            distance_strategy=DistanceStrategy.COSINE,
+            # normalize_L2=True,
+            relevance_score_fn=Memory._cosine_normalizer,
+            mmap_path=index_path,
+        )
+        if migrate_docstore:
+            MemorySaver.mark_dirty(db, memory_subdir, 0)  # rewrite index.pkl without documents
+        return db
+
     def __init__(
         self,
         db: MyFaiss,
@@ -246,6 +318,12 @@ class Memory:
     ):
         self.db = db
         self.memory_subdir = memory_subdir
+        self._touch()
+
+    def _touch(self):
+        # searches and writes keep the index from being unloaded as idle
+        if Memory.index.get(self.memory_subdir) is self.db:
+            Memory._last_used[self.memory_subdir] = time.monotonic()
 
     async def preload_knowledge(
         self, log_item: LogItem | None, kn_dirs: list[str], memory_subdir: str
@@ -268,20 +346,35 @@ class Memory:
             with open(index_path, "r") as f:
                 index = json.load(f)
 
-        # preload knowledge folders
-        index = self._preload_knowledge_folders(log_item, kn_dirs, index)
+        # preload knowledge folders, file loading and hashing runs off the event loop
+        index = await asyncio.get_running_loop().run_in_executor(
+            None, self._preload_knowledge_folders, log_item, kn_dirs, index
+        )
 
-        for file in index:
-            if index[file]["state"] in ["changed", "removed"] and index[file].get(
-                "ids", []
-            ):  # for knowledge files that have been changed or removed and have IDs
-                await self.delete_documents_by_ids(
-                    index[file]["ids"]
-                )  # remove original version
-            if index[file]["state"] == "changed":
-                index[file]["ids"] = await self.insert_documents(
-                    index[file]["documents"]
-                )  # insert new version
+        # remove original versions of changed and removed files
+        rem_ids = [
+            id
+            for file in index.values()
+            if file["state"] in ["changed", "removed"]
+            for id in file.get("ids", [])
+        ]
+        if rem_ids:
+            await self.delete_documents_by_ids(rem_ids)
+
+        # insert new versions, documents of all changed files are embedded together
+        changed = [file for file in index.values() if file["state"] == "changed"]
+        docs = [doc for file in changed for doc in file["documents"]]
+        ids: list[str] = []
+        for i in range(0, len(docs), KNOWLEDGE_INSERT_BATCH):
+            ids += await self.insert_documents(docs[i : i + KNOWLEDGE_INSERT_BATCH])
+            if log_item:
+                log_item.stream(
+                    progress=f"\nInserted {len(ids)}/{len(docs)} knowledge chunks"
+                )
+        pos = 0
+        for file in changed:
+            file["ids"] = ids[pos : pos + len(file["documents"])]
+            pos += len(file["documents"])
 
         # remove index where state="removed"
         index = {k: v for k, v in index.items() if v["state"] != "removed"}
@@ -341,8 +434,11 @@ class Memory:
     async def search_similarity_threshold(
         self, query: str, limit: int, threshold: float, filter: str = ""
     ):
-        comparator = Memory._get_comparator(filter) if filter else None
+        comparator = (
+            MetadataFilter(filter, Memory._get_comparator(filter)) if filter else None
+        )
 
+        self._touch()
         return await self.db.asearch(
             query,
             search_type="similarity_score_threshold",
@@ -351,6 +447,48 @@ class Memory:
             filter=comparator,
         )
 
+    async def search_similarity_threshold_batch(
+        self, searches: list[tuple[str, int, str]], threshold: float
+    ) -> list[list[Document]]:
+        """Run several (query, limit, filter) searches, results in the same order.
+        Distinct queries are embedded together, searches sharing a filter
+        run as one FAISS search."""
+        if not searches:
+            return []
+        self._touch()
+        queries = list(dict.fromkeys(query for query, _, _ in searches))
+        # query embeddings, like single searches, they are not written to the documents
+        # cache and concurrent requests are batched by the embedding model
+        vectors = await asyncio.gather(
+            *[self.db.embeddings.aembed_query(query) for query in queries]  # type: ignore
+        )
+        vector_by_query = dict(zip(queries, vectors))
+        relevance = self.db._select_relevance_score_fn()
+
+        by_filter: dict[str, list[int]] = {}
+        for i, (_, _, filter) in enumerate(searches):
+            by_filter.setdefault(filter, []).append(i)
+
+        results: list[list[Document]] = [[] for _ in searches]
+        loop = asyncio.get_running_loop()
+        for filter, indices in by_filter.items():
+            comparator = (
+                MetadataFilter(filter, Memory._get_comparator(filter)) if filter else None
+            )
+            found = await loop.run_in_executor(
+                None,
+                lambda: self.db.similarity_search_with_score_by_vectors(
+                    [vector_by_query[searches[i][0]] for i in indices],
+                    k=max(searches[i][1] for i in indices),
+                    filter=comparator,
+                ),
+            )
+            for i, docs in zip(indices, found):
+                results[i] = [
+                    doc for doc, score in docs if relevance(score) >= threshold
+                ][: searches[i][1]]
+        return results
+
     async def delete_documents_by_query(
         self, query: str, threshold: float, filter: str = ""
     ):
@@ -374,15 +512,13 @@ class Memory:
                 # fnd = self.db.get(where={"id": {"$in": document_ids}})
                 # if fnd["ids"]: self.db.delete(ids=fnd["ids"])
                 # tot += len(fnd["ids"])
-                await self.db.adelete(ids=document_ids)
+                await self._delete_ids(document_ids)
                 tot += len(document_ids)
 
             # If fewer than K document IDs, break the loop
             if len(document_ids) < k:
                 break
 
-        if tot:
-            self._save_db()  # persist
         return removed
 
     async def delete_documents_by_ids(self, ids: list[str]):
@@ -392,10 +528,7 @@ class Memory:
         )  # existing docs to remove (prevents error)
         if rem_docs:
             rem_ids = [doc.metadata["id"] for doc in rem_docs]  # ids to remove
-            await self.db.adelete(ids=rem_ids)
-
-        if rem_docs:
-            self._save_db()  # persist
+            await self._delete_ids(rem_ids)
         return rem_docs
 
     async def insert_text(self, text, metadata: dict = {}):
@@ -414,19 +547,53 @@ class Memory:
                 if not doc.metadata.get("area", ""):
                     doc.metadata["area"] = Memory.Area.MAIN.value
 
-            await self.db.aadd_documents(documents=docs, ids=ids)
-            self._save_db()  # persist
+            await self._add_documents(docs, ids)
         return ids
 
     async def update_documents(self, docs: list[Document]):
         ids = [doc.metadata["id"] for doc in docs]
-        await self.db.adelete(ids=ids)  # delete originals
-        ins = await self.db.aadd_documents(documents=docs, ids=ids)  # add updated
-        self._save_db()  # persist
-        return ins
+        return await self._add_documents(docs, ids, replace=True)  # replace originals
+
+    async def _add_documents(
+        self, docs: list[Document], ids: list[str], replace: bool = False
+    ) -> list[str]:
+        # embed outside the lock, only the index update is guarded
+        texts = [doc.page_content for doc in docs]
+        embeddings = await self.db.embeddings.aembed_documents(texts)  # type: ignore
+
+        def add(db: MyFaiss) -> list[str]:
+            if replace:
+                existing = [doc.metadata["id"] for doc in db.get_by_ids(ids)]
+                if existing:
+                    db.delete(ids=existing)
+            return db.add_embeddings(
+                list(zip(texts, embeddings)),
+                metadatas=[doc.metadata for doc in docs],
+                ids=ids,
+            )
+
+        return await self._write(add, len(ids))
 
-    def _save_db(self):
-        Memory._save_db_file(self.db, self.memory_subdir)
+    async def _delete_ids(self, ids: list[str]):
+        if not ids:
+            return
+        await self._write(lambda db: db.delete(ids=ids), len(ids))
+
+    async def _write(self, write: Callable[[MyFaiss], T], changes: int) -> T:
+        # an unloaded index is not written to, its changes would be lost or its save would
+        # overwrite the files of its reloaded replacement, they go to the loaded index instead
+        while True:
+            db = Memory.index.get(self.memory_subdir)
+            if db is None:
+                db = (await Memory.get_by_subdir(self.memory_subdir, preload_knowledge=False)).db
+            with db.lock:
+                if Memory.index.get(self.memory_subdir) is not db:
+                    continue  # unloaded meanwhile
+                self.db = db
+                result = write(db)
+                MemorySaver.mark_dirty(db, self.memory_subdir, changes)  # persist
+                Memory._last_used[self.memory_subdir] = time.monotonic()
+                return result
 
     def _generate_doc_id(self):
         while True:
@@ -437,7 +604,56 @@ class Memory:
     @staticmethod
     def _save_db_file(db: MyFaiss, memory_subdir: str):
         abs_dir = abs_db_dir(memory_subdir)
-        db.save_local(folder_path=abs_dir)
+        os.makedirs(abs_dir, exist_ok=True)
+        # same files as FAISS.save_local, serialized under the lock and written outside of it
+        with db.lock:
+            # a still mapped index is unchanged since it was loaded from the file
+            index_data = None if db.mmap_path else faiss.serialize_index(db.index)
+            if isinstance(db.docstore, SqliteDocstore):
+                # documents live in the side file, committed together with the snapshot
+                db.docstore.commit()
+                docstore_data = pickle.dumps((DOCSTORE_FILE, db.index_to_docstore_id))
+            else:
+                docstore_data = pickle.dumps((db.docstore, db.index_to_docstore_id))
+        if index_data is not None:
+            _write_file_atomic(os.path.join(abs_dir, "index.faiss"), index_data.tobytes())
+        _write_file_atomic(os.path.join(abs_dir, "index.pkl"), docstore_data)
+
+    @staticmethod
+    def _get_index_config(memory_subdir: str) -> dict[str, Any]:
+        # global settings, overridable per memory subdir in its index.json
+        set = settings.get_settings()
+        config: dict[str, Any] = {
+            "index_type": set["memory_index_type"],
+            "threshold": set["memory_index_threshold"],
+        }
+        config_file = files.get_abs_path(abs_db_dir(memory_subdir), "index.json")
+        if files.exists(config_file):
+            config.update(json.loads(files.read_file(config_file)))
+        return config
+
+    @staticmethod
+    def _needs_index_migration(db: MyFaiss, memory_subdir: str) -> bool:
+        if vector_index.get_index_type(db.index) != "flat":
+            return False
+        config = Memory._get_index_config(memory_subdir)
+        return vector_index.needs_migration(
+            db.index, config["index_type"], int(config["threshold"])
+        )
+
+    @staticmethod
+    def _migrate_index(db: MyFaiss, memory_subdir: str):
+        if not Memory._needs_index_migration(db, memory_subdir):
+            return
+        index_type = Memory._get_index_config(memory_subdir)["index_type"]
+        PrintStyle.standard(
+            f"Migrating memory '{memory_subdir}' with {db.index.ntotal} documents to {index_type} index..."
+        )
+        start = time.perf_counter()
+        if vector_index.migrate(db, index_type):
+            PrintStyle.standard(
+                f"Memory '{memory_subdir}' migrated in {time.perf_counter() - start:.1f}s"
+            )
 
     @staticmethod
     def _get_comparator(condition: str):
@@ -488,10 +704,124 @@ def get_custom_knowledge_subdir_abs(agent: Agent) -> str:
 
 
 def reload():
-    # clear the memory index, this will force all DBs to reload
+    # persist pending changes and clear the memory index, this will force all DBs to reload
+    MemorySaver.flush()
+    for memory_subdir in list(Memory.index.keys()):
+        Memory._unload(memory_subdir)
     Memory.index = {}
 
 
+KNOWLEDGE_INSERT_BATCH = 500  # knowledge chunks embedded and inserted at once
+EVICT_IDLE_TIME = 300  # seconds a memory must be unused before it can be unloaded
+SAVE_INTERVAL = 5.0  # seconds a change can wait before the index is persisted
+SAVE_MAX_CHANGES = 50  # number of changes that trigger persisting right away
+
+
+class _PendingSave:
+    def __init__(self, db: MyFaiss):
+        self.db = db
+        self.changes = 0
+        self.since = time.monotonic()
+        self.failed = False  # retried after SAVE_INTERVAL, not right away
+
+
+class MemorySaver:
+    """Write-behind persistence of memory indexes.
+
+    Mutations only mark the index of a memory subdir dirty, a background thread
+    persists it once SAVE_INTERVAL passed since the first unsaved change or
+    SAVE_MAX_CHANGES changes accumulated. flush() persists pending changes
+    immediately, it runs at exit, before backups and before indexes are dropped.
+    """
+
+    _pending: dict[str, _PendingSave] = {}
+    _lock = threading.Lock()
+    _save_lock = threading.Lock()
+    _wake = threading.Event()
+    _thread: threading.Thread | None = None
+
+    @classmethod
+    def mark_dirty(cls, db: MyFaiss, memory_subdir: str, changes: int = 1):
+        with cls._lock:
+            pending = cls._pending.get(memory_subdir)
+            if not pending or pending.db is not db:
+                pending = cls._pending[memory_subdir] = _PendingSave(db)
+            pending.changes += changes
+            if pending.changes >= SAVE_MAX_CHANGES:
+                cls._wake.set()
+            if not cls._thread or not cls._thread.is_alive():
+                cls._thread = threading.Thread(
+                    target=cls._run, daemon=True, name="MemorySaver"
+                )
+                cls._thread.start()
+
+    @classmethod
+    def flush(cls, memory_subdir: str | None = None):
+        """Persist pending changes of one or all memory subdirs now."""
+        with cls._lock:
+            subdirs = [memory_subdir] if memory_subdir else list(cls._pending.keys())
+            due = [(s, cls._pending.pop(s)) for s in subdirs if s in cls._pending]
+        cls._save(due)
+
+    @classmethod
+    def _run(cls):
+        while True:
+            cls._wake.wait(timeout=SAVE_INTERVAL / 5)
+            cls._wake.clear()
+            now = time.monotonic()
+            with cls._lock:
+                due = [
+                    (subdir, pending)
+                    for subdir, pending in cls._pending.items()
+                    if (pending.changes >= SAVE_MAX_CHANGES and not pending.failed)
+                    or now - pending.since >= SAVE_INTERVAL
+                ]
+                for subdir, _ in due:
+                    del cls._pending[subdir]
+            for subdir, pending in due:
+                try:
+                    Memory._migrate_index(pending.db, subdir)
+                except Exception as e:
+                    PrintStyle.error(f"Failed to migrate memory index '{subdir}': {e}")
+            cls._save(due)
+
+    @classmethod
+    def _save(cls, due: list[tuple[str, _PendingSave]]):
+        # one save at a time, so an older snapshot never overwrites a newer one
+        with cls._save_lock:
+            for subdir, pending in due:
+                try:
+                    Memory._save_db_file(pending.db, subdir)
+                except Exception as e:
+                    PrintStyle.error(f"Failed to save memory '{subdir}': {e}")
+                    cls._retry(subdir, pending)
+
+    @classmethod
+    def _retry(cls, subdir: str, pending: _PendingSave):
+        # keep the changes pending, the next interval or the flush at exit saves them again
+        with cls._lock:
+            current = cls._pending.get(subdir)
+            if current is None:
+                pending.since = time.monotonic()
+                pending.failed = True
+                cls._pending[subdir] = pending
+            elif current.db is pending.db:
+                current.changes += pending.changes
+
+
+atexit.register(MemorySaver.flush)
+
+
+def _write_file_atomic(path: str, data: bytes):
+    # write to a temp file and rename, a crash can not leave a truncated file behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 def abs_db_dir(memory_subdir: str) -> str:
     # patch for projects, this way we don't need to re-work the structure of memory subdirs
     if memory_subdir.startswith("projects/"):
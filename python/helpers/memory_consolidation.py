@@ -2,7 +2,7 @@ import asyncio
 import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
 from langchain_core.documents import Document
@@ -31,9 +31,12 @@ class ConsolidationConfig:
     max_similar_memories: int = 10
     consolidation_sys_prompt: str = "memory.consolidation.sys.md"
     consolidation_msg_prompt: str = "memory.consolidation.msg.md"
+    consolidation_batch_msg_prompt: str = "memory.consolidation.batch.msg.md"
+    consolidation_batch_item_prompt: str = "memory.consolidation.batch.item.md"
     max_llm_context_memories: int = 5
     keyword_extraction_sys_prompt: str = "memory.keyword_extraction.sys.md"
     keyword_extraction_msg_prompt: str = "memory.keyword_extraction.msg.md"
+    keyword_extraction_batch_msg_prompt: str = "memory.keyword_extraction.batch.msg.md"
     processing_timeout_seconds: int = 60
     # Add safety threshold for REPLACE actions
     replace_similarity_threshold: float = 0.9  # Higher threshold for replacement safety
@@ -69,6 +72,8 @@ class MemoryConsolidator:
     def __init__(self, agent: Agent, config: Optional[ConsolidationConfig] = None):
         self.agent = agent
         self.config = config or ConsolidationConfig()
+        self.llm_calls = 0  # utility model calls made by this consolidator
+        self.llm_calls_saved = 0  # calls avoided by batching several memories per prompt
 
     async def process_new_memory(
         self,
@@ -109,6 +114,117 @@ class MemoryConsolidator:
             PrintStyle().error(f"Memory consolidation error for area {area}: {str(e)}")
             return {"success": False, "memory_ids": []}
 
+    async def process_new_memories(
+        self,
+        memories: List[Tuple[str, str, Dict[str, Any]]],
+    ) -> List[dict]:
+        """
+        Process several new memories, given as (new_memory, area, metadata), with
+        one keyword extraction and one analysis prompt for all of them.
+
+        Returns:
+            list: {"success": bool, "memory_ids": [str, ...]} for each memory, in order
+        """
+        if len(memories) == 1:
+            new_memory, area, metadata = memories[0]
+            return [await self.process_new_memory(new_memory, area, metadata)]
+
+        # filled in as memories are processed, those done before a timeout or error keep their result
+        results: List[dict] = [{"success": False, "memory_ids": []} for _ in memories]
+        try:
+            await asyncio.wait_for(
+                self._process_memories_with_consolidation(memories, results),
+                timeout=self.config.processing_timeout_seconds * len(memories)
+            )
+
+        except asyncio.TimeoutError:
+            PrintStyle().error(f"Memory consolidation timeout for {len(memories)} memories")
+
+        except Exception as e:
+            PrintStyle().error(f"Memory consolidation error for {len(memories)} memories: {str(e)}")
+
+        return results
+
+    async def _process_memories_with_consolidation(
+        self,
+        memories: List[Tuple[str, str, Dict[str, Any]]],
+        results: List[dict],
+    ) -> List[dict]:
+        """Execute the consolidation pipeline for a batch of memories, the result
+        of each memory is stored in results as soon as it is processed."""
+
+        # Step 1: Extract keywords of all memories at once, then search for each
+        keywords = await self._extract_search_keywords_batch([memory for memory, _, _ in memories])
+        similar = await asyncio.gather(*[
+            self._find_similar_memories(new_memory, area, search_queries=queries)
+            for (new_memory, area, _), queries in zip(memories, keywords)
+        ])
+
+        # Step 2: Insert memories without similar ones, collect the rest for analysis
+        contexts: List[Tuple[int, MemoryAnalysisContext]] = []
+        # memories stored by this batch, the searches above could not see them
+        batch_ids: set = set()
+        db = await Memory.get(self.agent)
+        for i, ((new_memory, area, metadata), similar_memories) in enumerate(zip(memories, similar)):
+            if similar_memories:
+                contexts.append((i, MemoryAnalysisContext(
+                    new_memory=new_memory,
+                    similar_memories=similar_memories,
+                    area=area,
+                    timestamp=self._get_timestamp(),
+                    existing_metadata=metadata
+                )))
+                continue
+            if batch_ids:
+                # an earlier memory of this batch may overlap, consolidate with it one by one
+                similar_memories = await self._find_similar_memories(new_memory, area, search_queries=keywords[i])
+                if similar_memories:
+                    context = MemoryAnalysisContext(
+                        new_memory=new_memory,
+                        similar_memories=similar_memories,
+                        area=area,
+                        timestamp=self._get_timestamp(),
+                        existing_metadata=metadata
+                    )
+                    analysis = await self._analyze_memory_consolidation(context)
+                    results[i] = await self._apply_analysis(context, analysis)
+                    batch_ids.update(results[i]["memory_ids"])
+                    continue
+            try:
+                if 'timestamp' not in metadata:
+                    metadata['timestamp'] = self._get_timestamp()
+                memory_id = await db.insert_text(new_memory, metadata)
+                results[i] = {"success": True, "memory_ids": [memory_id]}
+                batch_ids.add(memory_id)
+            except Exception as e:
+                PrintStyle().error(f"Direct memory insertion failed: {str(e)}")
+
+        # Step 3: Analyze all remaining memories in one prompt
+        analyses = await self._analyze_memory_consolidation_batch([context for _, context in contexts])
+
+        # Step 4: Apply decisions in order, earlier ones may have removed similar memories
+        # or stored memories the analysis did not see
+        for (i, context), analysis in zip(contexts, analyses):
+            if batch_ids:
+                refreshed = await self._find_similar_memories(
+                    context.new_memory, context.area, search_queries=keywords[i]
+                )
+                known = {doc.metadata.get('id') for doc in context.similar_memories}
+                if any(doc.metadata.get('id') in batch_ids - known for doc in refreshed):
+                    context.similar_memories = refreshed
+                    analysis = await self._analyze_memory_consolidation(context)
+                    self.llm_calls_saved -= 1  # its share of the batch analysis was not used
+            context.similar_memories = await self._filter_existing_memories(context.similar_memories)
+            if not context.similar_memories and analysis.action != ConsolidationAction.SKIP:
+                analysis = ConsolidationResult(
+                    action=ConsolidationAction.SKIP,
+                    reasoning="Similar memories were removed by a previous consolidation"
+                )
+            results[i] = await self._apply_analysis(context, analysis)
+            batch_ids.update(results[i]["memory_ids"])
+
+        return results
+
     async def _process_memory_with_consolidation(
         self,
         new_memory: str,
@@ -159,15 +275,7 @@ class MemoryConsolidator:
 
         # Step 2: Validate that similar memories still exist (they might have been deleted by previous consolidations)
         if similar_memories:
-            memory_ids_to_check = [doc.metadata.get('id') for doc in similar_memories if doc.metadata.get('id')]
-            # Filter out None values and ensure all IDs are strings
-            memory_ids_to_check = [str(id) for id in memory_ids_to_check if id is not None]
-            db = await Memory.get(self.agent)
-            still_existing = db.db.get_by_ids(memory_ids_to_check)
-            existing_ids = {doc.metadata.get('id') for doc in still_existing}
-
-            # Filter out deleted memories
-            valid_similar_memories = [doc for doc in similar_memories if doc.metadata.get('id') in existing_ids]
+            valid_similar_memories = await self._filter_existing_memories(similar_memories)
 
             if len(valid_similar_memories) != len(similar_memories):
                 deleted_count = len(similar_memories) - len(valid_similar_memories)
@@ -215,6 +323,15 @@ class MemoryConsolidator:
         )
 
         consolidation_result = await self._analyze_memory_consolidation(analysis_context, log_item)
+        return await self._apply_analysis(analysis_context, consolidation_result, log_item)
+
+    async def _apply_analysis(
+        self,
+        context: MemoryAnalysisContext,
+        consolidation_result: ConsolidationResult,
+        log_item: Optional[LogItem] = None
+    ) -> dict:
+        """Insert the memory or apply the consolidation decided by the analysis."""
 
         if consolidation_result.action == ConsolidationAction.SKIP:
             if log_item:
@@ -224,9 +341,9 @@ class MemoryConsolidator:
                 )
             try:
                 db = await Memory.get(self.agent)
-                if 'timestamp' not in metadata:
-                    metadata['timestamp'] = self._get_timestamp()
-                memory_id = await db.insert_text(new_memory, metadata)
+                if 'timestamp' not in context.existing_metadata:
+                    context.existing_metadata['timestamp'] = self._get_timestamp()
+                memory_id = await db.insert_text(context.new_memory, context.existing_metadata)
                 if log_item:
                     log_item.update(
                         result="Memory inserted (consolidation skipped)",
@@ -244,8 +361,8 @@ class MemoryConsolidator:
         # Step 4: Apply consolidation decisions
         memory_ids = await self._apply_consolidation_result(
             consolidation_result,
-            area,
-            analysis_context.existing_metadata,  # Pass original metadata
+            context.area,
+            context.existing_metadata,  # Pass original metadata
             log_item
         )
 
@@ -256,7 +373,7 @@ class MemoryConsolidator:
                     memory_ids=memory_ids,
                     consolidation_action=consolidation_result.action.value,
                     reasoning=consolidation_result.reasoning or "No specific reasoning provided",
-                    memories_processed=len(similar_memories) + 1  # +1 for new memory
+                    memories_processed=len(context.similar_memories) + 1  # +1 for new memory
                 )
             else:
                 log_item.update(
@@ -267,6 +384,18 @@ class MemoryConsolidator:
 
         return {"success": bool(memory_ids), "memory_ids": memory_ids or []}
 
+    async def _filter_existing_memories(self, similar_memories: List[Document]) -> List[Document]:
+        """Drop similar memories deleted since they were found."""
+        memory_ids_to_check = [doc.metadata.get('id') for doc in similar_memories if doc.metadata.get('id')]
+        # Filter out None values and ensure all IDs are strings
+        memory_ids_to_check = [str(id) for id in memory_ids_to_check if id is not None]
+        db = await Memory.get(self.agent)
+        still_existing = db.db.get_by_ids(memory_ids_to_check)
+        existing_ids = {doc.metadata.get('id') for doc in still_existing}
+
+        # Filter out deleted memories
+        return [doc for doc in similar_memories if doc.metadata.get('id') in existing_ids]
+
     async def _gather_consolidated_metadata(
         self,
         db: Memory,
@@ -328,7 +457,8 @@ class MemoryConsolidator:
         self,
         new_memory: str,
         area: str,
-        log_item: Optional[LogItem] = None
+        log_item: Optional[LogItem] = None,
+        search_queries: Optional[List[str]] = None
     ) -> List[Document]:
         """
         Find similar memories using both semantic similarity and keyword matching.
@@ -336,32 +466,28 @@ class MemoryConsolidator:
         """
         db = await Memory.get(self.agent)
 
-        # Step 1: Extract keywords/queries for enhanced search
-        search_queries = await self._extract_search_keywords(new_memory, log_item)
+        # Step 1: Extract keywords/queries for enhanced search, unless already extracted
+        if search_queries is None:
+            search_queries = await self._extract_search_keywords(new_memory, log_item)
 
-        all_similar = []
-
-        # Step 2: Semantic similarity search with scores
-        semantic_similar = await db.search_similarity_threshold(
-            query=new_memory,
-            limit=self.config.max_similar_memories,
-            threshold=self.config.similarity_threshold,
-            filter=f"area == '{area}'"
-        )
-        all_similar.extend(semantic_similar)
+        # Step 2: Semantic similarity search for the memory itself
+        area_filter = f"area == '{area}'"
+        searches = [(new_memory, self.config.max_similar_memories, area_filter)]
 
-        # Step 3: Keyword-based searches
+        # Step 3: Keyword-based searches, all embedded and searched in one batch
+        # Fix division by zero: ensure len(search_queries) > 0
+        queries_count = max(1, len(search_queries))  # Prevent division by zero
         for query in search_queries:
             if query.strip():
-                # Fix division by zero: ensure len(search_queries) > 0
-                queries_count = max(1, len(search_queries))  # Prevent division by zero
-                keyword_similar = await db.search_similarity_threshold(
-                    query=query.strip(),
-                    limit=max(3, self.config.max_similar_memories // queries_count),
-                    threshold=self.config.similarity_threshold,
-                    filter=f"area == '{area}'"
+                searches.append(
+                    (query.strip(), max(3, self.config.max_similar_memories // queries_count), area_filter)
                 )
-                all_similar.extend(keyword_similar)
+
+        all_similar = []
+        for found in await db.search_similarity_threshold_batch(
+            searches, threshold=self.config.similarity_threshold
+        ):
+            all_similar.extend(found)
 
         # Step 4: Deduplicate by document ID and store similarity info
         seen_ids = set()
@@ -430,6 +556,7 @@ class MemoryConsolidator:
             )
 
             # Call utility LLM to extract search queries
+            self.llm_calls += 1
             keywords_response = await self.agent.call_utility_model(
                 system=system_prompt,
                 message=message_prompt,
@@ -448,14 +575,58 @@ class MemoryConsolidator:
 
         except Exception as e:
             PrintStyle().warning(f"Keyword extraction failed: {str(e)}")
-            # Fallback: use intelligent truncation for search
-            # Take first 200 chars if short, or first sentence if longer, but cap at 200 chars
-            if len(new_memory) <= 200:
-                fallback_content = new_memory
-            else:
-                first_sentence = new_memory.split('.')[0]
-                fallback_content = first_sentence[:200] if len(first_sentence) <= 200 else new_memory[:200]
-            return [fallback_content.strip()]
+            return self._fallback_keywords(new_memory)
+
+    async def _extract_search_keywords_batch(self, memories: List[str]) -> List[List[str]]:
+        """Extract search keywords of several memories with a single utility LLM call."""
+
+        if len(memories) == 1:
+            return [await self._extract_search_keywords(memories[0])]
+
+        try:
+            system_prompt = self.agent.read_prompt(
+                self.config.keyword_extraction_sys_prompt,
+            )
+
+            message_prompt = self.agent.read_prompt(
+                self.config.keyword_extraction_batch_msg_prompt,
+                memories="\n\n".join(
+                    f"## Memory {i + 1}\n{memory}" for i, memory in enumerate(memories)
+                )
+            )
+
+            self.llm_calls += 1
+            keywords_response = await self.agent.call_utility_model(
+                system=system_prompt,
+                message=message_prompt,
+                background=True
+            )
+
+            # Parse the response - expect JSON array with one array of strings per memory
+            keywords_json = DirtyJson.parse_string(keywords_response.strip())
+
+            if not isinstance(keywords_json, list) or len(keywords_json) != len(memories):
+                raise ValueError("LLM response does not list keywords for each memory")
+            self.llm_calls_saved += len(memories) - 1
+
+            return [
+                [str(k) for k in keywords if k] if isinstance(keywords, list) else [str(keywords)]
+                for keywords in keywords_json
+            ]
+
+        except Exception as e:
+            PrintStyle().warning(f"Batch keyword extraction failed: {str(e)}")
+            return [self._fallback_keywords(memory) for memory in memories]
+
+    def _fallback_keywords(self, new_memory: str) -> List[str]:
+        # Fallback: use intelligent truncation for search
+        # Take first 200 chars if short, or first sentence if longer, but cap at 200 chars
+        if len(new_memory) <= 200:
+            fallback_content = new_memory
+        else:
+            first_sentence = new_memory.split('.')[0]
+            fallback_content = first_sentence[:200] if len(first_sentence) <= 200 else new_memory[:200]
+        return [fallback_content.strip()]
 
     async def _analyze_memory_consolidation(
         self,
@@ -466,11 +637,7 @@ class MemoryConsolidator:
 
         try:
             # Prepare similar memories text
-            similar_memories_text = ""
-            for i, doc in enumerate(context.similar_memories):
-                timestamp = doc.metadata.get('timestamp', 'unknown')
-                doc_id = doc.metadata.get('id', f'doc_{i}')
-                similar_memories_text += f"ID: {doc_id}\nTimestamp: {timestamp}\nContent: {doc.page_content}\n\n"
+            similar_memories_text = self._format_similar_memories(context.similar_memories)
 
             # Build system prompt
             system_prompt = self.agent.read_prompt(
@@ -481,12 +648,13 @@ class MemoryConsolidator:
             message_prompt = self.agent.read_prompt(
                 self.config.consolidation_msg_prompt,
                 new_memory=context.new_memory,
-                similar_memories=similar_memories_text.strip(),
+                similar_memories=similar_memories_text,
                 area=context.area,
                 current_timestamp=context.timestamp,
                 new_memory_metadata=json.dumps(context.existing_metadata, indent=2)
             )
 
+            self.llm_calls += 1
             analysis_response = await self.agent.call_utility_model(
                 system=system_prompt,
                 message=message_prompt,
@@ -496,33 +664,7 @@ class MemoryConsolidator:
 
             # Parse LLM response
             result_json = DirtyJson.parse_string(analysis_response.strip())
-
-            if not isinstance(result_json, dict):
-                raise ValueError("LLM response is not a valid JSON object")
-
-            # Parse consolidation result
-            action_str = result_json.get('action', 'skip')
-            try:
-                action = ConsolidationAction(action_str.lower())
-            except ValueError:
-                action = ConsolidationAction.SKIP
-
-            # Determine appropriate fallback for new_memory_content based on action
-            if action in [ConsolidationAction.MERGE, ConsolidationAction.REPLACE]:
-                # For MERGE/REPLACE, if no content provided, it's an error - don't use original
-                default_content = ""
-            else:
-                # For KEEP_SEPARATE/UPDATE/SKIP, original memory is appropriate fallback
-                default_content = context.new_memory
-
-            return ConsolidationResult(
-                action=action,
-                memories_to_remove=result_json.get('memories_to_remove', []),
-                memories_to_update=result_json.get('memories_to_update', []),
-                new_memory_content=result_json.get('new_memory_content', default_content),
-                metadata=result_json.get('metadata', {}),
-                reasoning=result_json.get('reasoning', '')
-            )
+            return self._parse_consolidation_result(result_json, context)
 
         except Exception as e:
             PrintStyle().warning(f"LLM consolidation analysis failed: {str(e)}")
@@ -532,6 +674,109 @@ class MemoryConsolidator:
                 reasoning=f"Analysis failed: {str(e)}"
             )
 
+    async def _analyze_memory_consolidation_batch(
+        self,
+        contexts: List[MemoryAnalysisContext]
+    ) -> List[ConsolidationResult]:
+        """Analyze consolidation options of several new memories in one LLM call,
+        falls back to one call per memory if the response does not fit."""
+
+        if len(contexts) <= 1:
+            return [await self._analyze_memory_consolidation(context) for context in contexts]
+
+        called = False
+        try:
+            memories_text = "\n\n".join(
+                self.agent.read_prompt(
+                    self.config.consolidation_batch_item_prompt,
+                    number=i + 1,
+                    new_memory=context.new_memory,
+                    similar_memories=self._format_similar_memories(context.similar_memories),
+                    area=context.area,
+                    current_timestamp=context.timestamp,
+                    new_memory_metadata=json.dumps(context.existing_metadata, indent=2)
+                )
+                for i, context in enumerate(contexts)
+            )
+
+            system_prompt = self.agent.read_prompt(
+                self.config.consolidation_sys_prompt,
+            )
+
+            message_prompt = self.agent.read_prompt(
+                self.config.consolidation_batch_msg_prompt,
+                count=len(contexts),
+                memories=memories_text
+            )
+
+            self.llm_calls += 1
+            called = True
+            analysis_response = await self.agent.call_utility_model(
+                system=system_prompt,
+                message=message_prompt,
+                callback=None,
+                background=True
+            )
+
+            # Parse LLM response - expect JSON array with one analysis per memory
+            results_json = DirtyJson.parse_string(analysis_response.strip())
+
+            if not isinstance(results_json, list) or len(results_json) != len(contexts):
+                raise ValueError("LLM response does not contain an analysis for each memory")
+
+            results = [
+                self._parse_consolidation_result(result_json, context)
+                for result_json, context in zip(results_json, contexts)
+            ]
+            self.llm_calls_saved += len(contexts) - 1
+            return results
+
+        except Exception as e:
+            PrintStyle().warning(f"Batch consolidation analysis failed, analyzing separately: {str(e)}")
+            if called:
+                self.llm_calls_saved -= 1  # the failed batch call was extra
+            return [await self._analyze_memory_consolidation(context) for context in contexts]
+
+    def _parse_consolidation_result(
+        self,
+        result_json: Any,
+        context: MemoryAnalysisContext
+    ) -> ConsolidationResult:
+        if not isinstance(result_json, dict):
+            raise ValueError("LLM response is not a valid JSON object")
+
+        # Parse consolidation result
+        action_str = result_json.get('action', 'skip')
+        try:
+            action = ConsolidationAction(action_str.lower())
+        except ValueError:
+            action = ConsolidationAction.SKIP
+
+        # Determine appropriate fallback for new_memory_content based on action
+        if action in [ConsolidationAction.MERGE, ConsolidationAction.REPLACE]:
+            # For MERGE/REPLACE, if no content provided, it's an error - don't use original
+            default_content = ""
+        else:
+            # For KEEP_SEPARATE/UPDATE/SKIP, original memory is appropriate fallback
+            default_content = context.new_memory
+
+        return ConsolidationResult(
+            action=action,
+            memories_to_remove=result_json.get('memories_to_remove', []),
+            memories_to_update=result_json.get('memories_to_update', []),
+            new_memory_content=result_json.get('new_memory_content', default_content),
+            metadata=result_json.get('metadata', {}),
+            reasoning=result_json.get('reasoning', '')
+        )
+
+    def _format_similar_memories(self, docs: List[Document]) -> str:
+        similar_memories_text = ""
+        for i, doc in enumerate(docs):
+            timestamp = doc.metadata.get('timestamp', 'unknown')
+            doc_id = doc.metadata.get('id', f'doc_{i}')
+            similar_memories_text += f"ID: {doc_id}\nTimestamp: {timestamp}\nContent: {doc.page_content}\n\n"
+        return similar_memories_text.strip()
+
     async def _apply_consolidation_result(
         self,
         result: ConsolidationResult,
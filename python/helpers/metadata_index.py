@@ -0,0 +1,317 @@
+import ast
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping
+
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.documents import Document
+
+# faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
+from python.helpers import faiss_monkey_patch, vector_index
+import faiss
+import numpy as np
+
+# metadata keys with an inverted index, filters on other keys are evaluated per document
+INDEXED_KEYS = ("area", "document_uri", "knowledge_source", "source_file")
+
+
+class MetadataIndex:
+    """Inverted index of document ids by the values of INDEXED_KEYS."""
+
+    def __init__(self):
+        self.values: dict[str, dict[Any, set[str]]] = {key: {} for key in INDEXED_KEYS}
+        self.keys: dict[str, dict[str, Any]] = {}  # indexed values per document id
+
+    def add(self, id: str, metadata: dict[str, Any]):
+        self.remove(id)
+        indexed = {}
+        for key in INDEXED_KEYS:
+            if key not in metadata:
+                continue
+            value = metadata[key]
+            try:
+                self.values[key].setdefault(value, set()).add(id)
+            except TypeError:
+                continue  # unhashable values never equal a constant
+            indexed[key] = value
+        self.keys[id] = indexed
+
+    def remove(self, id: str):
+        for key, value in self.keys.pop(id, {}).items():
+            ids = self.values[key].get(value)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self.values[key][value]
+
+    def get(self, key: str, value: Any) -> set[str]:
+        try:
+            return self.values[key].get(value, set())
+        except TypeError:
+            return set()
+
+
+class MetadataFilter:
+    """Filter condition in simple_eval syntax, like "area == 'main' or area == 'fragments'".
+
+    Equality and membership tests on INDEXED_KEYS combined with and/or are
+    resolved through the MetadataIndex, anything else falls back to evaluating
+    the comparator per document.
+    """
+
+    def __init__(self, condition: str, comparator: Callable[[dict[str, Any]], Any]):
+        self.condition = condition
+        self.comparator = comparator
+
+    def __call__(self, metadata: dict[str, Any]):
+        return self.comparator(metadata)
+
+    def select(self, index: MetadataIndex) -> tuple[set[str] | None, bool]:
+        """Candidate document ids, None when the index can not narrow the search,
+        and whether all candidates match without evaluating the comparator."""
+        node = _parse(self.condition)
+        if node is None:
+            return None, False
+        return _select(node, index)
+
+
+@lru_cache(maxsize=256)
+def _parse(condition: str) -> ast.expr | None:
+    try:
+        return ast.parse(condition.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+
+
+def _select(node: ast.expr, index: MetadataIndex) -> tuple[set[str] | None, bool]:
+    if isinstance(node, ast.BoolOp):
+        parts = [_select(value, index) for value in node.values]
+        if isinstance(node.op, ast.Or):
+            if any(ids is None for ids, _ in parts):
+                return None, False
+            return set().union(*(ids for ids, _ in parts)), all(exact for _, exact in parts)  # type: ignore
+        known = [ids for ids, _ in parts if ids is not None]
+        if not known:
+            return None, False
+        exact = len(known) == len(parts) and all(exact for _, exact in parts)
+        return set.intersection(*known), exact
+
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        op, left, right = node.ops[0], node.left, node.comparators[0]
+        if isinstance(op, ast.Eq) and isinstance(left, ast.Constant):
+            left, right = right, left  # 'main' == area
+        if not isinstance(left, ast.Name) or left.id not in INDEXED_KEYS:
+            return None, False
+        if isinstance(op, ast.Eq) and isinstance(right, ast.Constant):
+            return set(index.get(left.id, right.value)), True
+        if (
+            isinstance(op, ast.In)
+            and isinstance(right, (ast.List, ast.Tuple, ast.Set))
+            and all(isinstance(elt, ast.Constant) for elt in right.elts)
+        ):
+            ids: set[str] = set()
+            for elt in right.elts:
+                ids |= index.get(left.id, elt.value)  # type: ignore
+            return ids, True
+
+    return None, False
+
+
+class MetadataIndexedFAISS(FAISS):
+    """FAISS store keeping a MetadataIndex in sync with inserts and deletes.
+
+    Searches with a MetadataFilter are restricted to the matching documents
+    inside the FAISS index using an IDSelector, instead of over-fetching and
+    evaluating the filter on every hit. The index may be memory-mapped read
+    only, it is loaded into memory before the first mutation.
+    """
+
+    def __init__(self, *args, mmap_path: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # guards index mutations against concurrent searches and persisting
+        self.lock = threading.RLock()
+        self.mmap_path = mmap_path  # file the index is mapped from
+        self.metadata_index = MetadataIndex()
+        self._positions: dict[str, int] | None = None  # docstore id -> FAISS id
+        self.deletes = 0  # FAISS ids shift on every delete
+        iter_metadata = getattr(self.docstore, "iter_metadata", None)
+        if iter_metadata:
+            for id, metadata in iter_metadata():
+                self.metadata_index.add(id, metadata)
+        else:
+            for id, doc in self._get_docstore_dict().items():
+                self.metadata_index.add(id, doc.metadata)
+
+    def add_texts(self, *args, **kwargs) -> list[str]:
+        with self.lock:
+            self.make_writable()
+            start = len(self.index_to_docstore_id)
+            ids = super().add_texts(*args, **kwargs)
+            self._index_added(start, ids)
+            return ids
+
+    async def aadd_texts(self, *args, **kwargs) -> list[str]:
+        # FAISS.aadd_texts bypasses add_texts
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.add_texts(*args, **kwargs)
+        )
+
+    def add_embeddings(self, *args, **kwargs) -> list[str]:
+        with self.lock:
+            self.make_writable()
+            start = len(self.index_to_docstore_id)
+            ids = super().add_embeddings(*args, **kwargs)
+            self._index_added(start, ids)
+            return ids
+
+    def delete(self, ids: list[str] | None = None, **kwargs) -> bool | None:
+        with self.lock:
+            self.make_writable()
+            removed = self._get_positions(ids or [])
+            result = super().delete(ids, **kwargs)
+            vector_index.compact_ids(self.index, removed)
+            for id in ids or []:
+                self.metadata_index.remove(id)
+            self._positions = None
+            self.deletes += 1
+            return result
+
+    def make_writable(self):
+        """Replace a memory-mapped index by an in-memory copy."""
+        with self.lock:
+            if self.mmap_path:
+                self.index = faiss.read_index(self.mmap_path)
+                self.mmap_path = None
+
+    def get_resident_size(self) -> int:
+        """Approximate memory held by the index vectors, mapped pages are not counted."""
+        if self.mmap_path:
+            return 0
+        try:
+            return self.index.ntotal * self.index.sa_code_size()
+        except RuntimeError:
+            return self.index.ntotal * self.index.d * 4
+
+    def _index_added(self, start: int, ids: list[str]):
+        docs = self._get_docs(ids)
+        for offset, id in enumerate(ids):
+            doc = docs.get(id)
+            if doc is not None:
+                self.metadata_index.add(id, doc.metadata)
+            if self._positions is not None:
+                self._positions[id] = start + offset
+
+    def _get_docstore_dict(self) -> Mapping[str, Document]:
+        return getattr(self.docstore, "_dict", {})
+
+    def _get_docs(self, ids: list[str]) -> Mapping[str, Document]:
+        mget = getattr(self.docstore, "mget", None)
+        if mget:
+            return mget(ids)
+        docs = self._get_docstore_dict()
+        return {id: docs[id] for id in ids if id in docs}
+
+    def _get_positions(self, ids: Iterable[str]) -> list[int]:
+        if self._positions is None:
+            self._positions = {id: i for i, id in self.index_to_docstore_id.items()}
+        positions = self._positions
+        return sorted(positions[id] for id in ids if id in positions)
+
+    def get_by_metadata(self, filter: MetadataFilter, limit: int = 0) -> list[Document]:
+        """Documents matching the filter in insertion order."""
+        with self.lock:
+            candidates, exact = filter.select(self.metadata_index)
+            if candidates is None:
+                docs: Iterable[Document] = list(self._get_docstore_dict().values())
+            else:
+                ids = [self.index_to_docstore_id[i] for i in self._get_positions(candidates)]
+                found = self._get_docs(ids)
+                docs = [found[id] for id in ids if id in found]
+        result = []
+        for doc in docs:
+            if exact or filter(doc.metadata):
+                result.append(doc)
+                if limit > 0 and len(result) >= limit:
+                    break
+        return result
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vectors(
+            [embedding], k=k, filter=filter, fetch_k=fetch_k, **kwargs
+        )[0]
+
+    def similarity_search_with_score_by_vectors(
+        self,
+        embeddings: list[list[float]],
+        k: int = 4,
+        filter: Any = None,
+        fetch_k: int = 20,
+        **kwargs: Any,
+    ) -> list[list[tuple[Document, float]]]:
+        """Search for several query vectors at once, one FAISS search for all of them."""
+        if filter is not None and not isinstance(filter, MetadataFilter):
+            return self._search_one_by_one(embeddings, k, filter, fetch_k, **kwargs)
+
+        vectors = np.array(embeddings, dtype=np.float32)
+        if self._normalize_L2:
+            faiss.normalize_L2(vectors)
+
+        with self.lock:
+            if filter is None:
+                exact, params, search_k = True, None, k
+            else:
+                candidates, exact = filter.select(self.metadata_index)
+                if candidates is None:
+                    # not resolvable by the index, filter hits one by one
+                    return self._search_one_by_one(embeddings, k, filter, fetch_k, **kwargs)
+                positions = self._get_positions(candidates)
+                if not positions:
+                    return [[] for _ in embeddings]
+                selector = faiss.IDSelectorBatch(np.array(positions, dtype=np.int64))
+                search_k = min(len(positions), k if exact else max(k, fetch_k))
+                params = vector_index.search_params(self.index, selector, len(positions))
+            scores, indices = self.index.search(vectors, search_k, params=params)
+            hits = [
+                [(self.index_to_docstore_id[i], float(row_scores[j])) for j, i in enumerate(row) if i != -1]
+                for row, row_scores in zip(indices, scores)
+            ]
+            found = self._get_docs([id for row in hits for id, _ in row])
+
+        score_threshold = kwargs.get("score_threshold")
+        # same semantics as FAISS, scores are similarities or distances by strategy
+        higher_is_better = self.distance_strategy in (
+            DistanceStrategy.MAX_INNER_PRODUCT,
+            DistanceStrategy.JACCARD,
+        )
+        results = []
+        for row in hits:
+            docs = []
+            for id, score in row:
+                # documents may be missing after a crash between docstore and index writes
+                doc = found.get(id)
+                if doc is None or not (exact or filter(doc.metadata)):  # type: ignore
+                    continue
+                if score_threshold is not None and not (
+                    score >= score_threshold if higher_is_better else score <= score_threshold
+                ):
+                    continue
+                docs.append((doc, score))
+            results.append(docs[:k])
+        return results
+
+    def _search_one_by_one(self, embeddings, k, filter, fetch_k, **kwargs):
+        return [
+            super(MetadataIndexedFAISS, self).similarity_search_with_score_by_vector(
+                embedding, k=k, filter=filter, fetch_k=fetch_k, **kwargs
+            )
+            for embedding in embeddings
+        ]
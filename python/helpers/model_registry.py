@@ -0,0 +1,143 @@
+import gc
+import json
+import threading
+import time
+import weakref
+from typing import Any, Callable, Hashable
+
+from python.helpers.print_style import PrintStyle
+
+ModelKey = tuple[str, str, str]
+
+
+class _Entry:
+    def __init__(self, key: ModelKey):
+        self.key = key
+        self.model: Any = None
+        self.lock = threading.Lock()  # held while the model loads
+        self.refs = 0
+        self.load_time = 0.0
+        self.size = 0
+        self.loaded_at = 0.0
+        self.last_used = 0.0
+        self.hits = 0
+
+
+_entries: dict[ModelKey, _Entry] = {}
+_lock = threading.Lock()
+
+
+def get_key(provider: str, name: str, kwargs: dict[str, Any] | None = None) -> ModelKey:
+    frozen = json.dumps(kwargs or {}, sort_keys=True, default=str)
+    return (provider, name, frozen)
+
+
+def acquire(key: ModelKey, loader: Callable[[], Any], owner: Any = None) -> Any:
+    """Shared model instance for key, loaded by loader on first use.
+    A reference is held until release(key) or, when owner is given, until
+    owner is garbage collected. Unreferenced models stay loaded until unload()."""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            entry = _entries[key] = _Entry(key)
+        entry.refs += 1  # counted before loading so unload() can't drop it meanwhile
+
+    try:
+        with entry.lock:
+            if entry.model is None:
+                start = time.perf_counter()
+                model = loader()
+                entry.load_time = time.perf_counter() - start
+                entry.size = get_resident_size(model)
+                entry.loaded_at = time.time()
+                entry.model = model
+                PrintStyle.standard(
+                    f"Loaded model {key[1]} in {entry.load_time:.2f}s, {entry.size / 2**20:.0f} MB"
+                )
+            else:
+                entry.hits += 1
+    except Exception:
+        release(key)
+        raise
+
+    entry.last_used = time.time()
+    if owner is not None:
+        weakref.finalize(owner, release, key)
+    return entry.model
+
+
+def release(key: ModelKey):
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry.refs > 0:
+            entry.refs -= 1
+
+
+def unload(key: ModelKey | None = None, force: bool = False) -> list[ModelKey]:
+    """Drop loaded models, all of them or the one under key. Models still
+    referenced are kept unless force is set. Returns the unloaded keys."""
+    gc.collect()  # run finalizers of owners that are no longer reachable
+    with _lock:
+        keys = [key] if key else list(_entries.keys())
+        unloaded = []
+        for k in keys:
+            entry = _entries.get(k)
+            if entry and entry.model is not None and (force or entry.refs == 0):
+                del _entries[k]
+                unloaded.append(k)
+    if unloaded:
+        gc.collect()
+        _empty_device_cache()
+        for k in unloaded:
+            PrintStyle.standard(f"Unloaded model {k[1]}")
+    return unloaded
+
+
+def get_stats() -> list[dict[str, Any]]:
+    with _lock:
+        entries = list(_entries.values())
+    return [
+        {
+            "provider": entry.key[0],
+            "name": entry.key[1],
+            "kwargs": entry.key[2],
+            "loaded": entry.model is not None,
+            "refs": entry.refs,
+            "hits": entry.hits,
+            "load_time_ms": round(entry.load_time * 1000, 1),
+            "size_mb": round(entry.size / 2**20, 1),
+            "loaded_at": entry.loaded_at,
+            "last_used": entry.last_used,
+        }
+        for entry in entries
+    ]
+
+
+def get_resident_size(model: Any) -> int:
+    """Bytes held by the parameters and buffers of a torch module, 0 otherwise."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except Exception:
+        return 0
+    seen: set[Hashable] = set()
+    size = 0
+    for tensor in tensors:
+        try:
+            ptr = tensor.data_ptr()
+            if ptr in seen:
+                continue  # tied weights
+            seen.add(ptr)
+            size += tensor.numel() * tensor.element_size()
+        except Exception:
+            continue
+    return size
+
+
+def _empty_device_cache():
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
@@ -3,6 +3,8 @@ import uuid
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
+from python.helpers import update_notifier
+
 
 class NotificationType(Enum):
     INFO = "info"
@@ -110,6 +112,7 @@ class NotificationManager:
 
         # Enforce limit
         self._enforce_limit()
+        update_notifier.notify()
 
         return item
 
@@ -150,6 +153,7 @@ class NotificationManager:
                 if hasattr(item, key):
                     setattr(item, key, value)
             self.updates.append(no)
+            update_notifier.notify()
 
     def mark_all_read(self):
         for notification in self.notifications:
@@ -159,6 +163,7 @@ class NotificationManager:
         self.notifications = []
         self.updates = []
         self.guid = str(uuid.uuid4())
+        update_notifier.notify()
 
     def get_notifications_by_type(self, type: NotificationType) -> list[NotificationItem]:
         return [n for n in self.notifications if n.type == type]
\ No newline at end of file
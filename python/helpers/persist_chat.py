@@ -1,9 +1,12 @@
 from collections import OrderedDict
 from datetime import datetime
 from typing import Any
+import os
+import threading
 import uuid
 from agent import Agent, AgentConfig, AgentContext, AgentContextType
 from python.helpers import files, history
+from python.helpers.strings import sanitize_string
 import json
 from initialize import initialize_agent
 
@@ -12,6 +15,59 @@ from python.helpers.log import Log, LogItem
 CHATS_FOLDER = "tmp/chats"
 LOG_SIZE = 1000
 CHAT_FILE_NAME = "chat.json"
+JOURNAL_FILE_NAME = "chat.journal"
+JOURNAL_MAX_RECORDS = 500  # compact into a new snapshot after this many records
+JOURNAL_MIN_COMPACT_SIZE = 1_000_000  # or when the journal outgrows the snapshot and this size
+
+
+class _AgentJournalState:
+    """What was last persisted for one agent of a context."""
+
+    def __init__(self, agent: Agent, data: str):
+        self.history = agent.history
+        self.version = agent.history.version
+        self.current = agent.history.current
+        self.count = len(agent.history.current.messages)
+        self.last = agent.history.current.messages[-1] if self.count else None
+        self.data = data
+
+    def appended_messages(self, agent: Agent) -> list[history.Message] | None:
+        """Messages added to the current topic since last save, None if the history changed otherwise."""
+        hist = agent.history
+        messages = hist.current.messages
+        if (
+            hist is not self.history
+            or hist.version != self.version
+            or hist.current is not self.current
+            or len(messages) < self.count
+            or (self.count and messages[self.count - 1] is not self.last)
+        ):
+            return None
+        return messages[self.count :]
+
+
+class _JournalState:
+    """What was last persisted for a context, used to journal only the changes."""
+
+    def __init__(self, journal_id: str, snapshot_size: int):
+        self.journal_id = journal_id
+        self.snapshot_size = snapshot_size
+        self.journal_size = 0
+        self.records = 0
+        self.meta = ""
+        self.log_guid = ""
+        self.log_version = 0
+        self.log_progress: tuple = ()
+        self.agents: dict[int, _AgentJournalState] = {}
+
+    def needs_compaction(self) -> bool:
+        return self.records >= JOURNAL_MAX_RECORDS or self.journal_size > max(
+            JOURNAL_MIN_COMPACT_SIZE, self.snapshot_size
+        )
+
+
+_journals: dict[str, _JournalState] = {}
+_journal_lock = threading.RLock()
 
 
 def get_chat_folder_path(ctxid: str):
@@ -30,16 +86,22 @@ def get_chat_msg_files_folder(ctxid: str):
     return files.get_abs_path(get_chat_folder_path(ctxid), "messages")
 
 def save_tmp_chat(context: AgentContext):
-    """Save context to the chats folder"""
+    """Save context to the chats folder.
+    Changes since the previous save are appended to the chat journal,
+    a full snapshot is written on first save and when the journal grows too big."""
     # Skip saving BACKGROUND contexts as they should be ephemeral
     if context.type == AgentContextType.BACKGROUND:
         return
 
-    path = _get_chat_file_path(context.id)
-    files.make_dirs(path)
-    data = _serialize_context(context)
-    js = _safe_json_serialize(data, ensure_ascii=False)
-    files.write_file(path, js)
+    with _journal_lock:
+        state = _journals.get(context.id)
+        if state is None or state.needs_compaction():
+            _save_snapshot(context)
+            return
+
+        records = _collect_journal_records(context, state)
+        if records:
+            _append_journal(context.id, state, records)
 
 
 def save_tmp_chats():
@@ -64,6 +126,9 @@ def load_tmp_chats():
         try:
             js = files.read_file(file)
             data = json.loads(js)
+            journal = os.path.join(os.path.dirname(file), JOURNAL_FILE_NAME)
+            if os.path.exists(journal):
+                _replay_journal(data, files.read_file(journal))
             ctx = _deserialize_context(data)
             ctxids.append(ctx.id)
         except Exception as e:
@@ -75,6 +140,199 @@ def _get_chat_file_path(ctxid: str):
     return files.get_abs_path(CHATS_FOLDER, ctxid, CHAT_FILE_NAME)
 
 
+def _get_journal_file_path(ctxid: str):
+    return files.get_abs_path(CHATS_FOLDER, ctxid, JOURNAL_FILE_NAME)
+
+
+def _save_snapshot(context: AgentContext):
+    path = _get_chat_file_path(context.id)
+    files.make_dirs(path)
+    state = _JournalState(journal_id=str(uuid.uuid4()), snapshot_size=0)
+    data = _serialize_context(context)
+    data["journal_id"] = state.journal_id
+    js = _safe_json_serialize(data, ensure_ascii=False)
+    state.snapshot_size = len(js)
+
+    # write snapshot atomically, then start a new journal bound to it
+    tmp_path = path + ".tmp"
+    files.write_file(tmp_path, js)
+    os.replace(tmp_path, path)
+    header = _safe_json_serialize({"type": "header", "journal_id": state.journal_id})
+    files.write_file(_get_journal_file_path(context.id), header + "\n")
+
+    # remember what has been persisted
+    state.meta = _safe_json_serialize(_serialize_meta(context), ensure_ascii=False)
+    state.agents = {
+        a.number: _AgentJournalState(a, _serialize_agent_data(a))
+        for a in _get_agents(context)
+    }
+    _remember_log(context.log, state)
+    _journals[context.id] = state
+
+
+def _append_journal(ctxid: str, state: _JournalState, records: list[dict]):
+    content = "".join(
+        _safe_json_serialize(record, ensure_ascii=False) + "\n" for record in records
+    )
+    content = sanitize_string(content)
+    with open(_get_journal_file_path(ctxid), "a", encoding="utf-8") as f:
+        f.write(content)
+    state.records += len(records)
+    state.journal_size += len(content)
+
+
+def _collect_journal_records(context: AgentContext, state: _JournalState) -> list[dict]:
+    """Compare context with persisted state, return journal records for the changes and update the state."""
+    records: list[dict] = []
+
+    # context metadata
+    meta = _serialize_meta(context)
+    meta_js = _safe_json_serialize(meta, ensure_ascii=False)
+    if meta_js != state.meta:
+        records.append({"type": "context", "context": meta})
+        state.meta = meta_js
+
+    # agents, new messages are appended, anything else rewrites the agent
+    agents = _get_agents(context)
+    if [a.number for a in agents] != list(state.agents.keys()):
+        records.append(
+            {"type": "agents", "agents": [_serialize_agent(a) for a in agents]}
+        )
+        state.agents = {
+            a.number: _AgentJournalState(a, _serialize_agent_data(a)) for a in agents
+        }
+    else:
+        for agent in agents:
+            agent_state = state.agents[agent.number]
+            data = _serialize_agent_data(agent)
+            appended = agent_state.appended_messages(agent)
+            if appended is None or data != agent_state.data:
+                records.append({"type": "agent", **_serialize_agent(agent)})
+            elif appended:
+                records.append(
+                    {
+                        "type": "messages",
+                        "number": agent.number,
+                        "messages": [m.to_dict() for m in appended],
+                    }
+                )
+            else:
+                continue
+            state.agents[agent.number] = _AgentJournalState(agent, data)
+
+    # log, updated items only unless the log has been reset
+    log = context.log
+    if log.guid != state.log_guid:
+        records.append({"type": "log", **_serialize_log(log)})
+    else:
+        changed = log.updated_since(state.log_version)
+        progress = (log.progress, log.progress_no)
+        if changed or progress != state.log_progress:
+            records.append(
+                {
+                    "type": "log_items",
+                    "items": [item.output() for item in changed],
+                    "progress": log.progress,
+                    "progress_no": log.progress_no,
+                }
+            )
+    _remember_log(log, state)
+
+    return records
+
+
+def _get_agents(context: AgentContext) -> list[Agent]:
+    agents: list[Agent] = []
+    agent = context.agent0
+    while agent:
+        agents.append(agent)
+        agent = agent.data.get(Agent.DATA_NAME_SUBORDINATE, None)
+    return agents
+
+
+def _remember_log(log: Log, state: _JournalState):
+    state.log_guid = log.guid
+    state.log_version = log.version
+    state.log_progress = (log.progress, log.progress_no)
+
+
+def _replay_journal(data: dict, journal: str):
+    """Apply journal records to snapshot data loaded from chat.json."""
+    lines = journal.splitlines()
+    if not lines:
+        return
+    try:
+        header = json.loads(lines[0])
+    except Exception:
+        return
+    if header.get("type") != "header" or header.get("journal_id") != data.get("journal_id"):
+        return  # journal belongs to another snapshot
+
+    histories: dict[int, dict] = {}  # decoded histories of agents with appended messages
+
+    def find_agent(number: int) -> dict | None:
+        for ag in data.get("agents", []):
+            if ag.get("number") == number:
+                return ag
+        return None
+
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except Exception:
+            break  # incomplete record written during a crash
+        rtype = record.pop("type", None)
+        if rtype == "context":
+            data.update(record["context"])
+        elif rtype == "agents":
+            data["agents"] = record["agents"]
+            histories.clear()
+        elif rtype == "agent":
+            ag = find_agent(record["number"])
+            if ag is not None:
+                ag.clear()
+                ag.update(record)
+            else:
+                data.setdefault("agents", []).append(record)
+            histories.pop(record["number"], None)
+        elif rtype == "messages":
+            ag = find_agent(record["number"])
+            if ag is None:
+                continue
+            hist = histories.get(record["number"])
+            if hist is None:
+                hist = (
+                    json.loads(ag["history"])
+                    if ag.get("history")
+                    else history.History(agent=None).to_dict()
+                )
+                histories[record["number"]] = hist
+            hist["current"]["messages"].extend(record["messages"])
+            hist["counter"] = hist.get("counter", 0) + len(record["messages"])
+        elif rtype == "log":
+            data["log"] = record
+        elif rtype == "log_items":
+            log = data.setdefault("log", {"logs": []})
+            items = log.setdefault("logs", [])
+            positions = {item.get("no"): i for i, item in enumerate(items)}
+            for item in record["items"]:
+                if item.get("no") in positions:
+                    items[positions[item["no"]]] = item
+                else:
+                    positions[item.get("no")] = len(items)
+                    items.append(item)
+            log["progress"] = record.get("progress", "")
+            log["progress_no"] = record.get("progress_no", 0)
+
+    for number, hist in histories.items():
+        ag = find_agent(number)
+        if ag is not None:
+            ag["history"] = json.dumps(hist, ensure_ascii=False)
+
+    if "log" in data:
+        data["log"]["logs"] = data["log"].get("logs", [])[-LOG_SIZE:]
+
+
 def _convert_v080_chats():
     json_files = files.list_files(CHATS_FOLDER, "*.json")
     for file in json_files:
@@ -105,8 +363,10 @@ def export_json_chat(context: AgentContext):
 
 def remove_chat(ctxid):
     """Remove a chat or task context"""
-    path = get_chat_folder_path(ctxid)
-    files.delete_dir(path)
+    with _journal_lock:
+        _journals.pop(ctxid, None)
+        path = get_chat_folder_path(ctxid)
+        files.delete_dir(path)
 
 
 def remove_msg_files(ctxid):
@@ -117,18 +377,28 @@ def remove_msg_files(ctxid):
 
 def _serialize_context(context: AgentContext):
     # serialize agents
-    agents = []
-    agent = context.agent0
-    while agent:
-        agents.append(_serialize_agent(agent))
-        agent = agent.data.get(Agent.DATA_NAME_SUBORDINATE, None)
+    agents = [_serialize_agent(agent) for agent in _get_agents(context)]
+    meta = _serialize_meta(context)
+
+    return {
+        "id": context.id,
+        "name": meta["name"],
+        "created_at": meta["created_at"],
+        "type": meta["type"],
+        "last_message": meta["last_message"],
+        "agents": agents,
+        "streaming_agent": meta["streaming_agent"],
+        "log": _serialize_log(context.log),
+        "data": meta["data"],
+        "output_data": meta["output_data"],
+    }
 
 
+def _serialize_meta(context: AgentContext):
     data = {k: v for k, v in context.data.items() if not k.startswith("_")}
     output_data = {k: v for k, v in context.output_data.items() if not k.startswith("_")}
 
     return {
-        "id": context.id,
         "name": context.name,
         "created_at": (
             context.created_at.isoformat()
@@ -141,16 +411,19 @@ def _serialize_context(context: AgentContext):
             if context.last_message
             else datetime.fromtimestamp(0).isoformat()
         ),
-        "agents": agents,
         "streaming_agent": (
             context.streaming_agent.number if context.streaming_agent else 0
         ),
-        "log": _serialize_log(context.log),
         "data": data,
         "output_data": output_data,
     }
 
 
+def _serialize_agent_data(agent: Agent) -> str:
+    data = {k: v for k, v in agent.data.items() if not k.startswith("_")}
+    return _safe_json_serialize(data, ensure_ascii=False)
+
+
 def _serialize_agent(agent: Agent):
     data = {k: v for k, v in agent.data.items() if not k.startswith("_")}
 
@@ -273,7 +546,7 @@ def _deserialize_log(data: dict[str, Any]) -> "Log":
                 temp=item_data.get("temp", False),
             )
         )
-        log.updates.append(i)
+        log.mark_updated(i)
         i += 1
 
     return log
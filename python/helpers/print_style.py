@@ -1,11 +1,129 @@
 import os, webcolors, html
 import sys
+import threading, time
+from collections import deque
 from datetime import datetime
 from . import files
 
+LOG_FLUSH_INTERVAL = 1.0  # seconds since the first buffered chunk
+LOG_FLUSH_SIZE = 64 * 1024  # buffered characters
+LOG_BUFFER_MAX = 10_000  # buffered chunks, the oldest are dropped beyond
+LOG_FILE_MAX_SIZE = 10 * 1024 * 1024  # characters per log file before rotation
+LOG_HTML_HEADER = "<html><body style='background-color:black;font-family: Arial, Helvetica, sans-serif;'><pre>\n"
+LOG_HTML_FOOTER = "</pre></body></html>"
+
+
+class HtmlLogWriter:
+    """Buffered background writer of the html console log.
+
+    Writes only append to an in-memory ring buffer, a background thread appends
+    the buffer to the log file once LOG_FLUSH_INTERVAL passed since the first
+    buffered chunk or LOG_FLUSH_SIZE characters accumulated. Log files are rotated
+    after LOG_FILE_MAX_SIZE characters. close() flushes and finishes the file, it
+    runs at exit.
+    """
+
+    path: str | None = None
+    _buffer: deque[str] = deque(maxlen=LOG_BUFFER_MAX)
+    _size = 0
+    _dropped = 0
+    _since = 0.0
+    _file_size = 0
+    _lock = threading.Lock()
+    _write_lock = threading.Lock()
+    _wake = threading.Event()
+    _thread: threading.Thread | None = None
+
+    @classmethod
+    def write(cls, text: str):
+        with cls._lock:
+            if not cls._buffer:
+                cls._since = time.monotonic()
+            elif len(cls._buffer) == cls._buffer.maxlen:
+                cls._size -= len(cls._buffer[0])
+                cls._dropped += 1
+            cls._buffer.append(text)
+            cls._size += len(text)
+            if cls._size >= LOG_FLUSH_SIZE:
+                cls._wake.set()
+            if not cls._thread or not cls._thread.is_alive():
+                cls._thread = threading.Thread(
+                    target=cls._run, daemon=True, name="HtmlLogWriter"
+                )
+                cls._thread.start()
+
+    @classmethod
+    def flush(cls):
+        """Append buffered chunks to the log file now."""
+        with cls._lock:
+            chunks = list(cls._buffer)
+            dropped = cls._dropped
+            cls._buffer.clear()
+            cls._size = cls._dropped = 0
+        if not chunks:
+            return
+        data = "".join(chunks)
+        if dropped:
+            data = f"<br>&lt;&lt; {dropped} log chunks dropped &gt;&gt;<br>\n" + data
+        # one flush at a time, so chunks are never written out of order
+        with cls._write_lock:
+            try:
+                if cls.path is None or cls._file_size >= LOG_FILE_MAX_SIZE:
+                    cls._rotate()
+                with open(cls.path, "a", encoding="utf-8") as f:  # type: ignore
+                    f.write(data)
+                cls._file_size += len(data)
+            except Exception:
+                pass  # console logging must never break the caller
+
+    @classmethod
+    def close(cls):
+        cls.flush()
+        with cls._write_lock:
+            if cls.path:
+                try:
+                    with open(cls.path, "a", encoding="utf-8") as f:
+                        f.write(LOG_HTML_FOOTER)
+                except Exception:
+                    pass
+                cls.path = None  # later writes start a new file
+
+    @classmethod
+    def _run(cls):
+        while True:
+            cls._wake.wait(timeout=LOG_FLUSH_INTERVAL / 5)
+            cls._wake.clear()
+            with cls._lock:
+                due = cls._size >= LOG_FLUSH_SIZE or (
+                    cls._buffer and time.monotonic() - cls._since >= LOG_FLUSH_INTERVAL
+                )
+            if due:
+                cls.flush()
+
+    @classmethod
+    def _rotate(cls):
+        # finish the current file and start a new one
+        if cls.path:
+            with open(cls.path, "a", encoding="utf-8") as f:
+                f.write(LOG_HTML_FOOTER)
+        logs_dir = files.get_abs_path("logs")
+        os.makedirs(logs_dir, exist_ok=True)
+        name = datetime.now().strftime("log_%Y%m%d_%H%M%S")
+        path, part = os.path.join(logs_dir, name + ".html"), 0
+        while os.path.exists(path):
+            part += 1
+            path = os.path.join(logs_dir, f"{name}_{part}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(LOG_HTML_HEADER)
+        cls.path = PrintStyle.log_file_path = path
+        cls._file_size = len(LOG_HTML_HEADER)
+
+
 class PrintStyle:
     last_endline = True
     log_file_path = None
+    # ANSI start sequence and html style attribute per style configuration
+    _styles: dict[tuple, tuple[str, str]] = {}
 
     def __init__(self, bold=False, italic=False, underline=False, font_color="default", background_color="default", padding=False, log_only=False):
         self.bold = bold
@@ -17,14 +135,6 @@ class PrintStyle:
         self.padding_added = False  # Flag to track if padding was added
         self.log_only = log_only
 
-        if PrintStyle.log_file_path is None:
-            logs_dir = files.get_abs_path("logs")
-            os.makedirs(logs_dir, exist_ok=True)
-            log_filename = datetime.now().strftime("log_%Y%m%d_%H%M%S.html")
-            PrintStyle.log_file_path = os.path.join(logs_dir, log_filename)
-            with open(PrintStyle.log_file_path, "w") as f:
-                f.write("<html><body style='background-color:black;font-family: Arial, Helvetica, sans-serif;'><pre>\n")
-
     def _get_rgb_color_code(self, color, is_background=False):
         try:
             if color.startswith("#") and len(color) == 7:
@@ -42,34 +152,39 @@ class PrintStyle:
         except ValueError:
             return "", ""
 
-    def _get_styled_text(self, text):
+    def _get_style(self) -> tuple[str, str]:
+        key = (self.bold, self.italic, self.underline, self.font_color, self.background_color)
+        style = PrintStyle._styles.get(key)
+        if style is None:
+            style = PrintStyle._styles[key] = self._build_style()
+        return style
+
+    def _build_style(self) -> tuple[str, str]:
         start = ""
-        end = "\033[0m"  # Reset ANSI code
+        styles = []
         if self.bold:
             start += "\033[1m"
+            styles.append("font-weight: bold;")
         if self.italic:
             start += "\033[3m"
+            styles.append("font-style: italic;")
         if self.underline:
             start += "\033[4m"
-        font_color_code, _ = self._get_rgb_color_code(self.font_color)
-        background_color_code, _ = self._get_rgb_color_code(self.background_color, True)
-        start += font_color_code
-        start += background_color_code
+            styles.append("text-decoration: underline;")
+        font_ansi, font_css = self._get_rgb_color_code(self.font_color)
+        background_ansi, background_css = self._get_rgb_color_code(self.background_color, True)
+        start += font_ansi + background_ansi
+        styles.append(font_css)
+        styles.append(background_css)
+        return start, " ".join(styles)
+
+    def _get_styled_text(self, text):
+        start, _ = self._get_style()
+        end = "\033[0m"  # Reset ANSI code
         return start + text + end
 
     def _get_html_styled_text(self, text):
-        styles = []
-        if self.bold:
-            styles.append("font-weight: bold;")
-        if self.italic:
-            styles.append("font-style: italic;")
-        if self.underline:
-            styles.append("text-decoration: underline;")
-        _, font_color_code = self._get_rgb_color_code(self.font_color)
-        _, background_color_code = self._get_rgb_color_code(self.background_color, True)
-        styles.append(font_color_code)
-        styles.append(background_color_code)
-        style_attr = " ".join(styles)
+        _, style_attr = self._get_style()
         escaped_text = html.escape(text).replace("\n", "<br>")  # Escape HTML special characters
         return f'<span style="{style_attr}">{escaped_text}</span>'
 
@@ -81,14 +196,11 @@ class PrintStyle:
             self.padding_added = True
 
     def _log_html(self, html):
-        with open(PrintStyle.log_file_path, "a", encoding='utf-8') as f: # type: ignore # add encoding='utf-8'
-            f.write(html)
+        HtmlLogWriter.write(html)
 
     @staticmethod
     def _close_html_log():
-        if PrintStyle.log_file_path:
-            with open(PrintStyle.log_file_path, "a") as f:
-                f.write("</pre></body></html>")
+        HtmlLogWriter.close()
 
     def get(self, *args, sep=' ', **kwargs):
         text = sep.join(map(str, args))
@@ -2,8 +2,7 @@ import importlib
 import inspect
 import json
 from typing import Any, TypedDict
-import aiohttp
-from python.helpers import crypto
+from python.helpers import crypto, http_pool
 
 from python.helpers import dotenv
 
@@ -68,14 +67,13 @@ def _get_function(module: str, function_name: str):
 
 
 async def _send_json_data(url: str, data):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            url,
-            json=data,
-        ) as response:
-            if response.status == 200:
-                result = await response.json()
-                return result
-            else:
-                error = await response.text()
-                raise Exception(error)
+    async with http_pool.get_session().post(
+        url,
+        json=data,
+    ) as response:
+        if response.status == 200:
+            result = await response.json()
+            return result
+        else:
+            error = await response.text()
+            raise Exception(error)
@@ -3,7 +3,7 @@ import inspect
 import secrets
 from pathlib import Path
 from typing import TypeVar, Callable, Awaitable, Union, overload, cast
-from python.helpers import dotenv, rfc, settings, files
+from python.helpers import dotenv, rfc, settings, files, http_pool
 import asyncio
 import threading
 import queue
@@ -148,8 +148,15 @@ def call_development_function_sync(
     # run async function in sync manner
     result_queue = queue.Queue()
 
+    async def call():
+        try:
+            return await call_development_function(func, *args, **kwargs)
+        finally:
+            # the loop ends with this call, its shared http session goes with it
+            await http_pool.close_session()
+
     def run_in_thread():
-        result = asyncio.run(call_development_function(func, *args, **kwargs))
+        result = asyncio.run(call())
         result_queue.put(result)
 
     thread = threading.Thread(target=run_in_thread)
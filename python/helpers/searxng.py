@@ -1,5 +1,4 @@
-import aiohttp
-from python.helpers import runtime
+from python.helpers import runtime, http_pool
 
 URL = "http://localhost:55510/search"
 
@@ -7,6 +6,5 @@ async def search(query:str):
     return await runtime.call_development_function(_search, query=query)
 
 async def _search(query:str):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(URL, data={"q": query, "format": "json"}) as response:
-            return await response.json()
+    async with http_pool.get_session().post(URL, data={"q": query, "format": "json"}) as response:
+        return await response.json()
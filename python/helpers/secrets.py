@@ -35,6 +35,91 @@ class EnvLine:
     )
 
 
+class SecretsMasker:
+    """Compiled matcher replacing all secret values in a single pass over the text.
+
+    All values are combined into one regex alternation, longest first, so at every
+    position the longest secret wins and the text is scanned once regardless of the
+    number of secrets.
+    """
+
+    def __init__(
+        self,
+        key_to_value: Dict[str, str],
+        min_length: int = 4,
+        placeholder: str = "§§secret({key})",
+    ):
+        # Map value -> placeholder, first key wins for duplicate values
+        self.replacements: Dict[str, str] = {}
+        for key, value in key_to_value.items():
+            if isinstance(value, str) and value and len(value.strip()) >= min_length:
+                self.replacements.setdefault(value, alias_for_key(key, placeholder))
+        self.max_len: int = max((len(v) for v in self.replacements), default=0)
+        self.pattern: Optional[re.Pattern] = (
+            re.compile(
+                "|".join(
+                    re.escape(v)
+                    for v in sorted(self.replacements, key=len, reverse=True)
+                )
+            )
+            if self.replacements
+            else None
+        )
+
+    def _replace(self, match: re.Match) -> str:
+        return self.replacements[match.group(0)]
+
+    def mask(self, text: str) -> str:
+        if not text or not self.pattern:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def create_incremental(self) -> "IncrementalMasker":
+        return IncrementalMasker(self)
+
+
+class IncrementalMasker:
+    """Masks a growing text (e.g. accumulated stream) scanning only the appended part.
+
+    Text older than the longest secret can no longer change its masking, so its masked
+    form is kept and only the tail is rescanned on the next call. If the new text does
+    not continue the previous one, masking starts over.
+    """
+
+    def __init__(self, masker: SecretsMasker):
+        self.masker = masker
+        self._raw = ""  # last raw text seen
+        self._done = 0  # raw text before this index is masked for good
+        self._masked = ""  # masked form of raw text before _done
+
+    def mask(self, text: str) -> str:
+        pattern = self.masker.pattern
+        if not text or not pattern:
+            return text
+        if not text.startswith(self._raw):
+            self._done, self._masked = 0, ""
+        self._raw = text
+
+        # a match starting before this point has all its characters available
+        final = len(text) - self.masker.max_len + 1
+        parts = [self._masked]
+        pos = self._done
+        for match in pattern.finditer(text, self._done):
+            if match.start() >= final:
+                break
+            parts.append(text[pos : match.start()])
+            parts.append(self.masker._replace(match))
+            pos = match.end()
+        if pos < final:
+            parts.append(text[pos:final])
+            pos = final
+        self._masked = "".join(parts)
+        self._done = pos
+
+        # the tail can still change with more text, mask it provisionally
+        return self._masked + self.masker.mask(text[pos:])
+
+
 class StreamingSecretsFilter:
     """Stateful streaming filter that masks secrets on the fly.
 
@@ -44,7 +129,12 @@ class StreamingSecretsFilter:
     - On finalize(), any unresolved partial is masked with '***'.
     """
 
-    def __init__(self, key_to_value: Dict[str, str], min_trigger: int = 3):
+    def __init__(
+        self,
+        key_to_value: Dict[str, str],
+        min_trigger: int = 3,
+        full_masker: Optional[SecretsMasker] = None,
+    ):
         self.min_trigger = max(1, int(min_trigger))
         # Map value -> key for placeholder construction
         self.value_to_key: Dict[str, str] = {
@@ -58,20 +148,21 @@ class StreamingSecretsFilter:
             for i in range(self.min_trigger, len(v) + 1):
                 self.prefixes.add(v[:i])
         self.max_len: int = max((len(v) for v in self.secret_values), default=0)
+        self.masker = SecretsMasker(key_to_value, min_length=0)
+
+        # Incremental masking of the accumulated full text
+        self.full_masker = (full_masker or self.masker).create_incremental()
 
         # Internal buffer of pending text that is not safe to flush yet
         self.pending: str = ""
 
     def _replace_full_values(self, text: str) -> str:
         """Replace all full secret values with placeholders in the given text."""
-        # Sort by length desc to avoid partial overlaps
-        for val in sorted(self.secret_values, key=len, reverse=True):
-            if not val:
-                continue
-            key = self.value_to_key.get(val, "")
-            if key:
-                text = text.replace(val, alias_for_key(key))
-        return text
+        return self.masker.mask(text)
+
+    def mask_full(self, full: str) -> str:
+        """Mask the full accumulated text, scanning only what was appended since the last call."""
+        return self.full_masker.mask(full)
 
     def _longest_suffix_prefix(self, text: str) -> int:
         """Return length of longest suffix of text that is a known secret prefix.
@@ -146,6 +237,7 @@ class SecretsManager:
         self._raw_snapshots: Dict[str, str] = {}
         self._secrets_cache = None
         self._last_raw_text = None
+        self._maskers: Dict[Tuple[int, str], SecretsMasker] = {}
 
     def read_secrets_raw(self) -> str:
         """Read raw secrets file content from local filesystem (same system)."""
@@ -256,7 +348,19 @@ class SecretsManager:
 
     def create_streaming_filter(self) -> "StreamingSecretsFilter":
         """Create a streaming-aware secrets filter snapshotting current secret values."""
-        return StreamingSecretsFilter(self.load_secrets())
+        return StreamingSecretsFilter(self.load_secrets(), full_masker=self.get_masker())
+
+    def get_masker(
+        self, min_length: int = 4, placeholder: str = "§§secret({key})"
+    ) -> SecretsMasker:
+        """Get compiled masker for current secrets, rebuilt only when secrets change."""
+        with self._lock:
+            key = (min_length, placeholder)
+            masker = self._maskers.get(key)
+            if masker is None:
+                masker = SecretsMasker(self.load_secrets(), min_length, placeholder)
+                self._maskers[key] = masker
+            return masker
 
     def replace_placeholders(self, text: str) -> str:
         """Replace secret placeholders with actual values"""
@@ -301,18 +405,7 @@ class SecretsManager:
         """Replace actual secret values with placeholders in text"""
         if not text:
             return text
-
-        secrets = self.load_secrets()
-        result = text
-
-        # Sort by length (longest first) to avoid partial replacements
-        for key, value in sorted(
-            secrets.items(), key=lambda x: len(x[1]), reverse=True
-        ):
-            if value and len(value.strip()) >= min_length:
-                result = result.replace(value, alias_for_key(key, placeholder))
-
-        return result
+        return self.get_masker(min_length, placeholder).mask(text)
 
     def get_masked_secrets(self) -> str:
         """Get content with values masked for frontend display (preserves comments and unrecognized lines)"""
@@ -351,6 +444,7 @@ class SecretsManager:
             self._secrets_cache = None
             self._raw_snapshots = {}
             self._last_raw_text = None
+            self._maskers = {}
 
     @classmethod
     def _invalidate_all_caches(cls):
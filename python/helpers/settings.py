@@ -1,4 +1,5 @@
 import base64
+import copy
 import hashlib
 import json
 import os
@@ -45,6 +46,7 @@ class Settings(TypedDict):
     embed_model_kwargs: dict[str, Any]
     embed_model_rl_requests: int
     embed_model_rl_input: int
+    embed_model_batch_size: int
 
     browser_model_provider: str
     browser_model_name: str
@@ -59,6 +61,7 @@ class Settings(TypedDict):
     agent_profile: str
     agent_memory_subdir: str
     agent_knowledge_subdir: str
+    agent_loop_threads: int
 
     memory_recall_enabled: bool
     memory_recall_delayed: bool
@@ -74,6 +77,9 @@ class Settings(TypedDict):
     memory_memorize_enabled: bool
     memory_memorize_consolidation: bool
     memory_memorize_replace_threshold: float
+    memory_index_type: str
+    memory_index_threshold: int
+    memory_index_budget_mb: int
 
     api_keys: dict[str, str]
 
@@ -164,6 +170,16 @@ API_KEY_PLACEHOLDER = "************"
 SETTINGS_FILE = files.get_abs_path("tmp/settings.json")
 _settings: Settings | None = None
 
+# normalized snapshot handed out by get_settings(), rebuilt only when the version changes
+_settings_version: int = 0
+_snapshot: Settings | None = None
+_snapshot_version: int = -1
+_normalize_count: int = 0
+
+# values that are expensive to compute and stable for the process lifetime
+_version: str | None = None
+_auth_token: tuple[tuple[str, str, str], str] | None = None
+
 
 def convert_out(settings: Settings) -> SettingsOutput:
     default_settings = get_default_settings()
@@ -413,6 +429,16 @@ def convert_out(settings: Settings) -> SettingsOutput:
         }
     )
 
+    embed_model_fields.append(
+        {
+            "id": "embed_model_batch_size",
+            "title": "Batch size",
+            "description": "Maximum number of texts embedded in one request or local model pass. Concurrent embedding requests are merged into batches of up to this size.",
+            "type": "number",
+            "value": settings["embed_model_batch_size"],
+        }
+    )
+
     embed_model_fields.append(
         {
             "id": "embed_model_kwargs",
@@ -654,6 +680,16 @@ def convert_out(settings: Settings) -> SettingsOutput:
         }
     )
 
+    agent_fields.append(
+        {
+            "id": "agent_loop_threads",
+            "title": "Agent event loop threads",
+            "description": "Number of event loop threads chats and scheduled tasks are spread across. Each chat stays on its thread, so a chat blocked by a slow call only stalls the chats sharing its thread. New chats go to the least busy thread; a change applies to newly started chats.",
+            "type": "number",
+            "value": settings["agent_loop_threads"],
+        }
+    )
+
     agent_section: SettingsSection = {
         "id": "agent",
         "title": "Agent Config",
@@ -837,6 +873,41 @@ def convert_out(settings: Settings) -> SettingsOutput:
         }
     )
 
+    memory_fields.append(
+        {
+            "id": "memory_index_type",
+            "title": "Memory index type",
+            "description": "Vector index used for large memory stores. Stores start with an exact flat index and migrate to the selected index once they hold more documents than the migration threshold. IVF searches a subset of clusters, IVF+PQ also compresses vectors to a fraction of their size at some cost in precision. Can be overridden per memory subdirectory with an index.json file containing index_type and threshold.",
+            "type": "select",
+            "value": settings["memory_index_type"],
+            "options": [
+                {"value": "flat", "label": "Flat (exact, never migrate)"},
+                {"value": "ivf", "label": "IVF"},
+                {"value": "ivfpq", "label": "IVF + PQ compression"},
+            ],
+        }
+    )
+
+    memory_fields.append(
+        {
+            "id": "memory_index_threshold",
+            "title": "Memory index migration threshold",
+            "description": "Number of documents in a memory store after which its flat index is migrated to the selected index type.",
+            "type": "number",
+            "value": settings["memory_index_threshold"],
+        }
+    )
+
+    memory_fields.append(
+        {
+            "id": "memory_index_budget_mb",
+            "title": "Loaded memory budget (MB)",
+            "description": "Memory indexes are memory-mapped until first modified and their documents are read from disk on demand. Once modified indexes of all loaded memories take more than this, memories unused for 5 minutes are unloaded. 0 = never unload.",
+            "type": "number",
+            "value": settings["memory_index_budget_mb"],
+        }
+    )
+
     memory_section: SettingsSection = {
         "id": "memory",
         "title": "Memory",
@@ -1313,7 +1384,7 @@ def _get_api_key_field(settings: Settings, provider: str, title: str) -> Setting
 
 
 def convert_in(settings: dict) -> Settings:
-    current = get_settings()
+    current = copy.deepcopy(get_settings())  # snapshot is shared, do not mutate it
     for section in settings["sections"]:
         if "fields" in section:
             for field in section["fields"]:
@@ -1334,20 +1405,50 @@ def convert_in(settings: dict) -> Settings:
     return current
 
 def get_settings() -> Settings:
-    global _settings
-    if not _settings:
-        _settings = _read_settings_file()
-    if not _settings:
-        _settings = get_default_settings()
-    norm = normalize_settings(_settings)
-    return norm
+    """Return the normalized settings.
+
+    Settings are normalized once per settings version, not on every call.
+    Each caller gets its own copy of the shared snapshot and may change it.
+    """
+    global _settings, _snapshot, _snapshot_version
+    if _snapshot is None or _snapshot_version != _settings_version:
+        if not _settings:
+            _settings = _read_settings_file()
+        if not _settings:
+            _settings = get_default_settings()
+        _snapshot = normalize_settings(_settings)
+        _snapshot_version = _settings_version
+    return _copy_snapshot(_snapshot)
+
+
+def _copy_snapshot(snapshot: Settings) -> Settings:
+    # values are flat dicts and lists at most, copying them one level deep is enough
+    return cast(Settings, {
+        key: value.copy() if isinstance(value, (dict, list)) else value
+        for key, value in snapshot.items()
+    })
+
+
+def get_settings_version() -> int:
+    return _settings_version
+
+
+def get_normalize_count() -> int:
+    return _normalize_count
+
+
+def invalidate_settings():
+    """Force the next get_settings() call to normalize settings again."""
+    global _settings_version
+    _settings_version += 1
 
 
 def set_settings(settings: Settings, apply: bool = True):
     global _settings
-    previous = _settings
+    previous = _snapshot or _settings
     _settings = normalize_settings(settings)
     _write_settings_file(_settings)
+    invalidate_settings()  # token depends on credentials just written to dotenv
     if apply:
         _apply_settings(previous)
 
@@ -1365,6 +1466,8 @@ def merge_settings(original: Settings, delta: dict) -> Settings:
 
 
 def normalize_settings(settings: Settings) -> Settings:
+    global _normalize_count
+    _normalize_count += 1
     copy = settings.copy()
     default = get_default_settings()
 
@@ -1481,6 +1584,7 @@ def get_default_settings() -> Settings:
         embed_model_kwargs={},
         embed_model_rl_requests=0,
         embed_model_rl_input=0,
+        embed_model_batch_size=32,
         browser_model_provider="openrouter",
         browser_model_name="openai/gpt-4.1",
         browser_model_api_base="",
@@ -1504,6 +1608,9 @@ def get_default_settings() -> Settings:
         memory_memorize_enabled=True,
         memory_memorize_consolidation=True,
         memory_memorize_replace_threshold=0.9,
+        memory_index_type="ivf",
+        memory_index_threshold=50000,
+        memory_index_budget_mb=1024,
         api_keys={},
         auth_login="",
         auth_password="",
@@ -1511,6 +1618,7 @@ def get_default_settings() -> Settings:
         agent_profile="agent0",
         agent_memory_subdir="default",
         agent_knowledge_subdir="custom",
+        agent_loop_threads=4,
         rfc_auto_docker=True,
         rfc_url="localhost",
         rfc_password="",
@@ -1564,8 +1672,10 @@ def _apply_settings(previous: Settings | None):
             or _settings["embed_model_kwargs"] != previous["embed_model_kwargs"]
         ):
             from python.helpers.memory import reload as memory_reload
+            from python.helpers import model_registry
 
             memory_reload()
+            model_registry.unload()  # free local models no longer in use
 
         # update mcp settings if necessary
         if not previous or _settings["mcp_servers"] != previous["mcp_servers"]:
@@ -1726,15 +1836,26 @@ def get_runtime_config(set: Settings):
 
 
 def create_auth_token() -> str:
+    global _auth_token
     runtime_id = runtime.get_persistent_id()
     username = dotenv.get_dotenv_value(dotenv.KEY_AUTH_LOGIN) or ""
     password = dotenv.get_dotenv_value(dotenv.KEY_AUTH_PASSWORD) or ""
+    # token only changes with credentials, reuse the last one if they are the same
+    key = (runtime_id, username, password)
+    if _auth_token and _auth_token[0] == key:
+        return _auth_token[1]
     # use base64 encoding for a more compact token with alphanumeric chars
     hash_bytes = hashlib.sha256(f"{runtime_id}:{username}:{password}".encode()).digest()
     # encode as base64 and remove any non-alphanumeric chars (like +, /, =)
     b64_token = base64.urlsafe_b64encode(hash_bytes).decode().replace("=", "")
-    return b64_token[:16]
+    token = b64_token[:16]
+    _auth_token = (key, token)
+    return token
 
 
 def _get_version():
-    return git.get_version()
+    # git version requires a subprocess call, resolve it once per process
+    global _version
+    if _version is None:
+        _version = git.get_version()
+    return _version
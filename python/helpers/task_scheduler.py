@@ -20,6 +20,7 @@ from initialize import initialize_agent
 from python.helpers.persist_chat import save_tmp_chat
 from python.helpers.print_style import PrintStyle
 from python.helpers.defer import DeferredTask
+from python.helpers.context_loops import ContextLoops
 from python.helpers.files import get_abs_path, make_dirs, read_file, write_file
 from python.helpers.localization import Localization
 from python.helpers import projects
@@ -889,7 +890,8 @@ class TaskScheduler:
                 # Make one final save to ensure all states are persisted
                 await self._tasks.save()
 
-        deferred_task = DeferredTask(thread_name=self.__class__.__name__)
+        # run on the loop of the task's chat so a busy task does not stall other chats
+        deferred_task = DeferredTask(thread_name=ContextLoops.get_thread_name(task.context_id or task.uuid))
         deferred_task.start_task(_run_task_wrapper, task.uuid, task_context)
 
         # Ensure background execution doesn't exit immediately on async await, especially in script contexts
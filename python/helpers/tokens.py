@@ -1,22 +1,47 @@
+from collections import OrderedDict
+import threading
 from typing import Literal
 import tiktoken
 
 APPROX_BUFFER = 1.1
 TRIM_BUFFER = 0.8
 
+CACHE_SIZE = 8192  # number of cached token counts
+CHARS_PER_TOKEN = 4.0  # initial ratio for streaming estimates
+CALIBRATE_AFTER_CHARS = 1000  # first exact count of a stream, then every time it doubles
+
+_cache: OrderedDict[tuple[str, int, int], int] = OrderedDict()
+_cache_lock = threading.Lock()
+
 
 def count_tokens(text: str, encoding_name="cl100k_base") -> int:
     if not text:
         return 0
 
+    # same content is counted many times (history messages, system prompt), cache by content hash
+    key = (encoding_name, len(text), hash(text))
+    with _cache_lock:
+        token_count = _cache.get(key)
+        if token_count is not None:
+            _cache.move_to_end(key)
+            return token_count
+
+    token_count = _encode_count(text, encoding_name)
+
+    with _cache_lock:
+        _cache[key] = token_count
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return token_count
+
+
+def _encode_count(text: str, encoding_name: str) -> int:
     # Get the encoding
     encoding = tiktoken.get_encoding(encoding_name)
 
     # Encode the text and count the tokens
     tokens = encoding.encode(text, disallowed_special=())
-    token_count = len(tokens)
-
-    return token_count
+    return len(tokens)
 
 
 def approximate_tokens(
@@ -25,6 +50,44 @@ def approximate_tokens(
     return int(count_tokens(text) * APPROX_BUFFER)
 
 
+class TokenEstimator:
+    """Cheap approximate token counts for a stream of text deltas.
+
+    Deltas are estimated from their length using a chars per token ratio,
+    calibrated on an exact count of the accumulated text each time it doubles
+    in size, so encoding work stays linear in the stream length. Estimates are
+    returned so that their running sum tracks approximate_tokens() of the
+    whole text.
+    """
+
+    def __init__(self, encoding_name="cl100k_base"):
+        self.encoding_name = encoding_name
+        self.parts: list[str] = []
+        self.chars = 0
+        self.ratio = CHARS_PER_TOKEN
+        self.next_calibration = CALIBRATE_AFTER_CHARS
+        self.estimated = 0
+
+    def add(self, delta: str) -> int:
+        if not delta:
+            return 0
+        self.parts.append(delta)
+        self.chars += len(delta)
+        if self.chars >= self.next_calibration:
+            text = "".join(self.parts)
+            self.parts = [text]
+            exact = _encode_count(text, self.encoding_name)
+            self.ratio = self.chars / max(1, exact)
+            self.next_calibration = self.chars * 2
+            target = int(exact * APPROX_BUFFER)
+        else:
+            target = int(self.chars / self.ratio * APPROX_BUFFER)
+        # never negative, overestimates are absorbed by following deltas
+        tokens = max(0, target - self.estimated)
+        self.estimated += tokens
+        return tokens
+
+
 def trim_to_tokens(
     text: str,
     max_tokens: int,
@@ -0,0 +1,35 @@
+import threading
+
+# Wakes server-push streams when logs, contexts or notifications change.
+# Every change increments a global version, changes of a context also record
+# that version for the context, so streams only re-serialize changed contexts.
+
+_condition = threading.Condition()
+_version = 0
+_changed: dict[str, int] = {}  # context id -> version of its last change
+
+
+def notify(context_id: str = ""):
+    global _version
+    with _condition:
+        _version += 1
+        if context_id:
+            _changed[context_id] = _version
+        _condition.notify_all()
+
+
+def get_version() -> int:
+    return _version
+
+
+def wait(since: int, timeout: float) -> int:
+    """Block until the version is past since or timeout passes, returns the current version."""
+    with _condition:
+        _condition.wait_for(lambda: _version > since, timeout)
+        return _version
+
+
+def changed_since(since: int) -> set[str]:
+    with _condition:
+        return {id for id, version in _changed.items() if version > since}
+
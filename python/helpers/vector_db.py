@@ -1,7 +1,5 @@
 from typing import Any, List, Sequence
 import uuid
-from langchain_community.vectorstores import FAISS
-
 # faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
 from python.helpers import faiss_monkey_patch
 import faiss
@@ -17,9 +15,10 @@ from langchain.embeddings import CacheBackedEmbeddings
 from simpleeval import simple_eval
 
 from agent import Agent
+from python.helpers.metadata_index import MetadataFilter, MetadataIndexedFAISS
 
 
-class MyFaiss(FAISS):
+class MyFaiss(MetadataIndexedFAISS):
     # override aget_by_ids
     def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
         # return all self.docstore._dict[id] in ids
@@ -76,7 +75,7 @@ class VectorDB:
     async def search_by_similarity_threshold(
         self, query: str, limit: int, threshold: float, filter: str = ""
     ):
-        comparator = get_comparator(filter) if filter else None
+        comparator = MetadataFilter(filter, get_comparator(filter)) if filter else None
 
         return await self.db.asearch(
             query,
@@ -87,16 +86,7 @@ class VectorDB:
         )
 
     async def search_by_metadata(self, filter: str, limit: int = 0) -> list[Document]:
-        comparator = get_comparator(filter)
-        all_docs = self.db.get_all_docs()
-        result = []
-        for doc in all_docs.values():
-            if comparator(doc.metadata):
-                result.append(doc)
-                # stop if limit reached and limit > 0
-                if limit > 0 and len(result) >= limit:
-                    break
-        return result
+        return self.db.get_by_metadata(MetadataFilter(filter, get_comparator(filter)), limit)
 
     async def insert_documents(self, docs: list[Document]):
         ids = [str(uuid.uuid4()) for _ in range(len(docs))]
@@ -105,7 +95,14 @@ class VectorDB:
             for doc, id in zip(docs, ids):
                 doc.metadata["id"] = id  # add ids to documents metadata
 
-            self.db.add_documents(documents=docs, ids=ids)
+            # embed asynchronously, the embedding model batches and rate limits off this loop
+            texts = [doc.page_content for doc in docs]
+            embeddings = await self.embeddings.aembed_documents(texts)
+            self.db.add_embeddings(
+                list(zip(texts, embeddings)),
+                metadatas=[doc.metadata for doc in docs],
+                ids=ids,
+            )
         return ids
 
     async def delete_documents_by_ids(self, ids: list[str]):
@@ -0,0 +1,123 @@
+import math
+from typing import Any
+
+# faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
+from python.helpers import faiss_monkey_patch
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "ivfpq")
+TRAIN_POINTS_PER_LIST = 40  # k-means training sample size per inverted list
+MIN_POINTS_PER_LIST = 39  # below this faiss warns about poor centroids
+NPROBE_SHARE = 16  # probe 1/16 of the lists by default
+PQ_BITS = 8
+PQ_SUBQUANTIZERS = (64, 48, 32, 24, 16, 12, 8, 4, 2, 1)
+
+
+def get_index_type(index: faiss.Index) -> str:
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivfpq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf"
+    return "flat"
+
+
+def get_nlist(count: int) -> int:
+    return max(1, min(int(4 * math.sqrt(count)), count // MIN_POINTS_PER_LIST))
+
+
+def build_index(index_type: str, vectors: np.ndarray, metric: int) -> faiss.Index:
+    """Train an IVF index on the vectors and add them in order, so FAISS ids
+    match the row numbers like they do in a flat index."""
+    count, dim = vectors.shape
+    nlist = get_nlist(count)
+    if metric == faiss.METRIC_INNER_PRODUCT:
+        quantizer = faiss.IndexFlatIP(dim)
+    else:
+        quantizer = faiss.IndexFlatL2(dim)
+    if index_type == "ivfpq":
+        m = next(m for m in PQ_SUBQUANTIZERS if dim % m == 0 and (m <= dim // 2 or m == 1))
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, PQ_BITS, metric)
+    elif index_type == "ivf":
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    sample = min(count, nlist * TRAIN_POINTS_PER_LIST)
+    if sample < count:
+        rows = np.random.default_rng(0).choice(count, sample, replace=False)
+        index.train(vectors[np.sort(rows)])
+    else:
+        index.train(vectors)
+    index.nprobe = max(1, nlist // NPROBE_SHARE)
+    index.add(vectors)
+    return index
+
+
+def read_index_mmap(path: str) -> faiss.Index:
+    """Open an index read only with its vectors memory-mapped where the index
+    type supports it, otherwise load it into memory."""
+    with open(path, "rb") as f:
+        fourcc = f.read(4)
+    if fourcc.startswith(b"Iw"):  # IVF indexes map their inverted lists
+        flags = faiss.IO_FLAG_MMAP
+    elif fourcc.startswith(b"IxF"):  # flat indexes map their codes
+        flags = faiss.IO_FLAG_MMAP_IFC
+    else:
+        return faiss.read_index(path)
+    return faiss.read_index(path, flags | faiss.IO_FLAG_READ_ONLY)
+
+
+def needs_migration(index: faiss.Index, index_type: str, threshold: int) -> bool:
+    return (
+        index_type in INDEX_TYPES
+        and index_type != "flat"
+        and get_index_type(index) == "flat"
+        and index.ntotal >= max(threshold, 1)
+    )
+
+
+def migrate(db: Any, index_type: str) -> bool:
+    """Replace the flat index of a MetadataIndexedFAISS store by an IVF index.
+
+    Training runs outside of the store lock, vectors added meanwhile are
+    copied over when swapping. Returns False when documents were deleted during
+    training, the migration is then retried on a later save.
+    """
+    with db.lock:
+        index = db.index
+        deletes = db.deletes
+        vectors = index.reconstruct_n(0, index.ntotal)
+    new_index = build_index(index_type, vectors, index.metric_type)
+    with db.lock:
+        if db.deletes != deletes or db.index is not index:
+            return False
+        if index.ntotal > len(vectors):
+            new_index.add(index.reconstruct_n(len(vectors), index.ntotal - len(vectors)))
+        db.index = new_index
+        db.mmap_path = None
+    return True
+
+
+def compact_ids(index: faiss.Index, removed: list[int]):
+    """Renumber ids after removal. IVF indexes keep the ids of the remaining
+    vectors, langchain's FAISS expects them to shift down like in a flat index."""
+    if not removed or not isinstance(index, faiss.IndexIVF):
+        return
+    removed_sorted = np.array(sorted(removed), dtype=np.int64)
+    invlists = index.invlists
+    for list_no in range(index.nlist):
+        size = invlists.list_size(list_no)
+        if size:
+            ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size)
+            ids -= np.searchsorted(removed_sorted, ids)
+
+
+def search_params(index: faiss.Index, selector: Any, candidates: int):
+    if isinstance(index, faiss.IndexIVF):
+        # probe more lists for selective filters, so about as many candidates
+        # are scanned as in an unfiltered search
+        share = candidates / max(1, index.ntotal)
+        nprobe = min(index.nlist, math.ceil(index.nprobe / max(share, 1e-9)))
+        return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+    return faiss.SearchParameters(sel=selector)
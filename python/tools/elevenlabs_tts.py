@@ -8,6 +8,7 @@ import requests
 import base64
 import time
 from python.helpers.tool import Tool, Response
+from python.helpers import http_pool
 from python.helpers.files import get_abs_path
 
 
@@ -94,7 +95,7 @@ class ElevenLabsTTS(Tool):
                 }
             }
             
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+            response = http_pool.get_sync_session().post(url, headers=headers, json=payload, timeout=60)
             response.raise_for_status()
             
             # Save audio file
@@ -128,7 +129,7 @@ The audio file is ready at: `{output_path}`""",
             url = f"{self.base_url}/voices"
             headers = {"xi-api-key": self.api_key}
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_pool.get_sync_session().get(url, headers=headers, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -7,6 +7,7 @@ import os
 import time
 import requests
 from python.helpers.tool import Tool, Response
+from python.helpers import http_pool
 
 
 class MMAudio(Tool):
@@ -56,7 +57,7 @@ class MMAudio(Tool):
                 payload["input"]["duration"] = duration
             
             # Start prediction
-            response = requests.post(
+            response = http_pool.get_sync_session().post(
                 self.base_url,
                 headers=headers,
                 json=payload,
@@ -81,7 +82,7 @@ class MMAudio(Tool):
             for _ in range(max_attempts):
                 time.sleep(5)
                 
-                poll_response = requests.get(get_url, headers=headers, timeout=30)
+                poll_response = http_pool.get_sync_session().get(get_url, headers=headers, timeout=30)
                 poll_response.raise_for_status()
                 prediction = poll_response.json()
                 
@@ -9,6 +9,7 @@ import json
 import base64
 import requests
 from python.helpers.tool import Tool, Response
+from python.helpers import http_pool
 from python.helpers.files import get_abs_path
 
 
@@ -77,7 +78,7 @@ Use action parameter to specify what you want to do.""",
             return Response(message="Error: OPENROUTER_API_KEY not configured", break_loop=False)
         
         try:
-            response = requests.post(
+            response = http_pool.get_sync_session().post(
                 url="https://openrouter.ai/api/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.openrouter_key}",
@@ -145,7 +146,7 @@ Use action parameter to specify what you want to do.""",
                 }
             }
             
-            response = requests.post(
+            response = http_pool.get_sync_session().post(
                 f"https://api.replicate.com/v1/models/{self.models['image_generate']}/predictions",
                 headers=headers,
                 json=payload,
@@ -215,7 +216,7 @@ Use action parameter to specify what you want to do.""",
             
             self.set_progress(f"Generating video with {model_name}...")
             
-            response = requests.post(
+            response = http_pool.get_sync_session().post(
                 f"https://api.replicate.com/v1/models/{model}/predictions",
                 headers=headers,
                 json=payload,
@@ -285,7 +286,7 @@ Tip: Use action='add_audio' to add sound to this video.""",
             
             self.set_progress("Adding audio to video...")
             
-            response = requests.post(
+            response = http_pool.get_sync_session().post(
                 "https://api.replicate.com/v1/predictions",
                 headers=headers,
                 json=payload,
@@ -326,7 +327,7 @@ Tip: Use action='add_audio' to add sound to this video.""",
         for attempt in range(max_attempts):
             time.sleep(5)
             
-            response = requests.get(
+            response = http_pool.get_sync_session().get(
                 f"https://api.replicate.com/v1/predictions/{prediction_id}",
                 headers=headers,
                 timeout=30
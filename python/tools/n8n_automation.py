@@ -7,6 +7,7 @@ import os
 import json
 import requests
 from python.helpers.tool import Tool, Response
+from python.helpers import http_pool
 
 
 class N8nAutomation(Tool):
@@ -67,7 +68,7 @@ class N8nAutomation(Tool):
         if active_only:
             url += "?active=true"
         
-        response = requests.get(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().get(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -95,7 +96,7 @@ class N8nAutomation(Tool):
             return Response(message="Error: workflow_id is required", break_loop=False)
         
         url = f"{self.base_url}/api/v1/workflows/{workflow_id}"
-        response = requests.get(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().get(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         wf = response.json()
         
@@ -125,7 +126,7 @@ class N8nAutomation(Tool):
         if data:
             payload["data"] = data if isinstance(data, dict) else json.loads(data)
         
-        response = requests.post(url, headers=self.headers, json=payload, timeout=60)
+        response = http_pool.get_sync_session().post(url, headers=self.headers, json=payload, timeout=60)
         response.raise_for_status()
         result = response.json()
         
@@ -144,7 +145,7 @@ class N8nAutomation(Tool):
             return Response(message="Error: workflow_id is required", break_loop=False)
         
         url = f"{self.base_url}/api/v1/workflows/{workflow_id}/activate"
-        response = requests.post(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().post(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         
         return Response(
@@ -160,7 +161,7 @@ class N8nAutomation(Tool):
             return Response(message="Error: workflow_id is required", break_loop=False)
         
         url = f"{self.base_url}/api/v1/workflows/{workflow_id}/deactivate"
-        response = requests.post(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().post(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         
         return Response(
@@ -177,7 +178,7 @@ class N8nAutomation(Tool):
         if workflow_id:
             url += f"&workflowId={workflow_id}"
         
-        response = requests.get(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().get(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -202,7 +203,7 @@ class N8nAutomation(Tool):
             return Response(message="Error: execution_id is required", break_loop=False)
         
         url = f"{self.base_url}/api/v1/executions/{execution_id}"
-        response = requests.get(url, headers=self.headers, timeout=30)
+        response = http_pool.get_sync_session().get(url, headers=self.headers, timeout=30)
         response.raise_for_status()
         ex = response.json()
         
@@ -266,6 +266,8 @@ def run():
 
 
 def init_a0():
+    # detect blocking calls on event loops
+    initialize.initialize_loop_watchdog()
     # initialize contexts and MCP
     init_chats = initialize.initialize_chats()
     # only wait for init chats, otherwise they would seem to disappear for a while on restart
@@ -0,0 +1,80 @@
+import sys, os, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from python.helpers.dirty_json import DirtyJson
+
+
+def long_response(text_len: int = 20000) -> str:
+    # shape of a typical agent response with a long final answer
+    body = ("Lorem ipsum dolor sit amet, \\\"consectetur\\\" adipiscing elit.\\n" * (text_len // 60))
+    return (
+        '{\n    "thoughts": [\n        "The user wants a long answer",\n        "I will write it"\n    ],\n'
+        '    "headline": "Writing the answer",\n    "tool_name": "response",\n'
+        '    "tool_args": {\n        "text": "' + body + '"\n    }\n}'
+    )
+
+
+examples = [
+    long_response(2000),
+    'Sure, here it is: {"tool_name": "x", tool_args: {a: 1, b: [1, 2,], c: tRue, d: null}}',
+    '{{ "text": """multi\nline""", // comment\n "n": /* c */ -1.5e3 }}',
+    '{"a": "\\u00e9\\t\\/", \'b\': `c`}',
+    '{"thoughts": ["unfinished',
+]
+
+
+def feed_in_chunks(text: str, size: int):
+    parser = DirtyJson()
+    for i in range(0, len(text), size):
+        parser.feed(text[i : i + size])
+    return parser.finish()
+
+
+@pytest.mark.parametrize("example", examples)
+@pytest.mark.parametrize("size", [1, 3, 17, 1000])
+def test_incremental_matches_full_parse(example: str, size: int):
+    assert feed_in_chunks(example, size) == DirtyJson.parse_string(example)
+
+
+def test_partial_result_while_streaming():
+    parser = DirtyJson()
+    parser.feed_text('{"tool_name": "response", "tool_args": {"text": "Hel')
+    assert parser.snapshot() == {"tool_name": "response", "tool_args": {"text": "Hel"}}
+    parser.feed_text('{"tool_name": "response", "tool_args": {"text": "Hello", "ot')
+    # unfinished keys are not exposed
+    assert parser.snapshot() == {"tool_name": "response", "tool_args": {"text": "Hello"}}
+
+
+def test_feed_text_restarts_on_rewritten_prefix():
+    parser = DirtyJson()
+    parser.feed_text('{"text": "my secret')
+    result = parser.feed_text('{"text": "my ***')
+    assert result == {"text": "my ***"}
+
+
+def benchmark(text: str, chunk_size: int = 20):
+    # per-chunk cost of the incremental parser compared to reparsing the full text
+    parser = DirtyJson()
+    incremental, full = [], []
+    for i in range(chunk_size, len(text) + chunk_size, chunk_size):
+        acc = text[:i]
+        start = time.perf_counter()
+        parser.feed_text(acc)
+        parser.snapshot()
+        incremental.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        DirtyJson.parse_string(acc)
+        full.append(time.perf_counter() - start)
+
+    def avg_us(values):
+        return sum(values) / len(values) * 1e6
+
+    tenth = max(1, len(incremental) // 10)
+    print(f"{len(text)} chars, {len(incremental)} chunks of {chunk_size}")
+    print(f"incremental: first 10% {avg_us(incremental[:tenth]):.1f} us/chunk, last 10% {avg_us(incremental[-tenth:]):.1f} us/chunk")
+    print(f"full reparse: first 10% {avg_us(full[:tenth]):.1f} us/chunk, last 10% {avg_us(full[-tenth:]):.1f} us/chunk")
+
+
+if __name__ == "__main__":
+    benchmark(long_response(20000))
@@ -0,0 +1,52 @@
+import sys, os
+import asyncio
+import gc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import embedding_batcher
+from python.helpers.embedding_batcher import EmbeddingBatcher, get_batcher
+
+
+def create_batcher(calls: list):
+    async def embed_batch(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    return lambda: EmbeddingBatcher(embed_batch, batch_size=32)
+
+
+def test_callers_of_same_model_share_batches():
+    calls = []
+    first = get_batcher(("test", "model", "{}"), create_batcher(calls))
+    second = get_batcher(("test", "model", "{}"), create_batcher(calls))
+    assert first is second
+
+    limited = []
+
+    def rate_limit(texts):
+        async def before():
+            limited.append(texts)
+        return before
+
+    async def run():
+        return await asyncio.gather(
+            first.embed(["a", "bb"], rate_limit(["a", "bb"])),
+            second.embed(["bb", "ccc"], rate_limit(["bb", "ccc"])),
+        )
+
+    assert asyncio.run(run()) == [[[1.0], [2.0]], [[2.0], [3.0]]]
+    assert calls == [["a", "bb", "ccc"]]
+    assert sorted(limited) == [["a", "bb"], ["bb", "ccc"]]
+
+
+def test_batcher_dropped_with_owner():
+    class Model:
+        pass
+
+    model = Model()
+    key = ("test", "local", str(id(model)))
+    batcher = get_batcher(key, create_batcher([]), owner=model)
+    assert get_batcher(key, create_batcher([])) is batcher
+    del model
+    gc.collect()
+    assert key not in embedding_batcher._batchers
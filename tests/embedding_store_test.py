@@ -0,0 +1,50 @@
+import sys, os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers.embedding_store import PackedByteStore, get_store, DB_FILE
+
+
+def test_get_set_delete(tmp_path):
+    store = PackedByteStore(str(tmp_path / DB_FILE))
+    store.mset([("ns_a", b"1"), ("ns_b", b"22"), ("other", b"333")])
+    assert store.mget(["ns_a", "missing", "ns_b"]) == [b"1", None, b"22"]
+    assert sorted(store.yield_keys(prefix="ns_")) == ["ns_a", "ns_b"]
+    store.mdelete(["ns_a"])
+    assert store.mget(["ns_a"]) == [None]
+    assert store.get_size() == 5
+
+    # values survive reopening without the memory tier
+    reopened = PackedByteStore(str(tmp_path / DB_FILE))
+    assert reopened.mget(["ns_b", "other"]) == [b"22", b"333"]
+    assert reopened.get_size() == 5
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = PackedByteStore(str(tmp_path / DB_FILE), max_bytes=100, memory_bytes=0)
+    for i in range(9):
+        store.mset([(f"k{i}", b"x" * 10)])
+    store.mget(["k0"])  # touch the oldest entry
+    store.mset([("k9", b"x" * 20)])
+    assert store.get_size() <= 90
+    assert store.mget(["k0"]) == [b"x" * 10]
+    assert store.mget(["k1"]) == [None]
+
+
+def test_migrates_local_file_store(tmp_path):
+    folder = tmp_path / "embeddings"
+    (folder / "sub").mkdir(parents=True)
+    (folder / "model_abc").write_bytes(b"vector")
+    (folder / "sub" / "model_def").write_bytes(b"other")
+    store = get_store(str(folder))
+    assert store.mget(["model_abc", "sub/model_def"]) == [b"vector", b"other"]
+    assert sorted(os.listdir(folder)) == sorted(n for n in os.listdir(folder) if n.startswith(DB_FILE))
+
+
+def test_memory_hits_count_as_use(tmp_path):
+    store = PackedByteStore(str(tmp_path / DB_FILE), max_bytes=100)
+    for i in range(9):
+        store.mset([(f"k{i}", b"x" * 10)])
+    store.mget(["k0"])  # served from the memory tier
+    store.mset([("k9", b"x" * 20)])
+    assert store.mget(["k0"]) == [b"x" * 10]
+    assert "k1" not in set(store.yield_keys())
@@ -0,0 +1,27 @@
+import sys, os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import files
+
+PLUGIN = """from python.helpers.files import VariablesPlugin
+
+
+class Variables(VariablesPlugin):
+    def get_variables(self, file, backup_dirs=None, **kwargs):
+        return {"tools": '{{ include "tool.md" }}'}
+"""
+
+
+def test_include_from_plugin_variable(tmp_path):
+    (tmp_path / "system.md").write_text("Tools: {{tools}} {{agent-name}}")
+    (tmp_path / "system.py").write_text(PLUGIN)
+    (tmp_path / "tool.md").write_text("tool for {{name}}")
+    prompt = files.read_prompt_file(
+        "system.md", [str(tmp_path)], name="agent0", **{"agent-name": "A0"}
+    )
+    assert prompt == "Tools: tool for agent0 A0"
+
+
+def test_placeholder_inside_value(tmp_path):
+    (tmp_path / "plain.md").write_text("{{a}}")
+    assert files.read_prompt_file("plain.md", [str(tmp_path)], a="{{b}}", b="B") == "B"
@@ -0,0 +1,73 @@
+import sys, os
+import asyncio
+import gc
+import json
+import warnings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import litellm
+from aiohttp import web
+from python.helpers import http_pool
+
+
+async def chat_completions(request: web.Request):
+    body = await request.json()
+    message = {"role": "assistant", "content": "pong"}
+    if not body.get("stream"):
+        return web.json_response({
+            "id": "1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+        })
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await response.prepare(request)
+    for delta, finish in ((message, None), ({}, "stop")):
+        chunk = {
+            "id": "1", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+
+async def call_models() -> str:
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+    try:
+        litellm.aclient_session = http_pool.get_litellm_client()  # as set up by models.py
+        for provider, stream in (("openai", True), ("openrouter", False)):
+            response = await litellm.acompletion(
+                model=f"{provider}/test",
+                messages=[{"role": "user", "content": "ping"}],
+                api_base=f"http://127.0.0.1:{port}/v1",
+                api_key="test",
+                stream=stream,
+                shared_session=http_pool.get_session(),
+            )
+            if stream:
+                text = "".join([chunk.choices[0].delta.content or "" async for chunk in response])  # type: ignore
+            else:
+                text = response.choices[0].message.content  # type: ignore
+            assert text == "pong"
+    finally:
+        await runner.cleanup()
+    return f"127.0.0.1:{port}"
+
+
+def test_litellm_calls_use_pool():
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        host = asyncio.run(call_models())
+        gc.collect()
+    stats = {s["host"]: s for s in http_pool.get_stats()}
+    assert stats[host]["requests"] == 2
+    assert stats[host]["errors"] == 0
+    assert stats[host]["new_connections"] + stats[host]["reused_connections"] == 2
+    # the session of the finished loop was closed with it
+    assert not [w for w in caught if "Unclosed" in str(w.message)]
+    assert not http_pool._sessions
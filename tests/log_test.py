@@ -0,0 +1,68 @@
+import sys, os, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import files  # imported before strings, they import each other
+from python.helpers.log import Log, VALUE_MAX_LEN
+from python.helpers.secrets import SecretsMasker
+
+
+def test_stream_kvps():
+    log = Log()
+    item = log.log("agent", heading="Thinking", kvps={"reasoning": "a"})
+    for chunk in ("b", "c"):
+        item.stream(reasoning=chunk)
+    assert item.kvps == {"reasoning": "abc"}
+
+
+def test_update_does_not_share_kvps():
+    log = Log()
+    args = {"path": "/tmp", "lines": [1, 2]}
+    item = log.log("tool", kvps={"tool_args": args})
+    before = item.kvps
+    args["lines"].append(3)
+    item.update(kvps={"tool_args": args, "long": "x" * (VALUE_MAX_LEN * 2)})
+    assert before == {"tool_args": {"path": "/tmp", "lines": [1, 2]}}
+    assert item.kvps["tool_args"]["lines"] == [1, 2, 3]
+    assert len(item.kvps["long"]) <= VALUE_MAX_LEN + 50
+
+
+def test_unchanged_kvps_masked_after_secrets_change():
+    log = Log()
+    masker = None
+    log._get_masker = lambda: masker  # type: ignore
+    item = log.log("tool", kvps={"command": "login abcd1234"})
+    assert item.kvps == {"command": "login abcd1234"}
+    masker = SecretsMasker({"TOKEN": "abcd1234"})
+    item.update(kvps={"command": "login abcd1234"})
+    assert item.kvps == {"command": "login §§secret(TOKEN)"}
+
+
+def benchmark(chunks: int = 10_000):
+    # per chunk cost of streaming a response into a log item
+    log = Log()
+    item = log.log("agent", heading="Generating...")
+    start = time.perf_counter()
+    for i in range(chunks):
+        item.stream(content="token ", reasoning="step ")
+    stream_time = time.perf_counter() - start
+
+    # the response stream extension replaces kvps with the parsed response on every chunk
+    item = log.log("agent", heading="Generating...")
+    thoughts, text = [], ""
+    start = time.perf_counter()
+    for i in range(chunks):
+        text += "token "
+        if i % 20 == 0:
+            thoughts.append(f"thought {i}")
+        kvps = {"reasoning": item.kvps["reasoning"] if item.kvps else "thinking", "thoughts": thoughts}
+        kvps.update({"headline": "Working on it", "tool_name": "code_execution_tool", "tool_args": {"code": text[-200:]}})
+        item.update(heading="Working on it", content=text, kvps=kvps)
+    update_time = time.perf_counter() - start
+
+    print(f"{chunks} chunks")
+    print(f"stream: {stream_time / chunks * 1e6:.1f} us/chunk")
+    print(f"update: {update_time / chunks * 1e6:.1f} us/chunk")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,32 @@
+import sys, os, random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers.secrets import SecretsMasker
+
+secrets = {"SHORT": "abcd", "LONG": "abcdefgh", "OTHER": "xyzw", "OVERLAP": "cdxy", "TINY": "ab"}
+
+
+def test_mask_prefers_longest_value():
+    masker = SecretsMasker(secrets)
+    assert (
+        masker.mask("x abcdefgh abcd cdxyzw ab")
+        == "x §§secret(LONG) §§secret(SHORT) §§secret(OVERLAP)zw ab"
+    )
+
+
+def test_incremental_matches_full_mask():
+    masker = SecretsMasker(secrets)
+    rnd = random.Random(0)
+    for _ in range(500):
+        text = "".join(rnd.choice("abcdefghxyzw ") for _ in range(rnd.randint(0, 60)))
+        incremental = masker.create_incremental()
+        end = 0
+        while end < len(text):
+            end += rnd.randint(1, 5)
+            assert incremental.mask(text[:end]) == masker.mask(text[:end])
+
+
+def test_incremental_restarts_on_different_text():
+    incremental = SecretsMasker(secrets).create_incremental()
+    incremental.mask("hello abcdefgh and more text")
+    assert incremental.mask("bye xyzw") == "bye §§secret(OTHER)"
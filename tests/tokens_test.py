@@ -0,0 +1,20 @@
+import sys, os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import tokens
+
+
+def test_count_is_cached(monkeypatch):
+    text = "The quick brown fox jumps over the lazy dog. " * 50
+    first = tokens.count_tokens(text)
+    monkeypatch.setattr(tokens, "_encode_count", lambda *a: -1)
+    assert tokens.count_tokens(text) == first
+    assert tokens.count_tokens(text + "!") == -1
+
+
+def test_estimator_tracks_exact_count():
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 400
+    estimator = tokens.TokenEstimator()
+    total = sum(estimator.add(text[i : i + 7]) for i in range(0, len(text), 7))
+    exact = tokens.approximate_tokens(text)
+    assert abs(total - exact) <= exact * 0.1
@@ -0,0 +1,96 @@
+import sys, os, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import faiss
+from python.helpers import vector_index
+
+
+def embeddings(count: int, dim: int, seed: int = 0) -> np.ndarray:
+    # clustered unit vectors, closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, count // 100), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)] + rng.normal(scale=0.5, size=(count, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def flat_index(vectors: np.ndarray) -> faiss.Index:
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    return index
+
+
+def recall(expected: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(e) & set(f)) for e, f in zip(expected, found))
+    return hits / expected.size
+
+
+def test_ivf_matches_flat_when_probing_all_lists():
+    vectors = embeddings(4000, 32)
+    index = vector_index.build_index("ivf", vectors, faiss.METRIC_INNER_PRODUCT)
+    assert vector_index.get_index_type(index) == "ivf"
+    index.nprobe = index.nlist
+    queries = embeddings(20, 32, seed=1)
+    _, expected = flat_index(vectors).search(queries, 10)
+    _, found = index.search(queries, 10)
+    assert recall(expected, found) == 1.0
+
+
+def test_compact_ids_after_remove():
+    vectors = embeddings(4000, 32)
+    flat = flat_index(vectors)
+    index = vector_index.build_index("ivf", vectors, faiss.METRIC_INNER_PRODUCT)
+    index.nprobe = index.nlist
+    removed = [0, 7, 1500, 3999]
+    for idx in (flat, index):
+        idx.remove_ids(np.array(removed, dtype=np.int64))
+    vector_index.compact_ids(index, removed)
+    queries = embeddings(20, 32, seed=1)
+    _, expected = flat.search(queries, 10)
+    _, found = index.search(queries, 10)
+    assert recall(expected, found) == 1.0
+
+
+def test_restricted_search_probes_more_lists():
+    vectors = embeddings(4000, 32)
+    index = vector_index.build_index("ivf", vectors, faiss.METRIC_INNER_PRODUCT)
+    allowed = np.arange(0, 4000, 400, dtype=np.int64)
+    selector = faiss.IDSelectorBatch(allowed)
+    params = vector_index.search_params(index, selector, len(allowed))
+    _, found = index.search(embeddings(1, 32, seed=1), 5, params=params)
+    assert set(found[0]) <= set(allowed)
+    assert (found[0] >= 0).all()
+
+
+def benchmark(count: int = 200_000, dim: int = 384, queries: int = 200, k: int = 10):
+    # recall@k and latency of the ANN index types against the exact flat index
+    vectors = embeddings(count, dim)
+    query_vectors = embeddings(queries, dim, seed=1)
+    flat = flat_index(vectors)
+
+    def timed_search(index):
+        start = time.perf_counter()
+        for query in query_vectors:
+            _, found = index.search(query[None, :], k)
+        elapsed = (time.perf_counter() - start) / queries
+        _, found = index.search(query_vectors, k)
+        return elapsed, found
+
+    flat_time, expected = timed_search(flat)
+    print(f"{count} vectors of {dim} dims, {queries} queries, recall@{k}")
+    print(f"flat:  {flat_time * 1000:.2f} ms/query")
+    for index_type in ("ivf", "ivfpq"):
+        start = time.perf_counter()
+        index = vector_index.build_index(index_type, vectors, faiss.METRIC_INNER_PRODUCT)
+        build_time = time.perf_counter() - start
+        search_time, found = timed_search(index)
+        print(
+            f"{index_type}: {search_time * 1000:.2f} ms/query, recall {recall(expected, found):.3f}, "
+            f"nlist {index.nlist}, nprobe {index.nprobe}, built in {build_time:.1f}s, "
+            f"{len(faiss.serialize_index(index)) / 2**20:.0f} MB vs {len(faiss.serialize_index(flat)) / 2**20:.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
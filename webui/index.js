@@ -274,120 +274,132 @@ export async function poll() {
       return false;
     }
 
-    // deselect chat if it is requested by the backend
-    if (response.deselect_chat) {
-      chatsStore.deselectChat();
-      return
-    }
+    const result = applyUpdate(response);
+    // if the chat has been reset, restart this poll as it may have been called with incorrect log_from
+    if (result === null) return await poll();
+    updated = result;
+  } catch (error) {
+    console.error("Error:", error);
+    setConnectionStatus(false);
+  }
 
-    if (
-      response.context != context &&
-      !(response.context === null && context === null) &&
-      context !== null
-    ) {
-      return;
-    }
+  return updated;
+}
+globalThis.poll = poll;
 
-    // if the chat has been reset, restart this poll as it may have been called with incorrect log_from
-    if (lastLogGuid != response.log_guid) {
-      const chatHistoryEl = document.getElementById("chat-history");
-      if (chatHistoryEl) chatHistoryEl.innerHTML = "";
-      lastLogVersion = 0;
-      lastLogGuid = response.log_guid;
-      await poll();
-      return;
-    }
+// Apply data from /poll or /poll_stream to the UI
+// Returns whether messages were updated, null if the log has to be requested again from the start
+function applyUpdate(response) {
+  let updated = false;
 
-    if (lastLogVersion != response.log_version) {
-      updated = true;
-      for (const log of response.logs) {
-        const messageId = log.id || log.no; // Use log.id if available
-        setMessage(
-          messageId,
-          log.type,
-          log.heading,
-          log.content,
-          log.temp,
-          log.kvps
-        );
-      }
-      afterMessagesUpdate(response.logs);
-    }
+  // deselect chat if it is requested by the backend
+  if (response.deselect_chat) {
+    chatsStore.deselectChat();
+    return updated;
+  }
+
+  if (
+    response.context != context &&
+    !(response.context === null && context === null) &&
+    context !== null
+  ) {
+    return updated;
+  }
 
-    lastLogVersion = response.log_version;
+  // if the chat has been reset, clear it, the log is only complete if it was sent from the start
+  if (lastLogGuid != response.log_guid) {
+    const chatHistoryEl = document.getElementById("chat-history");
+    if (chatHistoryEl) chatHistoryEl.innerHTML = "";
+    lastLogVersion = 0;
     lastLogGuid = response.log_guid;
+    if (response.log_from !== 0) return null;
+  }
+
+  if (lastLogVersion != response.log_version) {
+    updated = true;
+    for (const log of response.logs) {
+      const messageId = log.id || log.no; // Use log.id if available
+      setMessage(
+        messageId,
+        log.type,
+        log.heading,
+        log.content,
+        log.temp,
+        log.kvps
+      );
+    }
+    afterMessagesUpdate(response.logs);
+  }
 
-    updateProgress(response.log_progress, response.log_progress_active);
+  lastLogVersion = response.log_version;
+  lastLogGuid = response.log_guid;
 
-    // Update notifications from response
-    notificationStore.updateFromPoll(response);
+  updateProgress(response.log_progress, response.log_progress_active);
 
-    //set ui model vars from backend
-    inputStore.paused = response.paused;
+  // Update notifications from response
+  notificationStore.updateFromPoll(response);
 
-    // Update status icon state
-    setConnectionStatus(true);
+  //set ui model vars from backend
+  inputStore.paused = response.paused;
 
-    // Update chats list using store
-    let contexts = response.contexts || [];
-    chatsStore.applyContexts(contexts);
+  // Update status icon state
+  setConnectionStatus(true);
 
-    // Update tasks list using store
-    let tasks = response.tasks || [];
-    tasksStore.applyTasks(tasks);
+  // Update chats list using store
+  let contexts = response.contexts || [];
+  chatsStore.applyContexts(contexts);
 
-    // Make sure the active context is properly selected in both lists
-    if (context) {
-      // Update selection in both stores
-      chatsStore.setSelected(context);
+  // Update tasks list using store
+  let tasks = response.tasks || [];
+  tasksStore.applyTasks(tasks);
 
-      const contextInChats = chatsStore.contains(context);
-      const contextInTasks = tasksStore.contains(context);
+  // Make sure the active context is properly selected in both lists
+  if (context) {
+    // Update selection in both stores
+    chatsStore.setSelected(context);
 
-      if (contextInTasks) {
-        tasksStore.setSelected(context);
-      }
+    const contextInChats = chatsStore.contains(context);
+    const contextInTasks = tasksStore.contains(context);
 
-      if (!contextInChats && !contextInTasks) {
-        if (chatsStore.contexts.length > 0) {
-          // If it doesn't exist in the list but other contexts do, fall back to the first
-          const firstChatId = chatsStore.firstId();
-          if (firstChatId) {
-            setContext(firstChatId);
-            chatsStore.setSelected(firstChatId);
-          }
-        } else if (typeof deselectChat === "function") {
-          // No contexts remain – clear state so the welcome screen can surface
-          deselectChat();
-        }
-      }
-    } else {
-      const welcomeStore =
-        globalThis.Alpine && typeof globalThis.Alpine.store === "function"
-          ? globalThis.Alpine.store("welcomeStore")
-          : null;
-      const welcomeVisible = Boolean(welcomeStore && welcomeStore.isVisible);
-
-      // No context selected, try to select the first available item unless welcome screen is active
-      if (!welcomeVisible && contexts.length > 0) {
+    if (contextInTasks) {
+      tasksStore.setSelected(context);
+    }
+
+    if (!contextInChats && !contextInTasks) {
+      if (chatsStore.contexts.length > 0) {
+        // If it doesn't exist in the list but other contexts do, fall back to the first
         const firstChatId = chatsStore.firstId();
         if (firstChatId) {
           setContext(firstChatId);
           chatsStore.setSelected(firstChatId);
         }
+      } else if (typeof deselectChat === "function") {
+        // No contexts remain – clear state so the welcome screen can surface
+        deselectChat();
+      }
+    }
+  } else {
+    const welcomeStore =
+      globalThis.Alpine && typeof globalThis.Alpine.store === "function"
+        ? globalThis.Alpine.store("welcomeStore")
+        : null;
+    const welcomeVisible = Boolean(welcomeStore && welcomeStore.isVisible);
+
+    // No context selected, try to select the first available item unless welcome screen is active
+    if (!welcomeVisible && contexts.length > 0) {
+      const firstChatId = chatsStore.firstId();
+      if (firstChatId) {
+        setContext(firstChatId);
+        chatsStore.setSelected(firstChatId);
       }
     }
-
-    lastLogVersion = response.log_version;
-    lastLogGuid = response.log_guid;
-  } catch (error) {
-    console.error("Error:", error);
-    setConnectionStatus(false);
   }
 
+  lastLogVersion = response.log_version;
+  lastLogGuid = response.log_guid;
+
   return updated;
 }
-globalThis.poll = poll;
 
 function afterMessagesUpdate(logs) {
   if (localStorage.getItem("speech") == "true") {
@@ -492,6 +504,9 @@ export const setContext = function (id) {
 
   //skip one speech if enabled when switching context
   if (localStorage.getItem("speech") == "true") skipOneSpeech = true;
+
+  // the update stream follows a single context, reopen it for the new one
+  if (eventSource) openStream();
 };
 
 export const deselectChat = function () {
@@ -598,6 +613,76 @@ async function startPolling() {
   _doPoll();
 }
 
+// Server-sent updates, only changes are sent and applied as they happen
+let eventSource = null;
+const streamContexts = new Map();
+const streamTasks = new Map();
+
+async function startStream() {
+  if (!globalThis.EventSource) return startPolling();
+  try {
+    await api.getCsrfToken(); // sets the cookie the stream is authorized by
+  } catch (error) {
+    console.error("Error:", error);
+    return startPolling();
+  }
+  openStream();
+}
+
+function openStream() {
+  if (eventSource) eventSource.close();
+
+  const params = new URLSearchParams({
+    context: context || "",
+    timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
+    log_guid: lastLogGuid,
+    log_from: lastLogVersion,
+    notifications_guid: notificationStore.lastNotificationGuid || "",
+    notifications_from: notificationStore.lastNotificationVersion || 0,
+  });
+  const source = new EventSource(`/poll_stream?${params}`);
+  eventSource = source;
+
+  source.onmessage = (event) => {
+    if (source !== eventSource) return; // replaced by a stream of another context
+    const response = JSON.parse(event.data);
+    mergeStreamContexts(response);
+    if (applyUpdate(response) === null) openStream();
+  };
+
+  source.onerror = () => {
+    if (source !== eventSource) return;
+    setConnectionStatus(false);
+    // the browser reconnects by itself unless the stream was refused, poll instead then
+    if (source.readyState === EventSource.CLOSED) {
+      eventSource = null;
+      startPolling();
+    }
+  };
+}
+
+// Stream events carry changed and removed contexts only, keep the full lists here
+function mergeStreamContexts(response) {
+  if (response.contexts_full) {
+    streamContexts.clear();
+    streamTasks.clear();
+  }
+  for (const id of response.contexts_removed || []) {
+    streamContexts.delete(id);
+    streamTasks.delete(id);
+  }
+  for (const ctx of response.contexts_updated || []) {
+    streamTasks.delete(ctx.id);
+    streamContexts.set(ctx.id, ctx);
+  }
+  for (const task of response.tasks_updated || []) {
+    streamContexts.delete(task.id);
+    streamTasks.set(task.id, task);
+  }
+  response.contexts = [...streamContexts.values()];
+  response.tasks = [...streamTasks.values()];
+}
+
 // All initializations and event listeners are now consolidated here
 document.addEventListener("DOMContentLoaded", function () {
   // Assign DOM elements to variables now that the DOM is ready
@@ -619,8 +704,8 @@ document.addEventListener("DOMContentLoaded", function () {
     chatHistory.addEventListener("scroll", updateAfterScroll);
   }
 
-  // Start polling for updates
-  startPolling();
+  // Start receiving updates, polling is the fallback
+  startStream();
 });
 
 /*
@@ -77,7 +77,7 @@ let csrfToken = null;
  * Caches the token after first request
  * @returns {Promise<string>} The CSRF token
  */
-async function getCsrfToken() {
+export async function getCsrfToken() {
   if (csrfToken) return csrfToken;
   const response = await fetch("/csrf_token", {
     credentials: "same-origin",